@@ -4,9 +4,19 @@ ETL package for loading MotoGP data from PDFs to PostgreSQL.
 
 from .pdf_tables import extract_tables_from_pdf, normalize_table
 from .db_loader import load_results_to_db
+from .key_resolver import KeyResolver
+from .parallel_extraction import extract_tables_parallel
+from .pipeline import Checkpoint, run_pipeline
+from .parquet_store import read_results, rebuild_from_parquet
 
 __all__ = [
     'extract_tables_from_pdf',
     'normalize_table', 
     'load_results_to_db',
+    'KeyResolver',
+    'extract_tables_parallel',
+    'Checkpoint',
+    'run_pipeline',
+    'read_results',
+    'rebuild_from_parquet',
 ]
\ No newline at end of file
@@ -1,16 +1,37 @@
 """
-ETL CLI entrypoint.
-Usage: python -m app.etl input.pdf
+ETL CLI entrypoint, run from the repository root.
+Usage: python -m app.backend.app.etl [load] PDF|DIR|GLOB [...] [--manifest FILE]
+           [--bulk | --copy] [--chunk-size N] [--checkpoint state.json]
+           [--workers N] [--pages-per-task N]
+           [--cache-dir DIR | --no-cache] [--cache-max-mb N]
+           [--parquet-dir DIR | --no-parquet] [--queue-size N]
+       python -m app.backend.app.etl ingest BUCKET/PREFIX [--concurrency N]
+           [--storage-backend supabase|local] [--new-only] [load options]
+       python -m app.backend.app.etl rebuild [--parquet-dir DIR] [--season YEAR]
+           [--category CAT] [--circuit NAME] [--bulk]
 """
 
 import sys
 import argparse
 import logging
 from pathlib import Path
+from typing import Optional
 
-from app.backend.database import SessionLocal
-from app.etl.pdf_tables import extract_tables_from_pdf, normalize_table
-from app.etl.db_loader import load_results_to_db
+from app.backend.db import SessionLocal
+from .db_loader import COPY_ROW_THRESHOLD
+from .pipeline import (
+    Checkpoint, DEFAULT_CHUNK_SIZE, DEFAULT_QUEUE_SIZE, iter_chunks, run_pipeline
+)
+from .batch import BatchReport, expand_inputs
+from .table_cache import TableCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from .parquet_store import (
+    DEFAULT_BATCH_SIZE, DEFAULT_DATASET_DIR, rebuild_from_parquet
+)
+from ..storage.factory import STORAGE_BACKENDS, get_storage_client
+from .storage_ingest import (
+    DEFAULT_DOWNLOAD_CONCURRENCY, StorageTableSource, changed_pdf_objects,
+    list_pdf_objects, split_storage_prefix
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,41 +40,228 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    parser = argparse.ArgumentParser(description='MotoGP ETL Pipeline')
-    parser.add_argument('pdf_path', help='Path to PDF file')
-    parser.add_argument('--dry-run', action='store_true', help='Preview without loading')
-    
-    args = parser.parse_args()
-    pdf_path = Path(args.pdf_path)
-    
-    if not pdf_path.exists():
-        logger.error(f"File not found: {pdf_path}")
+def _pick_load_mode(args: argparse.Namespace) -> str:
+    """Return the load mode from the CLI flags; without one each chunk is
+    loaded through COPY staging once it is large enough (see db_loader)"""
+    if args.copy:
+        return 'copy'
+    if args.bulk:
+        return 'bulk'
+    return 'auto'
+
+
+def _add_loader_options(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the commands that extract PDFs and load them"""
+    load_mode = parser.add_mutually_exclusive_group()
+    load_mode.add_argument('--bulk', action='store_true',
+                           help='Use set-based INSERT ... ON CONFLICT statements '
+                                'instead of row-by-row upserts')
+    load_mode.add_argument('--copy', action='store_true',
+                           help='Stream results through COPY into a staging table and '
+                                'merge them in one statement (picked automatically for '
+                                f'chunks of {COPY_ROW_THRESHOLD} rows or more)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Rows loaded and committed per transaction '
+                             f'(default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--checkpoint', type=Path,
+                        help='JSON file recording committed progress; '
+                             'rerun with it to resume')
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                             help='Extracted table cache, keyed by PDF content '
+                                  f'(default: {DEFAULT_CACHE_DIR})')
+    cache_group.add_argument('--no-cache', action='store_true',
+                             help='Always re-extract tables')
+    parser.add_argument('--cache-max-mb', type=int,
+                        default=DEFAULT_MAX_BYTES // 1024 ** 2,
+                        help='Size bound of the table cache, least recently used '
+                             'entries are evicted')
+    parquet_group = parser.add_mutually_exclusive_group()
+    parquet_group.add_argument('--parquet-dir', type=Path, default=DEFAULT_DATASET_DIR,
+                               help='Partitioned Parquet copy of the normalized '
+                                    f'results (default: {DEFAULT_DATASET_DIR})')
+    parquet_group.add_argument('--no-parquet', action='store_true',
+                               help='Do not write the Parquet layer')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='Chunks extracted ahead of the loader '
+                             f'(default: {DEFAULT_QUEUE_SIZE})')
+
+
+def _add_load_parser(subparsers) -> None:
+    parser = subparsers.add_parser('load',
+                                   help='Extract PDFs and load them (default command)')
+    parser.add_argument('inputs', nargs='*',
+                        help='PDF files, directories (searched recursively) '
+                             'or quoted glob patterns')
+    parser.add_argument('--manifest', type=Path,
+                        help='File listing one PDF, directory or glob per line')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Preview without loading')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Extraction worker processes '
+                             '(default: 1, extract in-process)')
+    parser.add_argument('--pages-per-task', type=int,
+                        help='Split each PDF into page ranges of this size '
+                             'across workers')
+    _add_loader_options(parser)
+    parser.set_defaults(func=_run_load)
+
+
+def _add_ingest_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        'ingest', help='Stream PDFs from a storage bucket prefix and load them'
+    )
+    parser.add_argument('location', help="Bucket and prefix, e.g. 'motogp-pdfs/2024/'")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_DOWNLOAD_CONCURRENCY,
+                        help='Objects downloaded ahead of extraction '
+                             f'(default: {DEFAULT_DOWNLOAD_CONCURRENCY})')
+    parser.add_argument('--storage-backend', choices=STORAGE_BACKENDS,
+                        help='Storage backend to read from '
+                             '(default: $STORAGE_BACKEND or supabase)')
+    parser.add_argument('--new-only', action='store_true',
+                        help='Only PDFs added or changed since the last --new-only run '
+                             '(needs STORAGE_INDEX_DIR)')
+    _add_loader_options(parser)
+    parser.set_defaults(func=_run_ingest)
+
+
+def _add_rebuild_parser(subparsers) -> None:
+    parser = subparsers.add_parser(
+        'rebuild', help='Load the database from the Parquet layer alone'
+    )
+    parser.add_argument('--parquet-dir', type=Path, default=DEFAULT_DATASET_DIR,
+                        help='Partitioned Parquet dataset '
+                             f'(default: {DEFAULT_DATASET_DIR})')
+    parser.add_argument('--season', type=int, help='Only this season year')
+    parser.add_argument('--category', help='Only this category')
+    parser.add_argument('--circuit', help='Only this event')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Use batched INSERT ... ON CONFLICT statements '
+                             'instead of COPY staging')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows loaded and committed per transaction '
+                             f'(default: {DEFAULT_BATCH_SIZE})')
+    parser.set_defaults(func=_run_rebuild)
+
+
+def _run_load(args: argparse.Namespace) -> None:
+    if not args.inputs and not args.manifest:
+        logger.error("No input PDFs given")
         sys.exit(1)
-    
     try:
-        # Extract
-        logger.info(f"📄 Extracting from: {pdf_path}")
-        tables = extract_tables_from_pdf(str(pdf_path))
-        
-        # Normalize
-        import pandas as pd
-        df = pd.concat([normalize_table(t) for t in tables], ignore_index=True)
-        logger.info(f"✅ Found {len(df)} records")
-        
-        if args.dry_run:
-            print(df.head(10))
-            sys.exit(0)
-        
-        # Load
-        logger.info("💾 Loading to database...")
-        session = SessionLocal()
+        pdf_paths = expand_inputs(args.inputs, args.manifest)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    logger.info(f"📚 {len(pdf_paths)} PDFs to process")
+
+    cache = _make_cache(args)
+
+    if args.dry_run:
+        chunks = iter_chunks(pdf_paths, args.chunk_size, workers=args.workers,
+                             pages_per_task=args.pages_per_task, cache=cache)
+        for chunk, _, _, _ in chunks:
+            if not chunk.empty:
+                logger.info(f"✅ First chunk has {len(chunk)} records")
+                print(chunk.head(10))
+                break
+        return
+
+    # Extract, normalize and load chunk by chunk
+    _load(args, pdf_paths, cache, workers=args.workers,
+          pages_per_task=args.pages_per_task)
+
+
+def _run_ingest(args: argparse.Namespace) -> None:
+    client = get_storage_client(args.storage_backend)
+    bucket_name, prefix = split_storage_prefix(args.location)
+    if args.new_only:
         try:
-            stats = load_results_to_db(df, session)
-            logger.info(f"✅ Done: {stats}")
-        finally:
-            session.close()
+            storage_paths, listing = changed_pdf_objects(client, bucket_name, prefix)
+        except ValueError as e:
+            logger.error(str(e))
+            sys.exit(1)
+        logger.info(f"📚 {len(storage_paths)} new or changed PDFs "
+                    f"under {bucket_name}/{prefix}")
+    else:
+        storage_paths = list_pdf_objects(client, bucket_name, prefix)
+        logger.info(f"📚 {len(storage_paths)} PDFs under {bucket_name}/{prefix}")
+
+    cache = _make_cache(args)
+    source = StorageTableSource(client, bucket_name, concurrency=args.concurrency,
+                                cache=cache)
+    _load(args, storage_paths, cache, source=source)
+
+    if args.new_only:
+        # Only now, so PDFs of a failed run count as new next time
+        client.index.put(bucket_name, prefix, listing)
+
+
+def _make_cache(args: argparse.Namespace) -> Optional[TableCache]:
+    if args.no_cache:
+        return None
+    return TableCache(args.cache_dir, args.cache_max_mb * 1024 ** 2)
+
+
+def _load(args: argparse.Namespace, pdf_paths, cache, **pipeline_options) -> None:
+    """Run the pipeline with the shared loader options and report the batch"""
+    logger.info("💾 Loading to database...")
+    report = BatchReport()
+    stats = run_pipeline(
+        pdf_paths,
+        SessionLocal,
+        mode=_pick_load_mode(args),
+        chunk_size=args.chunk_size,
+        checkpoint=Checkpoint(args.checkpoint),
+        cache=cache,
+        dataset_dir=None if args.no_parquet else args.parquet_dir,
+        queue_size=args.queue_size,
+        report=report,
+        **pipeline_options
+    )
+    logger.info(f"✅ Done: {stats}")
+    report.log()
+    if report.failed:
+        sys.exit(1)
+
+
+def _run_rebuild(args: argparse.Namespace) -> None:
+    if not args.parquet_dir.exists():
+        logger.error(f"Parquet dataset not found: {args.parquet_dir}")
+        sys.exit(1)
+
+    logger.info(f"💾 Rebuilding database from {args.parquet_dir}...")
+    stats = rebuild_from_parquet(
+        args.parquet_dir,
+        SessionLocal,
+        mode='bulk' if args.bulk else 'copy',
+        batch_size=args.batch_size,
+        season_year=args.season,
+        category=args.category,
+        circuit=args.circuit,
+    )
+    logger.info(f"✅ Done: {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m app.backend.app.etl',
+                                     description='MotoGP ETL Pipeline')
+    subparsers = parser.add_subparsers(dest='command')
+    _add_load_parser(subparsers)
+    _add_ingest_parser(subparsers)
+    _add_rebuild_parser(subparsers)
     
+    # 'load' is the default, so `python -m app.backend.app.etl input.pdf` keeps working
+    argv = sys.argv[1:]
+    if argv and argv[0] not in subparsers.choices and argv[0] not in ('-h', '--help'):
+        argv = ['load'] + argv
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    try:
+        args.func(args)
     except Exception as e:
         logger.error(f"❌ Failed: {e}", exc_info=True)
         sys.exit(1)
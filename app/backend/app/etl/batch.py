@@ -0,0 +1,101 @@
+"""
+Batch inputs and accounting for long-running ETL processes.
+Expands directories, globs and manifest files into PDF paths and keeps the
+per-file success/failure record and throughput of a run.
+"""
+
+import glob
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_GLOB_CHARS = set('*?[')
+
+
+def expand_inputs(specs: Iterable[str], manifest: Optional[Path] = None) -> List[Path]:
+    """Resolve files, directories, glob patterns and a manifest into PDF paths.
+
+    Directories are searched recursively for *.pdf. A manifest holds one file,
+    directory or glob per line; blank lines and lines starting with # are
+    ignored. Order is preserved and duplicates are dropped.
+
+    Raises:
+        FileNotFoundError: if a plain path does not exist
+    """
+    specs = list(specs)
+    if manifest is not None:
+        with open(manifest) as f:
+            specs.extend(
+                line.strip() for line in f
+                if line.strip() and not line.lstrip().startswith('#')
+            )
+
+    paths: Dict[Path, None] = {}
+    for spec in specs:
+        if _GLOB_CHARS & set(spec):
+            matches = sorted(Path(p) for p in glob.glob(spec, recursive=True))
+            if not matches:
+                logger.warning(f"No files match {spec}")
+            for match in matches:
+                if match.is_file():
+                    paths[match] = None
+            continue
+
+        path = Path(spec)
+        if path.is_dir():
+            for match in sorted(path.rglob('*.pdf')):
+                paths[match] = None
+        elif path.exists():
+            paths[path] = None
+        else:
+            raise FileNotFoundError(f"File not found: {path}")
+
+    return list(paths)
+
+
+class BatchReport:
+    """Per-file outcome and throughput of a batch run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.succeeded: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.rows = 0
+
+    def record_success(self, pdf_path: str) -> None:
+        if pdf_path not in self.failed:
+            self.succeeded.append(pdf_path)
+
+    def record_failure(self, pdf_path: str, error: BaseException) -> None:
+        self.failed[pdf_path] = f"{type(error).__name__}: {error}"
+        logger.error(f"❌ {pdf_path}: {self.failed[pdf_path]}")
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> Dict[str, float]:
+        elapsed = self.elapsed
+        files = len(self.succeeded) + len(self.failed)
+        return {
+            'files_ok': len(self.succeeded),
+            'files_failed': len(self.failed),
+            'rows': self.rows,
+            'seconds': round(elapsed, 2),
+            'files_per_second': round(files / elapsed, 2) if elapsed else 0.0,
+            'rows_per_second': round(self.rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def log(self) -> None:
+        summary = self.summary()
+        logger.info(
+            f"📊 {summary['files_ok']} files ok, {summary['files_failed']} failed, "
+            f"{summary['rows']} rows in {summary['seconds']}s "
+            f"({summary['files_per_second']} files/s, "
+            f"{summary['rows_per_second']} rows/s)"
+        )
+        for pdf_path, error in self.failed.items():
+            logger.info(f"   failed: {pdf_path} ({error})")
@@ -0,0 +1,126 @@
+"""
+Persistent crawl state of the motogp.com scrapers.
+Records what each visited URL held the last time it was crawled, so a run
+can skip pages and PDFs that can no longer change and leave the stored data
+alone when a re-checked page still holds the same records.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_PATH = Path('.etl_cache') / 'crawl_manifest.json'
+
+# Known to be worth visiting, not extracted yet
+STATUS_PENDING = 'pending'
+STATUS_OK = 'ok'
+STATUS_FAILED = 'failed'
+
+
+def records_hash(records) -> str:
+    """SHA-256 of extracted records, independent of key order"""
+    content = json.dumps(records, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class CrawlManifest:
+    """URL -> hash, ETag, extracted_at and status of its last crawl
+
+    An entry marked final holds content that won't change any more, such as
+    a finished event page or a published PDF; once extracted with status ok
+    it is done and later runs skip it. Everything else is re-checked, and
+    unchanged() tells whether the records found there are the same as before.
+
+    Stored as one JSON file, written atomically by save().
+    """
+
+    def __init__(self, path: Path = DEFAULT_MANIFEST_PATH):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    @classmethod
+    def from_env(cls) -> Optional['CrawlManifest']:
+        """Open the manifest at CRAWL_MANIFEST, or return None when it is not set"""
+        path = os.getenv('CRAWL_MANIFEST')
+        return cls(path) if path else None
+
+    def load(self) -> None:
+        """Read the manifest file; a missing or unreadable one starts empty"""
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable crawl manifest {self.path}: {e}")
+            self.entries = {}
+        logger.info(f"Crawl manifest {self.path}: {len(self.entries)} URLs")
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.entries.get(url)
+            return dict(entry) if entry else None
+
+    def is_done(self, url: str) -> bool:
+        """Whether url is final and was extracted successfully"""
+        entry = self.get(url)
+        return bool(entry and entry.get('final') and entry['status'] == STATUS_OK)
+
+    def pending(self, urls: Iterable[str]) -> List[str]:
+        """The urls that are not done, in order"""
+        return [url for url in urls if not self.is_done(url)]
+
+    def unchanged(self, url: str, content_hash: str) -> bool:
+        """Whether the last successful crawl of url found the same content"""
+        entry = self.get(url)
+        return bool(entry and entry['status'] == STATUS_OK
+                    and entry.get('hash') == content_hash)
+
+    def record(self, url: str, status: str = STATUS_OK, content_hash: str = None,
+               etag: str = None, final: bool = None) -> None:
+        """Store the outcome of crawling url
+
+        Fields left as None keep their previous value.
+        """
+        with self._lock:
+            entry = self.entries.setdefault(url, {'final': False})
+            entry['status'] = status
+            entry['extracted_at'] = datetime.now(timezone.utc).isoformat()
+            if content_hash is not None:
+                entry['hash'] = content_hash
+            if etag is not None:
+                entry['etag'] = etag
+            if final is not None:
+                entry['final'] = final
+            self.dirty = True
+
+    def mark_final(self, url: str) -> None:
+        """Flag url's content as no longer changing, keeping its last crawl"""
+        with self._lock:
+            entry = self.entries.setdefault(url, {'status': STATUS_PENDING,
+                                                  'final': False})
+            if not entry['final']:
+                entry['final'] = True
+                self.dirty = True
+
+    def save(self) -> None:
+        """Write the manifest back to its file if anything changed"""
+        with self._lock:
+            if not self.dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.part")
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
@@ -4,27 +4,69 @@ Handles idempotent loading of race results into PostgreSQL.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select, update, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import pandas as pd
-from typing import Dict, Tuple
+from io import StringIO
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 import logging
+import time
 
 from app.backend.models import Rider, Season, RaceCircuit, ResultsRace
+from .key_resolver import KeyResolver
 
 logger = logging.getLogger(__name__)
 
+# 'orm' upserts through ORM objects (fine for a single PDF),
+# 'bulk' stages the DataFrame and upserts each table with set-based statements,
+# 'copy' is 'bulk' for the dimension tables but streams results_race through
+# COPY FROM STDIN into a staging table and merges it with a single statement,
+# 'auto' picks 'copy' or 'orm' from the size of each DataFrame
+LOAD_MODES = ('orm', 'bulk', 'copy', 'auto')
 
-def load_results_to_db(df: pd.DataFrame, session: Session) -> Dict[str, int]:
+# Rows per INSERT ... ON CONFLICT statement in bulk mode
+BULK_BATCH_SIZE = 1000
+
+# DataFrames at least this large are worth the staging table round trip in
+# 'auto' mode; a full chunk of the default pipeline chunk size (5000) is
+COPY_ROW_THRESHOLD = 2000
+
+# Temporary tables are never WAL-logged and are dropped at commit,
+# so concurrent loaders each get their own staging table
+_RESULTS_STAGE_TABLE = 'etl_results_stage'
+
+# Postgres sets xmax = 0 on freshly inserted tuples, which lets a single
+# upsert report whether each returned row was created or updated
+_INSERTED = literal_column('xmax = 0').label('inserted')
+
+
+def load_results_to_db(
+    df: pd.DataFrame,
+    session: Session,
+    mode: str = 'orm',
+    resolver: Optional[KeyResolver] = None
+) -> Dict[str, int]:
     """
     Load race results to database with idempotency.
     
     Args:
         df: DataFrame with race results
         session: SQLAlchemy session
+        mode: 'orm' for ORM upserts, 'bulk' for set-based
+            INSERT ... ON CONFLICT statements, 'copy' for a COPY-staged
+            merge of the results, 'auto' for 'copy' when df has at least
+            COPY_ROW_THRESHOLD rows and 'orm' otherwise (see LOAD_MODES)
+        resolver: Natural key cache to reuse across loads; a fresh one is
+            loaded from the database when not provided
     
     Returns:
         Dictionary with counts of created/updated records
     """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode '{mode}', expected one of {LOAD_MODES}")
+    if mode == 'auto':
+        mode = 'copy' if len(df) >= COPY_ROW_THRESHOLD else 'orm'
+
     stats = {
         'riders_created': 0,
         'riders_updated': 0,
@@ -34,165 +76,194 @@ def load_results_to_db(df: pd.DataFrame, session: Session) -> Dict[str, int]:
         'results_updated': 0,
     }
     
+    if resolver is None:
+        resolver = KeyResolver()
+
+    started = time.perf_counter()
     try:
-        logger.info(f"Processing {len(df)} race results...")
+        logger.info(f"Processing {len(df)} race results ({mode} mode)...")
+
+        if not resolver.loaded:
+            resolver.load(session)
+
+        if mode in ('bulk', 'copy'):
+            _bulk_load(df, session, resolver, stats, copy=(mode == 'copy'))
+            session.commit()
+            _log_throughput(len(df), started, mode)
+            logger.info(f"ETL completed: {stats}")
+            return stats
         
         # Step 1: Upsert Riders
-        rider_map = _upsert_riders(df, session, stats)
+        _upsert_riders(df, session, resolver, stats)
         
         # Step 2: Upsert Seasons
-        season_map = _upsert_seasons(df, session, stats)
+        _upsert_seasons(df, session, resolver, stats)
         
         # Step 3: Upsert Race Circuits
-        race_map = _upsert_race_circuits(df, session, season_map, stats)
+        _upsert_race_circuits(df, session, resolver, stats)
         
         # Step 4: Upsert Race Results
-        _upsert_race_results(df, session, rider_map, race_map, stats)
+        _upsert_race_results(df, session, resolver, stats)
         
         session.commit()
+        _log_throughput(len(df), started, mode)
         logger.info(f"ETL completed: {stats}")
         return stats
         
     except Exception as e:
         session.rollback()
+        resolver.invalidate()
         logger.error(f"ETL failed: {e}")
         raise
 
 
+def _log_throughput(row_count: int, started: float, mode: str) -> None:
+    """Log rows per second since started, to compare the load modes"""
+    elapsed = time.perf_counter() - started
+    rate = row_count / elapsed if elapsed > 0 else float('inf')
+    logger.info(
+        f"Loaded {row_count} rows in {elapsed:.2f}s ({rate:.0f} rows/s, {mode} mode)"
+    )
+
+
 def _upsert_riders(
     df: pd.DataFrame, 
     session: Session, 
+    resolver: KeyResolver,
     stats: Dict
-) -> Dict[Tuple[str, str], int]:
-    """Upsert riders and return mapping of (name, surname) -> rider_id"""
-    rider_map = {}
+) -> None:
+    """Upsert riders and register their ids in the resolver"""
     unique_riders = df[['rider_name', 'rider_surname', 'nationality']].drop_duplicates()
     
+    new_riders = {}
+    nationality_updates = {}
     for _, row in unique_riders.iterrows():
         name = row['rider_name']
         surname = row['rider_surname']
         nationality = row.get('nationality')
         
-        rider = session.query(Rider).filter(
-            and_(Rider.name == name, Rider.surname == surname)
-        ).first()
+        rider_id = resolver.rider_id(name, surname)
         
-        if rider:
-            if nationality and rider.nationality != nationality:
-                rider.nationality = nationality
+        if rider_id is not None:
+            if nationality and resolver.rider_nationality(rider_id) != nationality:
+                nationality_updates[rider_id] = nationality
+                resolver.rider_nationalities[rider_id] = nationality
                 stats['riders_updated'] += 1
+        elif (name, surname) in new_riders:
+            if nationality:
+                new_riders[(name, surname)].nationality = nationality
         else:
-            rider = Rider(name=name, surname=surname, nationality=nationality)
-            session.add(rider)
-            session.flush()
+            new_riders[(name, surname)] = Rider(
+                name=name, surname=surname, nationality=nationality
+            )
             stats['riders_created'] += 1
             logger.debug(f"Created rider: {name} {surname}")
-        
-        rider_map[(name, surname)] = rider.id
     
-    return rider_map
+    if nationality_updates:
+        session.execute(
+            update(Rider),
+            [
+                {'id': rider_id, 'nationality': nat}
+                for rider_id, nat in nationality_updates.items()
+            ]
+        )
+
+    if new_riders:
+        session.add_all(new_riders.values())
+        session.flush()
+        for rider in new_riders.values():
+            resolver.add_rider(rider.name, rider.surname, rider.id, rider.nationality)
 
 
 def _upsert_seasons(
     df: pd.DataFrame, 
     session: Session, 
+    resolver: KeyResolver,
     stats: Dict
-) -> Dict[Tuple[int, str], int]:
-    """Upsert seasons and return mapping of (year, category) -> season_id"""
-    season_map = {}
+) -> None:
+    """Create missing seasons and register their ids in the resolver"""
     unique_seasons = df[['season_year', 'category']].drop_duplicates()
     
+    new_seasons = {}
     for _, row in unique_seasons.iterrows():
         year = int(row['season_year'])
         category = row['category']
         
-        season = session.query(Season).filter(
-            and_(Season.year == year, Season.category == category)
-        ).first()
-        
-        if not season:
-            season = Season(year=year, category=category)
-            session.add(season)
-            session.flush()
+        if (resolver.season_id(year, category) is None
+                and (year, category) not in new_seasons):
+            new_seasons[(year, category)] = Season(year=year, category=category)
             stats['seasons_created'] += 1
             logger.debug(f"Created season: {year} {category}")
-        
-        season_map[(year, category)] = season.id
     
-    return season_map
+    if new_seasons:
+        session.add_all(new_seasons.values())
+        session.flush()
+        for season in new_seasons.values():
+            resolver.add_season(season.year, season.category, season.id)
 
 
 def _upsert_race_circuits(
     df: pd.DataFrame, 
     session: Session, 
-    season_map: Dict[Tuple[int, str], int],
+    resolver: KeyResolver,
     stats: Dict
-) -> Dict[Tuple[int, str, str], int]:
-    """Upsert race circuits and return mapping"""
-    race_map = {}
+) -> None:
+    """Create missing race circuits and register their ids in the resolver"""
     unique_races = df[['season_year', 'category', 'circuit', 'date']].drop_duplicates()
     
+    new_races = {}
     for _, row in unique_races.iterrows():
         year = int(row['season_year'])
         category = row['category']
         circuit = row['circuit']
         date = pd.to_datetime(row['date']).date() if pd.notna(row['date']) else None
         
-        season_id = season_map[(year, category)]
+        season_id = resolver.season_id(year, category)
+        key = (season_id, circuit, str(date))
         
-        race = session.query(RaceCircuit).filter(
-            and_(
-                RaceCircuit.season_id == season_id,
-                RaceCircuit.circuit == circuit,
-                RaceCircuit.date == date
+        if resolver.race_id(season_id, circuit, date) is None and key not in new_races:
+            new_races[key] = RaceCircuit(
+                season_id=season_id, circuit=circuit, date=date
             )
-        ).first()
-        
-        if not race:
-            race = RaceCircuit(season_id=season_id, circuit=circuit, date=date)
-            session.add(race)
-            session.flush()
             stats['races_created'] += 1
             logger.debug(f"Created race: {circuit} on {date}")
-        
-        race_map[(season_id, circuit, str(date))] = race.id
     
-    return race_map
+    if new_races:
+        session.add_all(new_races.values())
+        session.flush()
+        for race in new_races.values():
+            resolver.add_race(race.season_id, race.circuit, race.date, race.id)
 
 
 def _upsert_race_results(
     df: pd.DataFrame,
     session: Session,
-    rider_map: Dict[Tuple[str, str], int],
-    race_map: Dict[Tuple[int, str, str], int],
+    resolver: KeyResolver,
     stats: Dict
 ) -> None:
     """Upsert race results"""
+    rows = []
     for _, row in df.iterrows():
-        rider_id = rider_map[(row['rider_name'], row['rider_surname'])]
-        
-        year = int(row['season_year'])
-        category = row['category']
-        circuit = row['circuit']
-        date = str(pd.to_datetime(row['date']).date() if pd.notna(row['date']) else None)
-        
-        # Find season_id first
-        season_query = session.query(Season.id).filter(
-            and_(Season.year == year, Season.category == category)
-        ).first()
-        season_id = season_query[0]
-        
-        race_circuit_id = race_map[(season_id, circuit, date)]
+        rider_id = resolver.rider_id(row['rider_name'], row['rider_surname'])
+        season_id = resolver.season_id(row['season_year'], row['category'])
+        date = pd.to_datetime(row['date']).date() if pd.notna(row['date']) else None
+        race_circuit_id = resolver.race_id(season_id, row['circuit'], date)
         
         position = int(row['position']) if pd.notna(row['position']) else None
         points = float(row['points']) if pd.notna(row['points']) else None
-        
-        result = session.query(ResultsRace).filter(
-            and_(
-                ResultsRace.rider_id == rider_id,
-                ResultsRace.race_circuit_id == race_circuit_id
-            )
-        ).first()
+        rows.append((rider_id, race_circuit_id, position, points))
+
+    # One query for every existing result of the races in this batch
+    race_ids = list({race_circuit_id for _, race_circuit_id, _, _ in rows})
+    existing = {
+        (result.rider_id, result.race_circuit_id): result
+        for result in session.query(ResultsRace).filter(
+            ResultsRace.race_circuit_id.in_(race_ids)
+        )
+    }
+
+    for rider_id, race_circuit_id, position, points in rows:
+        result = existing.get((rider_id, race_circuit_id))
         
         if result:
             if result.position != position or result.points != points:
@@ -207,4 +278,311 @@ def _upsert_race_results(
                 points=points
             )
             session.add(result)
-            stats['results_created'] += 1
\ No newline at end of file
+            existing[(rider_id, race_circuit_id)] = result
+            stats['results_created'] += 1
+
+
+# ---------------------------------------------------------------------------
+# Set-based bulk mode
+# ---------------------------------------------------------------------------
+
+def _bulk_load(
+    df: pd.DataFrame,
+    session: Session,
+    resolver: KeyResolver,
+    stats: Dict,
+    copy: bool = False
+) -> None:
+    """Stage the DataFrame and upsert every table with set-based statements.
+
+    With copy=True the results are merged from a COPY-loaded staging table
+    instead of batched INSERT statements.
+    """
+    staged = _stage_results(df)
+
+    _bulk_upsert_riders(staged, session, resolver, stats)
+    _bulk_upsert_seasons(staged, session, resolver, stats)
+    _bulk_upsert_race_circuits(staged, session, resolver, stats)
+    if copy:
+        _copy_merge_race_results(staged, session, resolver, stats)
+    else:
+        _bulk_upsert_race_results(staged, session, resolver, stats)
+
+
+def _stage_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a copy of the results with python-native values and None for missing"""
+    staged = pd.DataFrame({
+        'rider_name': df['rider_name'],
+        'rider_surname': df['rider_surname'],
+        'nationality': df['nationality'],
+        'season_year': df['season_year'].astype(int),
+        'category': df['category'],
+        'circuit': df['circuit'],
+        'date': pd.to_datetime(df['date']).dt.date,
+        'position': pd.to_numeric(df['position']),
+        'points': pd.to_numeric(df['points']),
+    })
+    return staged.astype(object).where(staged.notna(), None)
+
+
+def _batches(rows: List[Dict], size: int = BULK_BATCH_SIZE) -> Iterator[List[Dict]]:
+    """Yield consecutive slices of rows with at most size elements"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _select_ids(
+    session: Session,
+    model,
+    key_columns: Sequence[str],
+    keys: List[Tuple],
+) -> Dict[Tuple, int]:
+    """Fetch ids for natural keys that an upsert did not return.
+
+    Only needed when another writer inserted a key after the resolver was
+    loaded. Filters on the first key column in SQL and matches the full key
+    in python, so keys containing NULLs (e.g. a race without a date) resolve too.
+    """
+    if not keys:
+        return {}
+
+    wanted = set(keys)
+    columns = [getattr(model, name) for name in key_columns]
+    first_values = list({key[0] for key in wanted})
+
+    id_map = {}
+    for start in range(0, len(first_values), BULK_BATCH_SIZE):
+        chunk = first_values[start:start + BULK_BATCH_SIZE]
+        rows = session.execute(
+            select(model.id, *columns).where(columns[0].in_(chunk))
+        )
+        for row in rows:
+            key = tuple(row[1:])
+            if key in wanted:
+                id_map[key] = row[0]
+    return id_map
+
+
+def _bulk_upsert_riders(
+    staged: pd.DataFrame,
+    session: Session,
+    resolver: KeyResolver,
+    stats: Dict
+) -> None:
+    """Upsert new riders and changed nationalities, registering ids in the resolver"""
+    # One row per rider with its last known nationality, so a row without
+    # one never hides (or overwrites) a nationality given elsewhere
+    unique_riders = staged.groupby(
+        ['rider_name', 'rider_surname'], sort=False, dropna=False
+    )['nationality'].last()
+    rows = []
+    for (name, surname), nationality in unique_riders.items():
+        rider_id = resolver.rider_id(name, surname)
+        if rider_id is None or (
+            nationality and resolver.rider_nationality(rider_id) != nationality
+        ):
+            rows.append({'name': name, 'surname': surname, 'nationality': nationality})
+
+    for batch in _batches(rows):
+        stmt = pg_insert(Rider).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_riders_name_surname',
+            set_={'nationality': stmt.excluded.nationality},
+            where=and_(
+                stmt.excluded.nationality.isnot(None),
+                Rider.nationality.is_distinct_from(stmt.excluded.nationality),
+            ),
+        ).returning(Rider.id, Rider.name, Rider.surname, Rider.nationality, _INSERTED)
+
+        for rider_id, name, surname, nationality, inserted in session.execute(stmt):
+            resolver.add_rider(name, surname, rider_id, nationality)
+            stats['riders_created' if inserted else 'riders_updated'] += 1
+
+    missing = [
+        (r['name'], r['surname']) for r in rows
+        if resolver.rider_id(r['name'], r['surname']) is None
+    ]
+    found = _select_ids(session, Rider, ('name', 'surname'), missing)
+    for (name, surname), rider_id in found.items():
+        resolver.add_rider(name, surname, rider_id)
+
+
+def _bulk_upsert_seasons(
+    staged: pd.DataFrame,
+    session: Session,
+    resolver: KeyResolver,
+    stats: Dict
+) -> None:
+    """Insert missing seasons and register their ids in the resolver"""
+    unique_seasons = staged[['season_year', 'category']].drop_duplicates()
+    rows = [
+        {'year': int(year), 'category': category}
+        for year, category in unique_seasons.itertuples(index=False)
+        if resolver.season_id(year, category) is None
+    ]
+
+    for batch in _batches(rows):
+        stmt = pg_insert(Season).values(batch).on_conflict_do_nothing(
+            constraint='uq_seasons_year_category'
+        ).returning(Season.id, Season.year, Season.category)
+
+        for season_id, year, category in session.execute(stmt):
+            resolver.add_season(year, category, season_id)
+            stats['seasons_created'] += 1
+
+    missing = [
+        (r['year'], r['category']) for r in rows
+        if resolver.season_id(r['year'], r['category']) is None
+    ]
+    found = _select_ids(session, Season, ('year', 'category'), missing)
+    for (year, category), season_id in found.items():
+        resolver.add_season(year, category, season_id)
+
+
+def _bulk_upsert_race_circuits(
+    staged: pd.DataFrame,
+    session: Session,
+    resolver: KeyResolver,
+    stats: Dict
+) -> None:
+    """Insert missing race circuits and register their ids in the resolver"""
+    unique_races = staged[
+        ['season_year', 'category', 'circuit', 'date']
+    ].drop_duplicates()
+    rows = []
+    for year, category, circuit, date in unique_races.itertuples(index=False):
+        season_id = resolver.season_id(year, category)
+        if resolver.race_id(season_id, circuit, date) is None:
+            rows.append({'season_id': season_id, 'circuit': circuit, 'date': date})
+
+    for batch in _batches(rows):
+        stmt = pg_insert(RaceCircuit).values(batch).on_conflict_do_nothing(
+            constraint='uq_race_circuits_season_circuit_date'
+        ).returning(
+            RaceCircuit.id, RaceCircuit.season_id, RaceCircuit.circuit, RaceCircuit.date
+        )
+
+        for race_id, season_id, circuit, date in session.execute(stmt):
+            resolver.add_race(season_id, circuit, date, race_id)
+            stats['races_created'] += 1
+
+    missing = [
+        (r['season_id'], r['circuit'], r['date']) for r in rows
+        if resolver.race_id(r['season_id'], r['circuit'], r['date']) is None
+    ]
+    for (season_id, circuit, date), race_id in _select_ids(
+        session, RaceCircuit, ('season_id', 'circuit', 'date'), missing
+    ).items():
+        resolver.add_race(season_id, circuit, date, race_id)
+
+
+def _bulk_upsert_race_results(
+    staged: pd.DataFrame,
+    session: Session,
+    resolver: KeyResolver,
+    stats: Dict
+) -> None:
+    """Upsert race results in batches, updating only rows whose values changed"""
+    results = _resolve_results(staged, resolver)
+
+    for batch in _batches(results):
+        stmt = pg_insert(ResultsRace).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_results_race_rider_race',
+            set_={'position': stmt.excluded.position, 'points': stmt.excluded.points},
+            where=(
+                ResultsRace.position.is_distinct_from(stmt.excluded.position)
+                | ResultsRace.points.is_distinct_from(stmt.excluded.points)
+            ),
+        ).returning(_INSERTED)
+
+        for (inserted,) in session.execute(stmt):
+            stats['results_created' if inserted else 'results_updated'] += 1
+
+
+def _resolve_results(staged: pd.DataFrame, resolver: KeyResolver) -> List[Dict]:
+    """Map staged rows to results_race rows, one per (rider_id, race_circuit_id)"""
+    results = {}
+    for row in staged.itertuples(index=False):
+        rider_id = resolver.rider_id(row.rider_name, row.rider_surname)
+        season_id = resolver.season_id(row.season_year, row.category)
+        race_circuit_id = resolver.race_id(season_id, row.circuit, row.date)
+
+        # Later rows win, like the ORM path which updates in DataFrame order
+        results[(rider_id, race_circuit_id)] = {
+            'rider_id': rider_id,
+            'race_circuit_id': race_circuit_id,
+            'position': int(row.position) if row.position is not None else None,
+            'points': float(row.points) if row.points is not None else None,
+        }
+    return list(results.values())
+
+
+# ---------------------------------------------------------------------------
+# COPY staging mode
+# ---------------------------------------------------------------------------
+
+def _copy_merge_race_results(
+    staged: pd.DataFrame,
+    session: Session,
+    resolver: KeyResolver,
+    stats: Dict
+) -> None:
+    """COPY results into a temporary staging table and merge them in one statement"""
+    results = _resolve_results(staged, resolver)
+    if not results:
+        return
+
+    session.execute(text(
+        f"CREATE TEMPORARY TABLE IF NOT EXISTS {_RESULTS_STAGE_TABLE} ("
+        "rider_id integer NOT NULL, "
+        "race_circuit_id integer NOT NULL, "
+        "position integer, "
+        "points double precision"
+        ") ON COMMIT DROP"
+    ))
+
+    # Position goes through Int64 so a missing value doesn't turn the
+    # column into floats ('3.0' is not a valid integer for COPY)
+    frame = pd.DataFrame(
+        results, columns=['rider_id', 'race_circuit_id', 'position', 'points']
+    )
+    frame['position'] = frame['position'].astype('Int64')
+    buffer = StringIO()
+    frame.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    # COPY is not exposed by SQLAlchemy; use the psycopg2 cursor of the
+    # session's connection so it runs in the same transaction
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_RESULTS_STAGE_TABLE} "
+            "(rider_id, race_circuit_id, position, points) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+    created, updated = session.execute(text(
+        f"""
+        WITH merged AS (
+            INSERT INTO results_race (rider_id, race_circuit_id, position, points)
+            SELECT rider_id, race_circuit_id, position, points
+            FROM {_RESULTS_STAGE_TABLE}
+            ON CONFLICT ON CONSTRAINT uq_results_race_rider_race DO UPDATE
+            SET position = EXCLUDED.position, points = EXCLUDED.points
+            WHERE results_race.position IS DISTINCT FROM EXCLUDED.position
+               OR results_race.points IS DISTINCT FROM EXCLUDED.points
+            RETURNING xmax = 0 AS inserted
+        )
+        SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+        FROM merged
+        """
+    )).one()
+    stats['results_created'] += created
+    stats['results_updated'] += updated
+
+    # Empty the staging table in case another load runs before the commit
+    session.execute(text(f"TRUNCATE {_RESULTS_STAGE_TABLE}"))
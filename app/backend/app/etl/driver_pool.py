@@ -0,0 +1,244 @@
+"""
+Bounded pool of headless Chrome drivers shared by the motogp.com scrapers.
+Drivers are started on demand up to the pool size, reused across pages and
+replaced after a fixed number of pages or when they crash. map() spreads
+page tasks over the pool and reports the throughput.
+
+The scrapers only read DOM text and hrefs, so pool drivers run in lean mode
+by default: no images, no fonts or third-party trackers, eager page loads
+and the cookie banner pre-answered.
+"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Tuple, TypeVar, Union
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from .scraper_waits import CONSENT_COOKIE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 3
+# Pages a driver serves before it is replaced, to bound Chrome's memory growth
+DEFAULT_MAX_PAGES = 50
+
+# Requests a lean driver refuses: web fonts, analytics, ads and the OneTrust
+# banner itself, whose answer is pre-set with CONSENT_COOKIE instead
+BLOCKED_URL_PATTERNS = [
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*facebook.com/tr*',
+    '*hotjar.com*', '*scorecardresearch.com*', '*cookielaw.org*', '*onetrust.com*',
+]
+CONSENT_COOKIE_DOMAIN = '.motogp.com'
+
+T = TypeVar('T')
+Item = TypeVar('Item')
+
+
+def create_driver(headless: bool = True, lean: bool = False) -> webdriver.Chrome:
+    """Start a Chrome driver with the scrapers' standard options
+
+    Args:
+        headless: Run Chrome without a window
+        lean: Skip images, fonts and trackers, return from get() once the DOM
+            is ready and pre-answer the cookie banner
+    """
+    try:
+        chrome_options = Options()
+
+        if headless:
+            chrome_options.add_argument('--headless')
+
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+
+        if lean:
+            chrome_options.add_experimental_option(
+                'prefs', {'profile.managed_default_content_settings.images': 2}
+            )
+            # get() returns on DOMContentLoaded; the readiness waits cover the rest
+            chrome_options.page_load_strategy = 'eager'
+
+        driver = webdriver.Chrome(options=chrome_options)
+        if lean:
+            _apply_lean_network(driver)
+        logger.info(f"ChromeDriver initialized successfully{' (lean)' if lean else ''}")
+        return driver
+
+    except Exception as e:
+        logger.error(f"Failed to initialize ChromeDriver: {e}")
+        raise
+
+
+def _apply_lean_network(driver: webdriver.Chrome) -> None:
+    """Block BLOCKED_URL_PATTERNS and set the consent cookie through CDP
+
+    CDP sets the cookie before the first page load, which driver.add_cookie()
+    can't do as it needs the domain open already.
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    driver.execute_cdp_cmd('Network.setCookie', {
+        'name': CONSENT_COOKIE,
+        'value': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        'domain': CONSENT_COOKIE_DOMAIN,
+        'path': '/',
+        'secure': True,
+    })
+
+
+def _is_alive(driver) -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """Pool of at most size Chrome drivers
+
+    Borrow a driver with ``with pool.driver() as driver:``. Each borrow
+    counts as one page. A driver that has served max_pages pages, or stops
+    responding after a failed task, is quit and replaced on the next borrow.
+    Drivers are started in lean mode unless lean is False.
+    """
+
+    # Whether the drivers serve recorded pages instead of the live site
+    replay = False
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        headless: bool = True,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        driver_factory: Callable[..., webdriver.Chrome] = create_driver,
+        lean: bool = True
+    ):
+        self.size = size
+        self.headless = headless
+        self.lean = lean
+        self.max_pages = max_pages
+        self.driver_factory = driver_factory
+
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._pages: Dict[int, int] = {}  # id(driver) -> pages served
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'pages': 0, 'failed': 0,
+                      'drivers_started': 0, 'drivers_recycled': 0}
+
+    @contextmanager
+    def driver(self) -> Iterator[webdriver.Chrome]:
+        """Borrow a driver for one page, blocking while all of them are busy"""
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        self._slots.acquire()
+        driver = None
+        try:
+            driver = self._checkout()
+            yield driver
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            if driver is not None and not _is_alive(driver):
+                logger.warning("Driver stopped responding, replacing it")
+                self._discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._checkin(driver)
+            self._slots.release()
+
+    def _checkout(self) -> webdriver.Chrome:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            driver = self.driver_factory(headless=self.headless, lean=self.lean)
+            with self._lock:
+                self._pages[id(driver)] = 0
+                self.stats['drivers_started'] += 1
+            return driver
+
+    def _checkin(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            self.stats['pages'] += 1
+            self._pages[id(driver)] += 1
+            worn_out = self._pages[id(driver)] >= self.max_pages
+        if worn_out or self._closed:
+            self._discard(driver, recycled=not self._closed)
+        else:
+            self._idle.put(driver)
+
+    def _discard(self, driver: webdriver.Chrome, recycled: bool = True) -> None:
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            if recycled:
+                self.stats['drivers_recycled'] += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting driver: {e}")
+
+    def map(
+        self,
+        task: Callable[[webdriver.Chrome, Item], T],
+        items: Iterable[Item],
+        return_exceptions: bool = False
+    ) -> Iterator[Tuple[Item, Union[T, Exception]]]:
+        """Run task(driver, item) for every item on the pool's drivers
+
+        Yields (item, result) in input order. With return_exceptions a
+        failed item yields its exception instead of raising it.
+        """
+        items = list(items)
+        started = time.perf_counter()
+
+        def run(item: Item) -> T:
+            with self.driver() as driver:
+                return task(driver, item)
+
+        max_workers = min(self.size, len(items)) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run, item) for item in items]
+            for item, future in zip(items, futures):
+                try:
+                    yield item, future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    yield item, e
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"📊 {len(items)} pages in {elapsed:.1f}s "
+            f"({len(items) / elapsed * 60 if elapsed else 0:.1f} pages/min)"
+        )
+
+    def close(self) -> None:
+        """Quit every idle driver; borrowed ones are quit when returned"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait(), recycled=False)
+            except queue.Empty:
+                break
+        logger.info(f"ChromeDriver pool closed: {self.stats}")
+
+    def __enter__(self) -> 'DriverPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
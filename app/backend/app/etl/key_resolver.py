@@ -0,0 +1,94 @@
+"""
+In-memory natural key resolution for the ETL loader.
+Loads every existing rider, season and race key once per load so that
+lookups during the upsert steps never go back to the database.
+"""
+
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+import logging
+
+from app.backend.models import Rider, Season, RaceCircuit
+
+logger = logging.getLogger(__name__)
+
+
+class KeyResolver:
+    """Cache of natural key -> id mappings for riders, seasons and races.
+
+    Keys follow the loader conventions:
+        - riders: (name, surname)
+        - seasons: (year, category)
+        - races: (season_id, circuit, str(date))
+
+    A resolver can be shared across several loads (e.g. one per chunk), but
+    must be invalidated after a rollback since it may hold ids that were
+    never committed.
+    """
+
+    def __init__(self):
+        self.riders: Dict[Tuple[str, str], int] = {}
+        self.rider_nationalities: Dict[int, Optional[str]] = {}
+        self.seasons: Dict[Tuple[int, str], int] = {}
+        self.races: Dict[Tuple[int, str, str], int] = {}
+        self.loaded = False
+
+    def load(self, session: Session) -> 'KeyResolver':
+        """Load all existing natural keys with one query per entity type"""
+        self.riders.clear()
+        self.rider_nationalities.clear()
+        self.seasons.clear()
+        self.races.clear()
+
+        for rider_id, name, surname, nationality in session.query(
+            Rider.id, Rider.name, Rider.surname, Rider.nationality
+        ):
+            self.add_rider(name, surname, rider_id, nationality)
+
+        for season_id, year, category in session.query(
+            Season.id, Season.year, Season.category
+        ):
+            self.add_season(year, category, season_id)
+
+        for race_id, season_id, circuit, date in session.query(
+            RaceCircuit.id, RaceCircuit.season_id, RaceCircuit.circuit, RaceCircuit.date
+        ):
+            self.add_race(season_id, circuit, date, race_id)
+
+        self.loaded = True
+        logger.info(
+            f"Key cache loaded: {len(self.riders)} riders, "
+            f"{len(self.seasons)} seasons, {len(self.races)} races"
+        )
+        return self
+
+    def invalidate(self) -> None:
+        """Mark the cache stale so the next load reads the database again"""
+        self.loaded = False
+
+    # Lookups ---------------------------------------------------------------
+
+    def rider_id(self, name: str, surname: str) -> Optional[int]:
+        return self.riders.get((name, surname))
+
+    def rider_nationality(self, rider_id: int) -> Optional[str]:
+        return self.rider_nationalities.get(rider_id)
+
+    def season_id(self, year: int, category: str) -> Optional[int]:
+        return self.seasons.get((int(year), category))
+
+    def race_id(self, season_id: int, circuit: str, date) -> Optional[int]:
+        return self.races.get((season_id, circuit, str(date)))
+
+    # Registration of newly created ids -------------------------------------
+
+    def add_rider(self, name: str, surname: str, rider_id: int,
+                  nationality: Optional[str] = None) -> None:
+        self.riders[(name, surname)] = rider_id
+        self.rider_nationalities[rider_id] = nationality
+
+    def add_season(self, year: int, category: str, season_id: int) -> None:
+        self.seasons[(int(year), category)] = season_id
+
+    def add_race(self, season_id: int, circuit: str, date, race_id: int) -> None:
+        self.races[(season_id, circuit, str(date))] = race_id
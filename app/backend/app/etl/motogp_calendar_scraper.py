@@ -6,19 +6,24 @@
 
 
 #.---- refactor the navigation part with the expected outome EC 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 
+from .crawl_manifest import CrawlManifest, records_hash
+from .driver_pool import DriverPool
+from .scraper_parsers import parse_calendar
+from .scraper_waits import (
+    DEFAULT_BANNER_TIMEOUT, DEFAULT_PAGE_TIMEOUT, dismiss_cookie_banner,
+    wait_for_element
+)
+
 import logging
-import time
-import datetime 
+from datetime import datetime
 import json
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -26,33 +31,33 @@ class MotoGPCalendarScraper:
     """Scraper to extract calendar of MotoGP website using Selenium"""
     
     CALENDAR_URL = "https://www.motogp.com/en/calendar?view=grid"
+    CALENDAR_GRID = (By.XPATH, '//div[contains(@class, "calendar-listing__grid-view")]')
+    # Card status of events that are over; their pages are marked final in the
+    # crawl manifest
+    FINISHED_STATUS = 'finished'
     
-    def __init__(self, headless: bool = True):
-        self.driver = None
+    def __init__(self, headless: bool = True, pool: DriverPool = None,
+                 page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+                 banner_timeout: float = DEFAULT_BANNER_TIMEOUT,
+                 manifest: CrawlManifest = None):
+        """
+        Args:
+            headless: Run Chrome without a window (when the scraper starts its
+                own driver)
+            pool: Shared driver pool; without one the scraper owns a single driver
+            page_timeout: Upper bound of the page readiness wait, in seconds
+            banner_timeout: Upper bound of the cookie banner wait, in seconds
+            manifest: Crawl state for incremental runs (default: CRAWL_MANIFEST, if set,
+                unless the pool replays recorded pages)
+        """
         self.headless = headless
-        self._setup_driver()
-    
-    def _setup_driver(self):
-        """Initialize ChromeDriver with automatic driver management"""
-        try:
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            # Automatically download and manage ChromeDriver
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            logger.info("ChromeDriver initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize ChromeDriver: {e}")
-            raise
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else DriverPool(size=1, headless=headless)
+        if manifest is None and not self.pool.replay:
+            manifest = CrawlManifest.from_env()
+        self.manifest = manifest
+        self.page_timeout = page_timeout
+        self.banner_timeout = banner_timeout
     
     def calendar_extract(self, download_dir: str = None, push_to_supabase: bool = True):
         """Extract PDFs from MotoGP page following the outlined steps
@@ -67,126 +72,115 @@ class MotoGPCalendarScraper:
         CALENDAR_URL = "https://www.motogp.com/en/calendar?view=grid"
         try:
                         
-            self.driver.get(CALENDAR_URL)
-            time.sleep(5)  # attendi che la pagina si carichi completamente
-
-            self.driver.find_element(By.ID, "onetrust-reject-all-handler").click()
-            time.sleep(2)  # attendi che il banner scompaia
+            with self.pool.driver() as driver:
+                driver.get(CALENDAR_URL)
+                dismiss_cookie_banner(driver, self.banner_timeout)
+                wait_for_element(driver, self.CALENDAR_GRID, self.page_timeout,
+                                 step="calendar grid")
 
-            # trovare la componente che mi serve
-            # xpath '//div[contains(@class, "calendar-listing__grid-view")]'
-            calendar = self.driver.find_element(By.XPATH, '//div[contains(@class, "calendar-listing__grid-view")]')
-            ## get elements inside the components 
+                # Read the page once and parse every card from the HTML
+                races_data = parse_calendar(driver.page_source, driver.current_url)
 
-            races = calendar.find_elements(By.CSS_SELECTOR, 'a.calendar-grid-card')
-            # Step 2: For each container, find elements by href
-            
-            races_data = []
-            for index, race in enumerate(races, 1):
-                try:
-                    # Extract attributes from the <a> tag
-                    event_id = race.get_attribute("data-event-id")
-                    title = race.get_attribute("title")
-                    href = race.get_attribute("href")
-                    
-                    # Extract text from nested elements
-                    try:
-                        status = race.find_element(By.CSS_SELECTOR, '.calendar-grid-card__grid-card-status').text
-                    except Exception as e:
-                        print(f"⚠️ No status found for race: {e}".format(index))
-                        status = None
-                    
-                    date_range = race.find_element(By.CSS_SELECTOR, '.calendar-grid-card__grid-card-date span').text
-                    sequence = race.find_element(By.CSS_SELECTOR, '.calendar-grid-card__grid-card-event-sequence').text.strip()
-                    country = race.find_element(By.CSS_SELECTOR, '.calendar-grid-card__grid-card-event-full-name').text
-                    event_name = race.find_element(By.CSS_SELECTOR, '.calendar-grid-card__grid-card-event-name').text
-                    
-                    # Extract flag image URL
-                    try:
-                        flag_url = race.find_element(By.CSS_SELECTOR, '.calendar-grid-card__event-flag').get_attribute('src')
-                    except Exception as e:
-                        print(f"⚠️ No flag found {e}")
-                        flag_url = None
-                    
-                    race_info = {
-                        'sequence': int(sequence),
-                        'event_id': event_id,
-                        'title': title,
-                        'country': country,
-                        'event_name': event_name,
-                        'date_range': date_range,
-                        'status': status,
-                        'url': href,
-                        'flag_url': flag_url
-                    }
-                    
-                    races_data.append(race_info)
-                    
-                    print(f"{sequence}. {country} - {event_name}")
-                    print(f"   Date: {date_range}")
-                    print(f"   Status: {status}")
-                    print(f"   URL: {href}")
-                    print()
-                    
-                except Exception as e:
-                    print(f"❌ Error extracting race {index}: {e}")
-                    continue
-
-            self.driver.close()
+            for race_info in races_data:
+                print(f"{race_info['sequence']}. {race_info['country']} - "
+                      f"{race_info['event_name']}")
+                print(f"   Date: {race_info['date_range']}")
+                print(f"   Status: {race_info['status']}")
+                print(f"   URL: {race_info['url']}")
+                print()
 
             print(f"\n✅ Successfully extracted {len(races_data)} races")
             
             # Step 4: Push the PDFs to Supabase as json
             races_df = pd.DataFrame(races_data)
 
-                # Push to Supabase if requested
-            if push_to_supabase and races_data:
+            # The season's calendar is always re-read, but only pushed when it changed
+            push = push_to_supabase and not self.pool.replay
+            calendar_hash = records_hash(races_data)
+            unchanged = (self.manifest is not None
+                         and self.manifest.unchanged(CALENDAR_URL, calendar_hash))
+            if unchanged:
+                logger.info("Calendar unchanged since the last crawl")
+
+            if push and races_data and not unchanged:
                 self._push_calendar_to_supabase(races_data, races_df)
+
+            if self.manifest is not None:
+                # The hash marks the calendar as stored: only a pushing run records it
+                self._record_crawl(CALENDAR_URL, calendar_hash if push else None,
+                                   races_data)
             
             return races_df
             
         except Exception as e:
             logger.error(f"Error in pdf_extract: {e}")
             raise
-    def _push_calendar_to_supabase(self, races_data: list, races_df: pd.DataFrame):
-        """Push calendar data to Supabase as JSON (from memory)"""
+
+    def _record_crawl(self, calendar_url: str, calendar_hash: Optional[str],
+                      races_data: list) -> None:
+        """Mark the pages of finished events final and store the calendar's hash,
+        if given"""
+        finished = [
+            race_info['url'] for race_info in races_data
+            if race_info['url']
+            and (race_info['status'] or '').casefold() == self.FINISHED_STATUS
+        ]
+        for event_url in finished:
+            self.manifest.mark_final(event_url)
+        if calendar_hash is not None:
+            self.manifest.record(calendar_url, content_hash=calendar_hash)
+        self.manifest.save()
+        logger.info(f"Crawl manifest: {len(finished)} finished events")
+
+    def _push_calendar_to_supabase(self, races_data: list,
+                                   races_df: pd.DataFrame) -> dict:
+        """Push calendar data to Supabase as JSON (from memory)
+
+        Returns:
+            Dictionary with counts of uploaded/skipped objects
+        """
         try:
-            from storage.storage_client import StorageClient
+            from ..storage.factory import get_storage_client
             import io
             
-            storage_client = StorageClient()
-            storage_client.create_bucket('motogp_data', public=False)
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            year = datetime.now().year
-            
-            # Convert to JSON string
-            json_string = json.dumps(races_data, indent=2)
-            json_bytes = io.BytesIO(json_string.encode('utf-8'))
-            
-            # Upload directly from memory
-            json_filename = f'calendar_{year}_{timestamp}.json'
-            
-            # Note: You'll need to add this method to StorageClient
-            storage_client.upload_from_memory(
-                bucket_name='motogp_data',
-                file_content=json_bytes.getvalue(),
-                object_name=json_filename,
-                folder_path=f'{year}/calendar',
-                content_type='application/json'
-            )
-            
-            logger.info(f"✅ Uploaded calendar JSON to Supabase: {json_filename}")
+            with get_storage_client() as storage_client:
+                storage_client.create_bucket('motogp_data', public=False)
+
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                year = datetime.now().year
+
+                # Convert to JSON string
+                json_string = json.dumps(races_data, indent=2)
+                json_bytes = io.BytesIO(json_string.encode('utf-8'))
+
+                # Upload directly from memory
+                json_filename = f'calendar_{year}_{timestamp}.json'
+
+                # Identical content already stored under an older timestamp is skipped
+                url = storage_client.upload_from_memory(
+                    bucket_name='motogp_data',
+                    file_content=json_bytes.getvalue(),
+                    object_name=json_filename,
+                    folder_path=f'{year}/calendar',
+                    content_type='application/json',
+                    skip_unchanged=True,
+                    match_folder=True
+                )
+
+            counts = {'uploaded': 0 if url is None else 1,
+                      'skipped': 1 if url is None else 0}
+            logger.info(f"✅ Calendar JSON pushed to Supabase: "
+                        f"{counts['uploaded']} uploaded, {counts['skipped']} skipped")
+            return counts
             
         except Exception as e:
             logger.error(f"Error pushing calendar to Supabase: {e}")
             raise
 
     def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
-            logger.info("ChromeDriver closed")
+        """Close the browser, unless it belongs to a shared pool"""
+        if self._owns_pool:
+            self.pool.close()
     
     def __enter__(self):
         return self
@@ -4,19 +4,18 @@
 ### the pdfs are then stored in a folder structure that mirrors the motogp one
 ### the pdfs will be then taken by the pdf_tybles
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+from .crawl_manifest import STATUS_FAILED, STATUS_OK, CrawlManifest, records_hash
+from .driver_pool import DriverPool
+from .pdf_fetcher import DEFAULT_FETCH_WORKERS, PdfFetcher
+from .scraper_parsers import parse_pdf_links
+from .scraper_waits import DEFAULT_PAGE_TIMEOUT, wait_for_element
+
 import logging
 import os
-import time
 import tempfile
-import shutil
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 
@@ -26,43 +25,69 @@ class MotoGPPdfsDownloader:
     """Scraper to extract calendar of MotoGP website using Selenium"""
     
     MAIN_PAGE = 'https://www.motogp.com/en'
+    PDF_TABLES = (By.XPATH, '//div[contains(@class, "pdf-table__table ")]')
     
-    def __init__(self, headless: bool = True):
-        self.driver = None
+    def __init__(self, headless: bool = True, pool: DriverPool = None,
+                 page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+                 fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                 manifest: CrawlManifest = None):
         self.headless = headless
-        self._setup_driver()
-    
-    def _setup_driver(self):
-        """Initialize ChromeDriver with automatic driver management"""
-        try:
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            # Automatically download and manage ChromeDriver
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            logger.info("ChromeDriver initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize ChromeDriver: {e}")
-            raise
+        # Drivers are borrowed from a shared pool when given, else from an own
+        # single-driver one
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else DriverPool(size=1, headless=headless)
+        # Upper bound of the readiness waits, in seconds
+        self.page_timeout = page_timeout
+        # PDFs fetched concurrently once their links are known
+        self.fetch_workers = fetch_workers
+        # Crawl state for incremental runs (default: CRAWL_MANIFEST, if set,
+        # unless replaying)
+        if manifest is None and not self.pool.replay:
+            manifest = CrawlManifest.from_env()
+        self.manifest = manifest
+
+    def _scrape_pdf_page(self, driver, page_url: str) -> list:
+        """Load a page on driver and collect the links of its PDF tables"""
+        driver.get(page_url)
+
+        # Wait for elements to be present
+        wait_for_element(driver, self.PDF_TABLES, self.page_timeout, step="PDF tables")
+
+        # Collect the PDF links of every container from one page read
+        pdf_links = parse_pdf_links(driver.page_source, driver.current_url)
+        logger.info(f"Found {len(pdf_links)} PDF links on {page_url}")
+        return pdf_links
     
+    def extract_links(self, pages: list = None) -> dict:
+        """Collect the PDF links of pages, spread over the pool
+
+        Pages the crawl manifest has as done are left out.
+
+        Returns:
+            dict: Page URL -> list of links (see parse_pdf_links)
+        """
+        pages = list(pages or [self.MAIN_PAGE])
+        if self.manifest is not None:
+            pending = self.manifest.pending(pages)
+            logger.info(f"Skipping {len(pages) - len(pending)} finished pages")
+            pages = pending
+        return dict(self.pool.map(self._scrape_pdf_page, pages))
+
     ## needs url setup
     ### in questa funzione devo fare un compilatore per tutti gli url che vanno usati. 
     ### ogni sessione, ogni gara ecc.
-    def pdf_extract(self, download_dir: str = None, push_to_supabase: bool = True):
+    def pdf_extract(self, download_dir: str = None, push_to_supabase: bool = True,
+                    pages: list = None):
         """Extract PDFs from MotoGP page following the outlined steps
         
+        With a crawl manifest, pages of finished events that were fully
+        extracted before are not visited, and PDFs already stored are not
+        fetched again.
+
         Args:
             download_dir: Directory to store PDFs (if None, uses temporary directory)
             push_to_supabase: Whether to push PDFs to Supabase storage
+            pages: Page URLs whose PDF tables to collect (default: MAIN_PAGE)
             
         Returns:
             list: List of downloaded PDF file paths
@@ -75,52 +100,44 @@ class MotoGPPdfsDownloader:
             else:
                 os.makedirs(download_dir, exist_ok=True)
             
-            # Configure Chrome to download files to our specified directory
-            self._configure_download_directory(download_dir)
-            
-            downloaded_files = []
-            
-            # Step 1: Find the elements with xpath //div[contains(@class, "pdf-table__table ")]
-            # Should be 3 containers
-            self.driver.get(self.MAIN_PAGE)
-            xpath_files = '//div[contains(@class, "pdf-table__table ")]'
-            
-            # Wait for elements to be present
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(EC.presence_of_element_located((By.XPATH, xpath_files)))
-            
-            containers = self.driver.find_elements(By.XPATH, xpath_files)
-            logger.info(f"Found {len(containers)} PDF table containers")
-            
-            # Step 2: For each container, find elements by href
-            for i, container in enumerate(containers, 1):
-                logger.info(f"Processing container {i}/{len(containers)}")
-                
-                # Find all anchor tags with href attributes (PDF links)
-                pdf_links = container.find_elements(By.XPATH, './/a[@href]')
-                
-                for j, link in enumerate(pdf_links, 1):
-                    try:
-                        href = link.get_attribute('href')
-                        
-                        # Check if it's a PDF link
-                        if href and href.lower().endswith('.pdf'):
-                            logger.info(f"Found PDF link {j}: {href}")
-                            
-                            # Step 3: Click and download the file
-                            pdf_file = self._download_pdf(link, href, download_dir, f"container_{i}_pdf_{j}")
-                            if pdf_file:
-                                downloaded_files.append(pdf_file)
-                                
-                    except Exception as e:
-                        logger.error(f"Error processing PDF link {j} in container {i}: {e}")
-                        continue
+            # Step 1-2: Collect the PDF links of every page, spread over the pool
+            page_links = self.extract_links(pages)
+            if self.pool.replay:
+                logger.info("Replaying recorded pages: PDFs are not fetched")
+                return []
+
+            # Step 3: Fetch the new ones over HTTP with the browser's cookies,
+            # many at a time
+            downloads = [
+                (link['url'],
+                 os.path.join(download_dir, self._pdf_filename(link, page_url)))
+                for page_url, pdf_links in page_links.items()
+                for link in pdf_links
+                if self.manifest is None or not self.manifest.is_done(link['url'])
+            ]
+            logger.info(f"{len(downloads)} PDFs to fetch")
+            results = []
+            if downloads:
+                # The pool's drivers have been on motogp.com, so any one carries
+                # its cookies
+                with self.pool.driver() as driver:
+                    fetcher = PdfFetcher.from_driver(driver,
+                                                     pool_size=self.fetch_workers)
+                with fetcher:
+                    results = fetcher.fetch_many(downloads)['results']
+            downloaded_files = [result['file'] for result in results
+                                if 'file' in result]
             
             logger.info(f"Successfully downloaded {len(downloaded_files)} PDF files")
             
             # Step 4: Push the PDFs to Supabase (if enabled)
+            stored_files = set()
             if push_to_supabase and downloaded_files:
-                self._push_to_supabase(downloaded_files)
+                stored_files = self._push_to_supabase(downloaded_files)
+
+            # PDFs become final once stored, so only a pushing run advances the crawl
+            if self.manifest is not None and push_to_supabase:
+                self._record_crawl(page_links, results, stored_files)
             
             return downloaded_files
             
@@ -128,121 +145,80 @@ class MotoGPPdfsDownloader:
             logger.error(f"Error in pdf_extract: {e}")
             raise
     
-    def _configure_download_directory(self, download_dir: str):
-        """Configure Chrome to download files to specified directory"""
-        try:
-            # Execute Chrome DevTools command to set download behavior
-            self.driver.execute_cdp_cmd('Page.setDownloadBehavior', {
-                'behavior': 'allow',
-                'downloadPath': download_dir
-            })
-            logger.info(f"Configured download directory: {download_dir}")
-        except Exception as e:
-            logger.warning(f"Could not configure download directory: {e}")
-    
-    def _download_pdf(self, link_element, href: str, download_dir: str, filename_prefix: str) -> str:
-        """Download a single PDF file
-        
-        Args:
-            link_element: Selenium WebElement for the link
-            href: URL of the PDF
-            download_dir: Directory to download to
-            filename_prefix: Prefix for the downloaded file
-            
-        Returns:
-            str: Path to downloaded file, or None if failed
+    def _record_crawl(self, page_links: dict, results: list, stored_files: set) -> None:
+        """Record the fetched PDFs as final and each page's outcome
+
+        A PDF counts only once stored, so one that failed to download or
+        upload is fetched again next run, and so is its page.
         """
-        try:
-            # Get the original filename from URL
-            parsed_url = urlparse(href)
-            original_filename = os.path.basename(parsed_url.path)
-            
-            if not original_filename:
-                original_filename = f"{filename_prefix}.pdf"
-            
-            # Get initial file count in download directory
-            initial_files = set(os.listdir(download_dir))
-            
-            # Click the link to start download
-            logger.info(f"Clicking link to download: {original_filename}")
-            link_element.click()
-            
-            # Wait for download to complete
-            max_wait_time = 30  # seconds
-            wait_interval = 1
-            elapsed_time = 0
-            
-            while elapsed_time < max_wait_time:
-                time.sleep(wait_interval)
-                elapsed_time += wait_interval
-                
-                current_files = set(os.listdir(download_dir))
-                new_files = current_files - initial_files
-                
-                # Check for completed downloads (not .crdownload files)
-                completed_files = [f for f in new_files if not f.endswith('.crdownload')]
-                
-                if completed_files:
-                    downloaded_file = completed_files[0]
-                    full_path = os.path.join(download_dir, downloaded_file)
-                    
-                    # Rename file with our prefix if needed
-                    if not downloaded_file.startswith(filename_prefix):
-                        new_name = f"{filename_prefix}_{downloaded_file}"
-                        new_path = os.path.join(download_dir, new_name)
-                        shutil.move(full_path, new_path)
-                        full_path = new_path
-                    
-                    logger.info(f"Successfully downloaded: {full_path}")
-                    return full_path
-            
-            logger.warning(f"Download timeout for {original_filename}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error downloading PDF {href}: {e}")
-            return None
+        failed_urls = set()
+        for result in results:
+            if result.get('file') in stored_files:
+                self.manifest.record(result['url'], content_hash=result['sha256'],
+                                     etag=result['etag'], final=True)
+            else:
+                self.manifest.record(result['url'], STATUS_FAILED)
+                failed_urls.add(result['url'])
+
+        for page_url, pdf_links in page_links.items():
+            urls = [link['url'] for link in pdf_links]
+            status = STATUS_FAILED if failed_urls.intersection(urls) else STATUS_OK
+            self.manifest.record(page_url, status, content_hash=records_hash(urls))
+        self.manifest.save()
+
+    @staticmethod
+    def _pdf_filename(link: dict, page_url: str = None) -> str:
+        """Local file name of a PDF link, prefixed with its position on the page
+
+        Links of pages other than MAIN_PAGE also carry the page path, as
+        every page numbers its containers from 1.
+        """
+        prefix = f"container_{link['container']}_pdf_{link['index']}"
+        if page_url and page_url != MotoGPPdfsDownloader.MAIN_PAGE:
+            page_path = urlparse(page_url).path.strip('/').replace('/', '_')
+            prefix = f"{page_path}_{prefix}"
+        original_filename = os.path.basename(urlparse(link['url']).path)
+        return f"{prefix}_{original_filename}" if original_filename else f"{prefix}.pdf"
     
-    def _push_to_supabase(self, file_paths: list):
+    def _push_to_supabase(self, file_paths: list) -> set:
         """Push downloaded PDFs to Supabase storage
         
         Args:
             file_paths: List of local file paths to upload
+
+        Returns:
+            set: The file paths now stored, uploaded or already there
         """
         try:
-            # Import storage client (assuming it exists)
-            from app.storage.storage_client import StorageClient
+            from ..storage.factory import get_storage_client
             
-            storage_client = StorageClient()
-            storage_client.create_bucket('motogp-pdfs', public=False)
-            
-            for file_path in file_paths:
-                try:
-                    filename = os.path.basename(file_path)
-                    logger.info(f"Uploading {filename} to Supabase...")
-                    
-                    # Upload to Supabase bucket (adjust bucket name as needed)
-                    storage_client.upload_file(
-                        bucket_name='motogp-pdfs',
-                        file_path=file_path,
-                        object_name=filename
-                    )
-                    
-                    logger.info(f"Successfully uploaded {filename} to Supabase")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to upload {file_path} to Supabase: {e}")
+            with get_storage_client() as storage_client:
+                storage_client.create_bucket('motogp-pdfs', public=False)
+
+                # Upload to Supabase bucket (adjust bucket name as needed)
+                report = storage_client.upload_many(
+                    'motogp-pdfs', file_paths, skip_unchanged=True
+                )
+                for result in report['results']:
+                    if 'error' in result:
+                        logger.error(f"Failed to upload {result['path']} to Supabase: "
+                                     f"{result['error']}")
+                uploaded = report['succeeded'] - report['skipped']
+                logger.info(f"Supabase push: {uploaded} uploaded, "
+                            f"{report['skipped']} skipped, {report['failed']} failed")
+                return {result['path'] for result in report['results']
+                        if 'error' not in result}
                     
         except ImportError:
             logger.warning("StorageClient not found. Skipping Supabase upload.")
         except Exception as e:
             logger.error(f"Error pushing files to Supabase: {e}")
+        return set()
 
     def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
-            logger.info("ChromeDriver closed")
+        """Close the browser, unless it belongs to a shared pool"""
+        if self._owns_pool:
+            self.pool.close()
     
     def __enter__(self):
         return self
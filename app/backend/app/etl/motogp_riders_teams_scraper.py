@@ -1,17 +1,20 @@
 # questo ha i combandi per navigare sulle pagine dei risultati. 
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC    
 
 import logging
-import time 
-import datetime 
+from datetime import datetime
 import json 
 import pandas as pd
 
+from .crawl_manifest import CrawlManifest, records_hash
+from .driver_pool import DEFAULT_POOL_SIZE, DriverPool
+from .scraper_parsers import parse_riders, parse_teams
+from .scraper_waits import (
+    DEFAULT_BANNER_TIMEOUT, DEFAULT_PAGE_TIMEOUT, dismiss_cookie_banner,
+    wait_for_element
+)
+
 logger = logging.getLogger(__name__)
 
 class MotoGPRidersTeamsScraper:
@@ -19,34 +22,75 @@ class MotoGPRidersTeamsScraper:
 
     RIDERS_URL = "https://www.motogp.com/en/riders" 
     TEAMS_URL = "https://www.motogp.com/en/teams"
+    RIDER_LIST = (By.XPATH, '//div[contains(@class, "rider-list__container")]')
+    TEAM_LIST = (By.XPATH, '//div[contains(@class, "-list__container")]')
 
-    def __init__(self, headless: bool = True):
-        self.driver = None
-        self.headless = headless
-        self._setup_driver()
-
-    def setup_driver(self):
-        """Set up automatic ChromeDriver management"""
+    COMPETITION_CATEGORIES = ['motogp', 'moto2', 'moto3']
 
-        try: 
-            chrome_options = Options()
-            
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            # Automatically download and manage ChromeDriver
-            self.driver = webdriver.Chrome(options=chrome_options)
-            logger.info("ChromeDriver initialized successfully")
+    def __init__(self, headless: bool = True, pool: DriverPool = None,
+                 page_timeout: float = DEFAULT_PAGE_TIMEOUT,
+                 banner_timeout: float = DEFAULT_BANNER_TIMEOUT,
+                 manifest: CrawlManifest = None):
+        self.headless = headless
+        # Categories are scraped in parallel, one driver each, unless a shared
+        # pool is given
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else DriverPool(
+            size=min(DEFAULT_POOL_SIZE, len(self.COMPETITION_CATEGORIES)),
+            headless=headless
+        )
+        # Upper bounds of the readiness waits, in seconds
+        self.page_timeout = page_timeout
+        self.banner_timeout = banner_timeout
+        # Crawl state for incremental runs (default: CRAWL_MANIFEST, if set,
+        # unless replaying)
+        if manifest is None and not self.pool.replay:
+            manifest = CrawlManifest.from_env()
+        self.manifest = manifest
+
+    def _scrape_riders_page(self, driver, category: str) -> list:
+        """Load a category's riders page on driver and parse its cards"""
+        driver.get(self.RIDERS_URL + '/' + category)
+        dismiss_cookie_banner(driver, self.banner_timeout)
+        wait_for_element(driver, self.RIDER_LIST, self.page_timeout,
+                         step=f"{category} rider list")
+
+        # Read the page once and parse every card from the HTML
+        riders_load = parse_riders(driver.page_source, category, driver.current_url)
+        logger.info(f"Extracted {len(riders_load)} {category} riders")
+        return riders_load
+
+    def _scrape_teams_page(self, driver, category: str) -> list:
+        """Load a category's teams page on driver and parse its cards"""
+        driver.get(self.TEAMS_URL + '/' + category)
+        dismiss_cookie_banner(driver, self.banner_timeout)
+        wait_for_element(driver, self.TEAM_LIST, self.page_timeout,
+                         step=f"{category} team list")
+
+        # Read the page once and parse every card from the HTML
+        teams_load = parse_teams(driver.page_source, category, driver.current_url)
+        logger.info(f"Extracted {len(teams_load)} {category} team riders")
+        return teams_load
+
+    def _pages_changed(self, base_url: str, pages: dict) -> bool:
+        """Whether any category page holds other records than at the last crawl"""
+        if self.manifest is None:
+            return True
+        return any(
+            not self.manifest.unchanged(f"{base_url}/{category}", records_hash(records))
+            for category, records in pages.items()
+        )
+
+    def _record_pages(self, base_url: str, pages: dict) -> None:
+        """Store the hash of each category page; the hashes mark the records
+        as stored, so only call it once they have been pushed"""
+        if self.manifest is None:
+            return
+        for category, records in pages.items():
+            self.manifest.record(f"{base_url}/{category}",
+                                 content_hash=records_hash(records))
+        self.manifest.save()
 
-        except Exception as e:
-            logger.error(f"Failed to initialize ChromeDriver: {e}")
-            raise
-    
     def extract_riders(self, push_to_supabase: bool = True  ):
         """Extract riders from the page
         
@@ -56,63 +100,29 @@ class MotoGPRidersTeamsScraper:
             - the number of riders and teams is different 
         
         """
-        competition_categories = ['motogp', 'moto2', 'moto3']
         riders_data = []
+        riders_pages = {}
 
-        for category in competition_categories:
-
-            EXTRACT_URL = self.RIDERS_URL + '/'+ category
-
-            try: 
-                self.driver.get(EXTRACT_URL)
-                time.sleep(5)
-
-                try:
-                    # Wait up to 5 seconds for the cookie banner to appear
-                    cookie_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.ID, "onetrust-reject-all-handler"))
-                    )
-                    cookie_button.click()
-                    logger.info("Cookie banner dismissed")
-                    time.sleep(1)
-                except Exception as e:
-                    # Cookie banner didn't appear or was already dismissed
-                    logger.info("No cookie banner to dismiss")
-
-                rider = self.driver.find_element(By.XPATH, '//div[contains(@class, "rider-list__container")]')
-
-                riders = rider.find_elements(By.CSS_SELECTOR, 'a.rider-list__rider')
-
-                riders_load = []
-                for index, rider_i in enumerate(riders):
-                    rider_name = rider_i.find_element(By.CSS_SELECTOR, 'div.rider-list__info-name').text
-                    rider_country = rider_i.find_element(By.CSS_SELECTOR, 'div.rider-list__details-country').text
-                    rider_number = rider_i.find_element(By.CSS_SELECTOR, 'div.rider-list__background-hashtag').text
-                    rider_team = rider_i.find_element(By.CSS_SELECTOR, 'div.rider-list__details-team').text
-                    rider_stat_page = rider_i.get_attribute('href')
-
-                    riders_load.append({
-                        "sequence_id": index,
-                        "category": category,
-                        "name": rider_name,
-                        "country": rider_country,
-                        "team": rider_team,
-                        "number": rider_number,
-                        "page_ref": rider_stat_page
-                    })
-                logger.info(f"Extracted {len(riders_data)} riders from MotoGP page")
-            
+        try:
+            # Categories come back in order, whichever driver finished first
+            for category, riders_load in self.pool.map(self._scrape_riders_page,
+                                                       self.COMPETITION_CATEGORIES):
+                riders_pages[category] = riders_load
                 riders_data.extend(riders_load)
 
-            except Exception as e:
-                logger.error(f"Error extracting riders: {e}")
-                raise
-
-        self.driver.quit()
+        except Exception as e:
+            logger.error(f"Error extracting riders: {e}")
+            raise
 
         riders_df = pd.DataFrame(riders_data)
-        if push_to_supabase and riders_data:
+        # The current rosters are always re-read, but only pushed when they changed
+        push = push_to_supabase and not self.pool.replay
+        if not self._pages_changed(self.RIDERS_URL, riders_pages):
+            logger.info("Riders unchanged since the last crawl")
+        elif push and riders_data:
             self._push_riders_to_supabase(riders_df)
+        if push:
+            self._record_pages(self.RIDERS_URL, riders_pages)
 
         return riders_df
     
@@ -126,143 +136,122 @@ class MotoGPRidersTeamsScraper:
             - the number of riders and teams is different 
         
         """
-        competition_categories = ['motogp', 'moto2', 'moto3']
         teams_data = []
+        teams_pages = {}
 
-        for category in competition_categories:
-
-            EXTRACT_URL = self.TEAMS_URL + '/'+ category
-
-            try: 
-                self.driver.get(EXTRACT_URL)
-                time.sleep(5)
-
-                try:
-                    # Wait up to 5 seconds for the cookie banner to appear
-                    cookie_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.ID, "onetrust-reject-all-handler"))
-                    )
-                    cookie_button.click()
-                    logger.info("Cookie banner dismissed")
-                    time.sleep(1)
-                except Exception as e:
-                    # Cookie banner didn't appear or was already dismissed
-                    logger.info("No cookie banner to dismiss")
-
-                teams_list = self.driver.find_element(By.XPATH, '//div[contains(@class, "-list__container")]')
-
-                teams = teams_list.find_elements(By.CSS_SELECTOR, 'a.teams-list__team')
-
-                teams_load = []
-                for index, team in enumerate(teams):
-                    team_name = team.find_element(By.CSS_SELECTOR, 'div.teams-list__info-name').text
-                    team_stat_page = team.get_attribute('href')
-                    # Find the container and all rider elements within it
-                    team_riders_container = team.find_element(By.CSS_SELECTOR, 'div.teams-list__info-container')
-                    rider_elements = team_riders_container.find_elements(By.CSS_SELECTOR, 'div')  # Adjust selector as needed
-                    
-                    # Create one entry per rider
-                    for rider_idx, rider_element in enumerate(rider_elements):
-                        rider_name = rider_element.text.strip()
-                        if rider_name:  # Skip empty elements
-                            teams_load.append({
-                                "sequence_id": f"{index}_{rider_idx}",
-                                "category": category,
-                                "team_name": team_name,
-                                "rider_name": rider_name,
-                                "page_ref": team_stat_page
-                            })
-                    logger.info(f"Extracted {len(teams_load)} riders from MotoGP page")
-            
+        try:
+            for category, teams_load in self.pool.map(self._scrape_teams_page,
+                                                      self.COMPETITION_CATEGORIES):
+                teams_pages[category] = teams_load
                 teams_data.extend(teams_load)
 
-            except Exception as e:
-                logger.error(f"Error extracting riders: {e}")
-                raise
-
-        self.driver.quit()
+        except Exception as e:
+            logger.error(f"Error extracting riders: {e}")
+            raise
 
         teams_df = pd.DataFrame(teams_data)
-        if push_to_supabase and teams_data:
-            self._push_riders_to_supabase(teams_df)
+        push = push_to_supabase and not self.pool.replay
+        if not self._pages_changed(self.TEAMS_URL, teams_pages):
+            logger.info("Teams unchanged since the last crawl")
+        elif push and teams_data:
+            self._push_teams_to_supabase(teams_df)
+        if push:
+            self._record_pages(self.TEAMS_URL, teams_pages)
 
         return teams_df
-    
 
+    def _push_teams_to_supabase(self, teams_df: pd.DataFrame) -> dict:
+        """Push teams data to Supabase as JSON (from memory)
 
-    def _push_teams_to_supabase(self, teams_data: list):
-        """Push teams data to Supabase as JSON (from memory)"""
+        Returns:
+            Dictionary with counts of uploaded/skipped objects
+        """
         try:
-            from storage.storage_client import StorageClient
+            from ..storage.factory import get_storage_client
             import io
             
-            storage_client = StorageClient()
-            storage_client.create_bucket('motogp_data', public=False)
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            year = datetime.now().year
-            
-            # Convert to JSON string
-            json_string = json.dumps(teams_data, indent=2)
-            json_bytes = io.BytesIO(json_string.encode('utf-8'))
+            with get_storage_client() as storage_client:
+                storage_client.create_bucket('motogp_data', public=False)
+
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                year = datetime.now().year
+
+                # Convert to JSON string
+                json_string = json.dumps(teams_df.to_dict('records'), indent=2)
+                json_bytes = io.BytesIO(json_string.encode('utf-8'))
+
+                # Upload directly from memory
+                json_filename = f'teams_{year}_{timestamp}.json'
+
+                # Identical content already stored under an older timestamp is skipped
+                url = storage_client.upload_from_memory(
+                    bucket_name='motogp_data',
+                    file_content=json_bytes.getvalue(),
+                    object_name=json_filename,
+                    folder_path=f'{year}/teams',
+                    content_type='application/json',
+                    skip_unchanged=True,
+                    match_folder=True
+                )
             
-            # Upload directly from memory
-            json_filename = f'calendar_{year}_{timestamp}.json'
-            
-            # Note: You'll need to add this method to StorageClient
-            storage_client.upload_from_memory(
-                bucket_name='motogp_data',
-                file_content=json_bytes.getvalue(),
-                object_name=json_filename,
-                folder_path=f'{year}/teams',
-                content_type='application/json'
-            )
-            
-            logger.info(f"✅ Uploaded teams JSON to Supabase: {json_filename}")
+            counts = {'uploaded': 0 if url is None else 1,
+                      'skipped': 1 if url is None else 0}
+            logger.info(f"✅ Teams JSON pushed to Supabase: "
+                        f"{counts['uploaded']} uploaded, {counts['skipped']} skipped")
+            return counts
             
         except Exception as e:
-            logger.error(f"Error pushing calendar to Supabase: {e}")
+            logger.error(f"Error pushing teams to Supabase: {e}")
             raise
 
-    def _push_riders_to_supabase(self, riders_data: list):
-        """Push riders data to Supabase as JSON (from memory)"""
+    def _push_riders_to_supabase(self, riders_df: pd.DataFrame) -> dict:
+        """Push riders data to Supabase as JSON (from memory)
+
+        Returns:
+            Dictionary with counts of uploaded/skipped objects
+        """
         try:
-            from storage.storage_client import StorageClient
+            from ..storage.factory import get_storage_client
             import io
             
-            storage_client = StorageClient()
-            storage_client.create_bucket('motogp_data', public=False)
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            year = datetime.now().year
-            
-            # Convert to JSON string
-            json_string = json.dumps(riders_data, indent=2)
-            json_bytes = io.BytesIO(json_string.encode('utf-8'))
-            
-            # Upload directly from memory
-            json_filename = f'calendar_{year}_{timestamp}.json'
-            
-            # Note: You'll need to add this method to StorageClient
-            storage_client.upload_from_memory(
-                bucket_name='motogp_data',
-                file_content=json_bytes.getvalue(),
-                object_name=json_filename,
-                folder_path=f'{year}/riders',
-                content_type='application/json'
-            )
+            with get_storage_client() as storage_client:
+                storage_client.create_bucket('motogp_data', public=False)
+
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                year = datetime.now().year
+
+                # Convert to JSON string
+                json_string = json.dumps(riders_df.to_dict('records'), indent=2)
+                json_bytes = io.BytesIO(json_string.encode('utf-8'))
+
+                # Upload directly from memory
+                json_filename = f'riders_{year}_{timestamp}.json'
+
+                # Identical content already stored under an older timestamp is skipped
+                url = storage_client.upload_from_memory(
+                    bucket_name='motogp_data',
+                    file_content=json_bytes.getvalue(),
+                    object_name=json_filename,
+                    folder_path=f'{year}/riders',
+                    content_type='application/json',
+                    skip_unchanged=True,
+                    match_folder=True
+                )
             
-            logger.info(f"✅ Uploaded riders JSON to Supabase: {json_filename}")
+            counts = {'uploaded': 0 if url is None else 1,
+                      'skipped': 1 if url is None else 0}
+            logger.info(f"✅ Riders JSON pushed to Supabase: "
+                        f"{counts['uploaded']} uploaded, {counts['skipped']} skipped")
+            return counts
             
         except Exception as e:
-            logger.error(f"Error pushing calendar to Supabase: {e}")
+            logger.error(f"Error pushing riders to Supabase: {e}")
             raise
 
     def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
-            logger.info("ChromeDriver closed")
+        """Close the browsers, unless they belong to a shared pool"""
+        if self._owns_pool:
+            self.pool.close()
     
     def __enter__(self):
         return self
@@ -2,10 +2,8 @@ import wikipediaapi
 
 import json 
 from datetime import datetime
-from app.storage.storage_client import StorageClient
 
 import logging
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -92,27 +90,22 @@ def push_to_supabase(file_paths: list):
     """
     try:
         # Import storage client (assuming it exists)
-        from app.storage.storage_client import StorageClient
+        from app.storage.factory import get_storage_client
         
-        storage_client = StorageClient()
-        storage_client.create_bucket('motogp-pdfs', public=False)
-        
-        for file_path in file_paths:
-            try:
-                filename = os.path.basename(file_path)
-                logger.info(f"Uploading {filename} to Supabase...")
-                
-                # Upload to Supabase bucket (adjust bucket name as needed)
-                storage_client.upload_file(
-                    bucket_name='motogp-wiki-data',
-                    file_path=file_path,
-                    object_name=filename
-                )
-                
-                logger.info(f"Successfully uploaded {filename} to Supabase")
-                
-            except Exception as e:
-                logger.error(f"Failed to upload {file_path} to Supabase: {e}")
+        with get_storage_client() as storage_client:
+            storage_client.create_bucket('motogp-pdfs', public=False)
+
+            # Upload to Supabase bucket (adjust bucket name as needed)
+            report = storage_client.upload_many(
+                'motogp-wiki-data', file_paths, skip_unchanged=True
+            )
+            for result in report['results']:
+                if 'error' in result:
+                    logger.error(f"Failed to upload {result['path']} to Supabase: "
+                                 f"{result['error']}")
+            uploaded = report['succeeded'] - report['skipped']
+            logger.info(f"Supabase push: {uploaded} uploaded, "
+                        f"{report['skipped']} skipped, {report['failed']} failed")
                 
     except ImportError:
         logger.warning("StorageClient not found. Skipping Supabase upload.")
@@ -0,0 +1,224 @@
+"""
+Record and replay of the pages the motogp.com scrapers read.
+A live run with a RecordingPool saves the HTML of every page it parses into a
+compressed snapshot archive. A ReplayPool then serves those snapshots in
+place of Chrome, so the scrapers' extraction runs offline against fixed
+pages, parsed by the same HTML parsers.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from .driver_pool import DEFAULT_POOL_SIZE, DriverPool, create_driver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_PATH = Path('.etl_cache') / 'page_snapshots.zip'
+
+
+class SnapshotMissing(KeyError):
+    """A replayed page that was never recorded"""
+
+
+class SnapshotArchive:
+    """Zip archive of page snapshots, one deflated JSON member per URL
+
+    Each member holds the requested url, the current_url the browser
+    reported (the base of the page's relative links), the page_source and
+    recorded_at. Opening with mode 'w' starts a new archive; within it the
+    first snapshot of a URL is kept.
+    """
+
+    def __init__(self, path: Path = DEFAULT_ARCHIVE_PATH, mode: str = 'r'):
+        if mode not in ('r', 'w'):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        if mode == 'w':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, mode, compression=zipfile.ZIP_DEFLATED)
+        self._names = set(self._zip.namelist())
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def member(url: str) -> str:
+        return f"{hashlib.sha256(url.encode()).hexdigest()[:16]}.json"
+
+    def record(self, url: str, current_url: str, page_source: str) -> None:
+        """Add the snapshot of url, unless this archive already holds one"""
+        name = self.member(url)
+        snapshot = {'url': url, 'current_url': current_url,
+                    'page_source': page_source, 'recorded_at': time.time()}
+        with self._lock:
+            if name in self._names:
+                return
+            self._zip.writestr(name, json.dumps(snapshot))
+            self._names.add(name)
+        logger.info(f"📼 Recorded {url} ({len(page_source) / 1024:.0f} KB)")
+
+    def load(self, url: str) -> Dict:
+        """Return the snapshot of url
+
+        Raises:
+            SnapshotMissing: if url was not recorded
+        """
+        with self._lock:
+            try:
+                content = self._zip.read(self.member(url))
+            except KeyError:
+                raise SnapshotMissing(f"No snapshot of {url} in {self.path}") from None
+        return json.loads(content)
+
+    def urls(self) -> List[str]:
+        """URLs of every snapshot in the archive"""
+        with self._lock:
+            return [json.loads(self._zip.read(name))['url']
+                    for name in self._zip.namelist()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._zip.close()
+
+    def __enter__(self) -> 'SnapshotArchive':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class RecordingDriver:
+    """Chrome driver wrapper that records each page_source read
+
+    The snapshot is keyed by the URL last passed to get(). Everything else
+    goes to the wrapped driver.
+    """
+
+    def __init__(self, driver, archive: SnapshotArchive):
+        self._driver = driver
+        self._archive = archive
+        self._url = None
+
+    def get(self, url: str) -> None:
+        self._driver.get(url)
+        self._url = url
+
+    @property
+    def page_source(self) -> str:
+        page_source = self._driver.page_source
+        if self._url is not None:
+            self._archive.record(self._url, self._driver.current_url, page_source)
+        return page_source
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class ReplayElement:
+    """Element found in a replayed page
+
+    Wraps the lxml element, which reads as false when it has no children;
+    WebDriverWait only returns a truthy result, so an empty container would
+    otherwise never be found.
+    """
+
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def text(self) -> str:
+        return ' '.join(self.element.text_content().split())
+
+    def get_attribute(self, name: str):
+        return self.element.get(name)
+
+    def __bool__(self) -> bool:
+        return True
+
+
+class ReplayDriver:
+    """Stand-in for a Chrome driver that serves recorded pages
+
+    Supports what the scrapers use: get(), page_source, current_url,
+    readiness waits on XPath or ID locators and the consent cookie check.
+    Replayed pages have no banner, so every cookie reads as set.
+    """
+
+    def __init__(self, archive: SnapshotArchive):
+        self._archive = archive
+        self._snapshot = None
+        self._document = None
+
+    def get(self, url: str) -> None:
+        self._snapshot = self._archive.load(url)
+        self._document = None
+
+    @property
+    def page_source(self) -> str:
+        return self._snapshot['page_source'] if self._snapshot else '<html></html>'
+
+    @property
+    def current_url(self) -> str:
+        return self._snapshot['current_url'] if self._snapshot else 'about:blank'
+
+    def find_element(self, by: str = By.ID, value: str = None) -> ReplayElement:
+        if self._document is None:
+            self._document = lxml_html.fromstring(self.page_source)
+        if by == By.XPATH:
+            found = self._document.xpath(value)
+        elif by == By.ID:
+            found = self._document.xpath('//*[@id=$id]', id=value)
+        else:
+            raise ValueError(f"Replay can't locate elements by {by}")
+        if not found:
+            raise NoSuchElementException(
+                f"{by}={value} not in snapshot of {self.current_url}"
+            )
+        return ReplayElement(found[0])
+
+    def get_cookie(self, name: str) -> Dict:
+        return {'name': name, 'value': ''}
+
+    def get_cookies(self) -> List[Dict]:
+        return []
+
+    def quit(self) -> None:
+        pass
+
+
+class RecordingPool(DriverPool):
+    """DriverPool whose drivers record every page they parse into archive"""
+
+    def __init__(self, archive: SnapshotArchive, size: int = DEFAULT_POOL_SIZE,
+                 **kwargs):
+        driver_factory = kwargs.pop('driver_factory', create_driver)
+
+        def record(**options):
+            return RecordingDriver(driver_factory(**options), archive)
+
+        super().__init__(size=size, driver_factory=record, **kwargs)
+        self.archive = archive
+
+
+class ReplayPool(DriverPool):
+    """DriverPool serving the pages recorded in archive, without a browser
+
+    Scrapers given a replay pool don't write anything: no storage pushes, no
+    crawl manifest and no PDF downloads.
+    """
+
+    replay = True
+
+    def __init__(self, archive: SnapshotArchive, size: int = DEFAULT_POOL_SIZE):
+        super().__init__(size=size,
+                         driver_factory=lambda **options: ReplayDriver(archive))
+        self.archive = archive
@@ -0,0 +1,175 @@
+"""
+Process-pool PDF table extraction.
+Table extraction is CPU-bound, so PDFs (or page ranges of one big PDF) are
+fanned out to worker processes. Each worker sets up its extractor once and
+reuses it for every task it receives.
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .pdf_tables import (
+    EXTRACTOR_VERSION, extract_tables_from_pdf, get_docling_converter
+)
+from .table_cache import TableCache
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers() -> int:
+    """One worker per core, leaving one for the loader"""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def _init_worker(backend: str) -> None:
+    """Build the per-process extractor state before the first task"""
+    if backend == 'docling':
+        get_docling_converter()
+    else:
+        import camelot  # noqa: F401  (heavy import, paid once per worker)
+
+
+def _extract_task(task: Tuple[str, str, str]) -> List[pd.DataFrame]:
+    path, pages, backend = task
+    return extract_tables_from_pdf(path, pages=pages, backend=backend)
+
+
+def _page_count(path: str) -> int:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            # PyPDF2 1.x, which camelot-py 0.10 depends on
+            from PyPDF2 import PdfFileReader
+            return PdfFileReader(path).getNumPages()
+    return len(PdfReader(path).pages)
+
+
+def _page_ranges(path: str, pages_per_task: Optional[int]) -> List[str]:
+    """Split a PDF into camelot page selections of at most pages_per_task pages"""
+    if not pages_per_task:
+        return ['all']
+    count = _page_count(path)
+    return [
+        f"{start}-{min(start + pages_per_task - 1, count)}"
+        for start in range(1, count + 1, pages_per_task)
+    ] or ['all']
+
+
+def extract_tables_parallel(
+    pdf_paths: Iterable[str],
+    workers: Optional[int] = None,
+    backend: str = 'camelot',
+    pages_per_task: Optional[int] = None,
+    cache: Optional[TableCache] = None,
+    return_exceptions: bool = False
+) -> Iterator[Tuple[str, Union[List[pd.DataFrame], Exception]]]:
+    """Extract tables from many PDFs in worker processes.
+
+    Yields (pdf_path, tables) in input order. At most 2 * workers tasks are
+    in flight, so finished results never pile up faster than the caller
+    consumes them.
+
+    Args:
+        pdf_paths: PDFs to extract
+        workers: Worker processes (default: default_workers())
+        backend: Extraction backend passed to extract_tables_from_pdf
+        pages_per_task: Split each PDF into page ranges of this size so a
+            single large PDF is spread over several workers
+        cache: Table cache checked in this process before submitting a PDF;
+            whole-PDF results of misses are stored back into it
+        return_exceptions: Yield (pdf_path, exception) for PDFs that fail
+            instead of raising, so one bad file doesn't stop the batch
+    """
+    workers = workers or default_workers()
+    cache_keys = {}
+
+    def iter_tasks():
+        for path in map(str, pdf_paths):
+            try:
+                if cache is not None:
+                    key = cache.key(path, EXTRACTOR_VERSION, backend, 'all')
+                    tables = cache.get(key)
+                    if tables is not None:
+                        yield path, tables
+                        continue
+                    cache_keys[path] = key
+                page_ranges = _page_ranges(path, pages_per_task)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                yield path, e
+                continue
+            for pages in page_ranges:
+                yield path, pages
+
+    tasks = iter_tasks()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(backend,)
+    ) as executor:
+        def store_in_cache(path: str, tables: List[pd.DataFrame]) -> List[pd.DataFrame]:
+            if path in cache_keys:
+                cache.put(cache_keys.pop(path), tables)
+            return tables
+
+        in_flight = deque()
+        current_path = None
+        current_tables: List[pd.DataFrame] = []
+        current_error: Optional[Exception] = None
+
+        def finish(path: str, tables: List[pd.DataFrame], error: Optional[Exception]):
+            if error is not None:
+                cache_keys.pop(path, None)
+                return path, error
+            return path, store_in_cache(path, tables)
+
+        def submit_next() -> bool:
+            task = next(tasks, None)
+            if task is None:
+                return False
+            path, pages = task
+            if isinstance(pages, (list, Exception)):
+                # Cache hit or failed before extraction: keep its place in the order
+                future = Future()
+                if isinstance(pages, Exception):
+                    future.set_exception(pages)
+                else:
+                    future.set_result(pages)
+            else:
+                future = executor.submit(_extract_task, (path, pages, backend))
+            in_flight.append((path, future))
+            return True
+
+        while len(in_flight) < 2 * workers and submit_next():
+            pass
+
+        while in_flight:
+            path, future = in_flight.popleft()
+            try:
+                tables, error = future.result(), None
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                tables, error = [], e
+            submit_next()
+
+            # Page ranges of one PDF come back consecutively; regroup them
+            if path != current_path:
+                if current_path is not None:
+                    yield finish(current_path, current_tables, current_error)
+                current_path, current_tables, current_error = path, [], None
+            current_tables.extend(tables)
+            current_error = current_error or error
+
+        if current_path is not None:
+            yield finish(current_path, current_tables, current_error)
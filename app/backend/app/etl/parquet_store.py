@@ -0,0 +1,143 @@
+"""
+Parquet layer between extraction and the database.
+Normalized results are written as a hive-partitioned dataset
+(season_year=/category=/circuit=) so reloads and analytics read columnar
+files with partition and predicate pushdown instead of re-parsing PDFs.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy.orm import Session
+
+from .db_loader import load_results_to_db
+from .key_resolver import KeyResolver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET_DIR = Path('data') / 'results_parquet'
+
+# Rows read and loaded per transaction when rebuilding from the dataset
+DEFAULT_BATCH_SIZE = 50000
+
+# One directory level per season, category and event
+PARTITION_COLUMNS = ('season_year', 'category', 'circuit')
+
+_PARTITIONING = ds.partitioning(
+    pa.schema([
+        ('season_year', pa.int16()),
+        ('category', pa.string()),
+        ('circuit', pa.string()),
+    ]),
+    flavor='hive'
+)
+
+
+def write_results(df: pd.DataFrame, dataset_dir: Path, part_name: str) -> bool:
+    """Write normalized results into the partitioned dataset.
+
+    part_name names the files written in each partition, so writing the same
+    part again (e.g. a resumed chunk) replaces it instead of duplicating rows.
+    Returns False when the frame lacks the partition columns (not a results table).
+    """
+    missing = [col for col in PARTITION_COLUMNS if col not in df.columns]
+    if missing:
+        logger.debug(f"Not writing {part_name} to Parquet, missing {missing}")
+        return False
+
+    # Partition values must match the partitioning schema, not categoricals
+    df = df.astype({'season_year': 'Int16', 'category': 'string', 'circuit': 'string'})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root_path=str(dataset_dir),
+        partitioning=_PARTITIONING,
+        basename_template=f"{part_name}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+    )
+    return True
+
+
+def existing_parts(dataset_dir: Path) -> Dict[str, List[Tuple[int, Path]]]:
+    """Files already in the dataset, by part prefix, with their row offset
+
+    Parts named <prefix>-<offset> by the pipeline are written as
+    <prefix>-<offset>-<i>.parquet in each partition. The dataset is scanned
+    once, so a run can look up the parts of each PDF without another scan.
+    """
+    parts: Dict[str, List[Tuple[int, Path]]] = {}
+    for path in Path(dataset_dir).rglob('*.parquet'):
+        name = path.stem.rsplit('-', 2)
+        if len(name) == 3 and name[1].isdigit():
+            parts.setdefault(name[0], []).append((int(name[1]), path))
+    return parts
+
+
+def read_results(
+    dataset_dir: Path,
+    season_year: Optional[int] = None,
+    category: Optional[str] = None,
+    circuit: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Yield results from the dataset in batches of at most batch_size rows.
+
+    The filters are pushed down to the partition directories, so only the
+    matching files are opened.
+    """
+    dataset = ds.dataset(str(dataset_dir), format='parquet', partitioning=_PARTITIONING)
+
+    conditions = []
+    if season_year is not None:
+        conditions.append(ds.field('season_year') == season_year)
+    if category is not None:
+        conditions.append(ds.field('category') == category)
+    if circuit is not None:
+        conditions.append(ds.field('circuit') == circuit)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    for batch in dataset.to_batches(filter=expression, batch_size=batch_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def rebuild_from_parquet(
+    dataset_dir: Path,
+    session_factory: Callable[[], Session],
+    mode: str = 'copy',
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    **filters
+) -> Dict[str, int]:
+    """Load the database tables from the Parquet dataset alone.
+
+    Reads the dataset batch by batch (optionally filtered by season_year,
+    category and circuit) and loads each batch in its own transaction.
+
+    Returns:
+        Totals of the stats reported by load_results_to_db, plus 'rows'
+    """
+    started = time.perf_counter()
+    totals: Dict[str, int] = {'rows': 0}
+    resolver = KeyResolver()
+    session = session_factory()
+    try:
+        for batch in read_results(dataset_dir, batch_size=batch_size, **filters):
+            stats = load_results_to_db(batch, session, mode=mode, resolver=resolver)
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+            totals['rows'] += len(batch)
+    finally:
+        session.close()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Rebuilt {totals['rows']} rows from {dataset_dir} in {elapsed:.2f}s")
+    return totals
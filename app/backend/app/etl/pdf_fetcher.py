@@ -0,0 +1,192 @@
+"""
+Direct HTTP download of the PDFs linked from motogp.com.
+The browser only discovers the links; the files are fetched here over a
+pooled keep-alive session carrying the browser's cookies, many at a time,
+streamed to disk with their length and hash checked.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_WORKERS = 8
+FETCH_CHUNK_SIZE = 256 * 1024
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class IncompleteDownload(IOError):
+    """A download whose size or content doesn't match what was expected"""
+
+
+class PdfFetcher:
+    """Pooled, concurrent HTTP downloads of PDF files
+
+    Connection errors and RETRY_STATUSES are retried by the session; a body
+    that arrives truncated or with the wrong hash is fetched again up to
+    max_retries times.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_FETCH_WORKERS,
+                 connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 max_retries: int = 3, backoff_factor: float = 0.5):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs) -> 'PdfFetcher':
+        """Build a fetcher that shares the browser's cookies and user agent"""
+        fetcher = cls(**kwargs)
+        user_agent = driver.execute_script("return navigator.userAgent")
+        fetcher.session.headers['User-Agent'] = user_agent
+        for cookie in driver.get_cookies():
+            fetcher.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        return fetcher
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'PdfFetcher':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def stream(self, url: str, expected_sha256: str = None,
+               response_headers: Dict = None) -> Iterator[bytes]:
+        """Yield the body of url in chunks, checking it once fully read
+
+        The check covers the length the server announced in Content-Length;
+        the content itself is only verified when expected_sha256 is given.
+        response_headers, if given, receives the headers of the response.
+
+        Raises:
+            IncompleteDownload: if fewer bytes than Content-Length arrived, or
+                the SHA-256 differs from expected_sha256
+        """
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response_headers is not None:
+                response_headers.update(response.headers)
+            expected_size = response.headers.get('Content-Length')
+            digest = hashlib.sha256()
+            size = 0
+            for chunk in response.iter_content(chunk_size=FETCH_CHUNK_SIZE):
+                if expected_sha256 is not None:
+                    digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        # Content-Length is only meaningful for an unencoded body
+        if expected_size is not None and 'Content-Encoding' not in response.headers \
+                and size != int(expected_size):
+            raise IncompleteDownload(f"{url}: got {size} of {expected_size} bytes")
+        if expected_sha256 is not None and digest.hexdigest() != expected_sha256:
+            raise IncompleteDownload(f"{url}: SHA-256 mismatch")
+
+    def fetch(self, url: str, dest_path: str, expected_sha256: str = None) -> Dict:
+        """Download url to dest_path, retrying incomplete bodies
+
+        The body goes to a sibling temporary file that replaces dest_path only
+        once it has been checked (see stream()). fetch_many() passes no
+        expected_sha256: a PDF is fetched again because it may have changed,
+        so only its length is checked and the returned sha256 is its new hash.
+
+        Returns:
+            Dictionary with 'url', 'file', 'bytes', 'sha256' and 'etag' (None
+            when the server sent none)
+        """
+        dest_path = Path(dest_path)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest_path.with_name(f".{dest_path.name}.part")
+
+        for attempt in range(self.max_retries + 1):
+            digest = hashlib.sha256()
+            size = 0
+            headers = CaseInsensitiveDict()
+            try:
+                with open(tmp_path, 'wb') as f:
+                    for chunk in self.stream(url, expected_sha256, headers):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                os.replace(tmp_path, dest_path)
+                return {'url': url, 'file': str(dest_path), 'bytes': size,
+                        'sha256': digest.hexdigest(), 'etag': headers.get('ETag')}
+            except (IncompleteDownload, requests.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_factor * 2 ** attempt
+                logger.warning(f"Retrying {url} in {delay:.1f}s: {e}")
+                time.sleep(delay)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+    def fetch_many(self, downloads: Iterable[Tuple[str, str]],
+                   max_workers: int = None) -> Dict:
+        """Download (url, dest_path) pairs concurrently
+
+        Returns:
+            Dictionary with 'results' (one per download, in order, holding
+            'url' and either the fetch() fields or 'error'), 'succeeded',
+            'failed', 'bytes' and 'seconds'
+        """
+        started = time.perf_counter()
+
+        def run(download: Tuple[str, str]) -> Dict:
+            url, dest_path = download
+            try:
+                return self.fetch(url, dest_path)
+            except Exception as e:
+                logger.error(f"Error downloading PDF {url}: {e}")
+                return {'url': url, 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.pool_size) as executor:
+            results: List[Dict] = list(executor.map(run, list(downloads)))
+
+        elapsed = time.perf_counter() - started
+        total_bytes = sum(result.get('bytes', 0) for result in results)
+        failed = sum(1 for result in results if 'error' in result)
+        logger.info(
+            f"Fetched {len(results) - failed}/{len(results)} PDFs, "
+            f"{total_bytes / 1024 ** 2:.1f} MB in {elapsed:.2f}s"
+        )
+        return {
+            'results': results,
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'bytes': total_bytes,
+            'seconds': round(elapsed, 2),
+        }
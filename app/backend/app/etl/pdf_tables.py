@@ -1,7 +1,12 @@
 import pandas as pd
-import numpy as np
 
-from typing import List
+import os
+import tempfile
+from io import BytesIO
+from typing import List, Optional, Union
+
+from .table_cache import TableCache
+from .table_schemas import COLUMN_ALIASES, TABLE_SCHEMAS, detect_table_type
 
 
 #### file has to change radically, has to import the pdfs from supabase
@@ -19,25 +24,219 @@ from typing import List
 
 ## class to push to postgres
 
-def extract_tables_from_pdf(path: str) -> List[pd.DataFrame]:
+# 'camelot' is the default (lattice tables of the results PDFs),
+# 'docling' is the backup for PDFs camelot can't parse (see docling_backup.py)
+EXTRACTION_BACKENDS = ('camelot', 'docling')
+
+# Part of the table cache key; bump when extraction output changes so
+# cached tables from the previous extractor are not reused
+EXTRACTOR_VERSION = '1'
+
+# camelot only reads from a path; in-memory PDFs go to a RAM-backed
+# directory when there is one so they never touch the disk
+_SPOOL_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# docling's converter loads its layout models on creation, so it is built
+# once per process and reused for every PDF
+_docling_converter = None
+
+
+def extract_tables_from_pdf(
+    path: Union[str, bytes],
+    pages: str = 'all',
+    backend: str = 'camelot',
+    cache: Optional[TableCache] = None
+) -> List[pd.DataFrame]:
+    """Extract the raw tables of a PDF, ready for normalize_table.
+
+    Args:
+        path: Path to the PDF, or its content (e.g. streamed from storage)
+        pages: Page selection in camelot syntax ('all', '1', '3-5', '1,4-end')
+        backend: One of EXTRACTION_BACKENDS
+        cache: Table cache to read from and fill; tables are returned from
+            it when the PDF content is unchanged
+    """
+    if backend not in EXTRACTION_BACKENDS:
+        raise ValueError(
+            f"Unknown extraction backend '{backend}', "
+            f"expected one of {EXTRACTION_BACKENDS}"
+        )
+
+    if cache is not None:
+        if isinstance(path, bytes):
+            key = cache.key_for_bytes(path, EXTRACTOR_VERSION, backend, pages)
+        else:
+            key = cache.key(path, EXTRACTOR_VERSION, backend, pages)
+        tables = cache.get(key)
+        if tables is None:
+            tables = extract_tables_from_pdf(path, pages, backend)
+            cache.put(key, tables)
+        return tables
+
+    if backend == 'docling':
+        return _extract_with_docling(path, pages)
+
+    import camelot
+    if isinstance(path, bytes):
+        with tempfile.NamedTemporaryFile(suffix='.pdf', dir=_SPOOL_DIR) as spool:
+            spool.write(path)
+            spool.flush()
+            tables = camelot.read_pdf(spool.name, pages=pages, flavor='lattice')
+    else:
+        tables = camelot.read_pdf(path, pages=pages, flavor='lattice')
+    return [table.df for table in tables]
+
+
+def get_docling_converter():
+    """Return this process' DocumentConverter, creating it on first use"""
+    global _docling_converter
+    if _docling_converter is None:
+        try:
+            from docling.document_converter import DocumentConverter
+        except ImportError:
+            raise ImportError(
+                "docling is required for the 'docling' backend: pip install docling"
+            )
+        _docling_converter = DocumentConverter()
+    return _docling_converter
+
+
+def _extract_with_docling(path: Union[str, bytes], pages: str) -> List[pd.DataFrame]:
+    converter = get_docling_converter()
+    if isinstance(path, bytes):
+        from docling.datamodel.base_models import DocumentStream
+        path = DocumentStream(name='document.pdf', stream=BytesIO(path))
+    page_range = _parse_page_range(pages)
+    if page_range:
+        result = converter.convert(path, page_range=page_range)
+    else:
+        result = converter.convert(path)
+    return [
+        table.export_to_dataframe(doc=result.document)
+        for table in result.document.tables
+    ]
+
+
+def _parse_page_range(pages: str) -> Optional[tuple]:
+    """Turn a contiguous camelot page selection ('3-5', '7') into docling's
+    (start, end)"""
+    if pages == 'all':
+        return None
+    start, _, end = pages.partition('-')
+    if ',' in pages or end == 'end':
+        raise ValueError(
+            f"docling backend only supports a single page or range, got '{pages}'"
+        )
+    return (int(start), int(end or start))
 
-    #### placeholder function data is not thewre yer
-    return clean_table
 
+# Cell values the PDFs use for "no value"
+MISSING_VALUES = ['', '-', 'N/A', 'n/a', 'NaN']
 
+# Lap and race times: optional minutes with ' or : separator, then seconds
+_LAPTIME_PATTERN = r"^(?:(\d+)['\u2019:])?(\d+(?:\.\d+)?)$"
+
+
+def normalize_table(df: pd.DataFrame, table_type: Optional[str] = None) -> pd.DataFrame:
+    """Normalize a raw extracted table to its declared column schema.
+
+    Column names are snake_cased and mapped through COLUMN_ALIASES. Camelot
+    tables come with numbered columns and the header as first row, which is
+    promoted. Columns of the schema get their declared dtype (see
+    table_schemas.COLUMN_KINDS); other columns are kept as strings.
+
+    Args:
+        df: Raw table
+        table_type: Key of TABLE_SCHEMAS; detected from the columns when None.
+            Tables that match no schema get a generic numeric conversion.
+    """
+    if _has_numbered_columns(df) and len(df):
+        df = df.iloc[1:].set_axis(df.iloc[0].tolist(), axis=1)
 
-def normalize_table(df: pd.DataFrame) -> pd.DataFrame:
     # Normalize column names
-    df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
+    columns = [
+        '' if pd.isna(col) else str(col).strip().lower().replace(" ", "_")
+        for col in df.columns
+    ]
+    columns = [COLUMN_ALIASES.get(col, col) for col in columns]
+    df = df.set_axis(_unique_column_names(columns), axis=1)
     
-    # Handle missing values
-    df.replace({"": np.nan, "N/A": np.nan}, inplace=True)
+    if table_type is None:
+        table_type = detect_table_type(df.columns)
+    elif table_type not in TABLE_SCHEMAS:
+        raise ValueError(
+            f"Unknown table type '{table_type}', expected one of {tuple(TABLE_SCHEMAS)}"
+        )
+    schema = TABLE_SCHEMAS.get(table_type, {})
     
-    # Convert data types
-    for col in df.select_dtypes(include=["object"]).columns:
-        try:
-            df[col] = pd.to_numeric(df[col])
-        except ValueError:
-            pass  # If conversion fails, keep as object
+    converted = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            series = series.str.strip()
+            series = series.mask(series.isin(MISSING_VALUES))
+        kind = schema.get(col)
+        if kind:
+            converted[col] = _convert_column(series, kind)
+        else:
+            converted[col] = _infer_column(series, bool(schema))
     
-    return df
\ No newline at end of file
+    return pd.DataFrame(converted, index=df.index).reset_index(drop=True)
+
+
+def _has_numbered_columns(df: pd.DataFrame) -> bool:
+    """Whether the columns are camelot's numbering 0..n-1, i.e. the header
+    is still the first row; the index type doesn't matter"""
+    return list(df.columns) == list(range(len(df.columns)))
+
+
+def _unique_column_names(columns: List[str]) -> List[str]:
+    """Name blank header cells column_<n> and suffix repeated names _2, _3...
+
+    Camelot headers often have empty or repeated cells, and df[col] must
+    return one column.
+    """
+    used = set()
+    unique = []
+    for n, col in enumerate(columns):
+        col = col or f"column_{n}"
+        name, repeat = col, 1
+        while name in used:
+            repeat += 1
+            name = f"{col}_{repeat}"
+        used.add(name)
+        unique.append(name)
+    return unique
+
+
+def _convert_column(series: pd.Series, kind: str) -> pd.Series:
+    """Convert a column to the dtype of its schema kind; unparseable cells become
+    missing"""
+    if kind == 'category':
+        return series.astype('category')
+    if kind == 'date':
+        return pd.to_datetime(series, errors='coerce', dayfirst=True)
+    if kind == 'laptime':
+        parts = series.astype('string').str.extract(_LAPTIME_PATTERN)
+        minutes = pd.to_numeric(parts[0], errors='coerce').fillna(0)
+        seconds = pd.to_numeric(parts[1], errors='coerce')
+        return ((minutes * 60 + seconds) * 1000).round().astype('Int32')
+
+    numbers = pd.to_numeric(series, errors='coerce')
+    if kind == 'float32':
+        return numbers.astype('float32')
+    return numbers.round().astype('Int8' if kind == 'int8' else 'Int16')
+
+
+def _infer_column(series: pd.Series, keep_strings: bool) -> pd.Series:
+    """Convert a column outside the schema.
+
+    Columns of schema tables stay strings so dtypes are predictable; tables
+    without a schema get numbers when every present value parses as one.
+    """
+    if series.dtype != object or keep_strings:
+        return series
+    numbers = pd.to_numeric(series, errors='coerce')
+    if numbers.notna().sum() == series.notna().sum():
+        return numbers
+    return series
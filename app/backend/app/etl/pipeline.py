@@ -0,0 +1,359 @@
+"""
+Chunked, streaming ETL pipeline.
+Extracts one PDF at a time, normalizes table by table and loads fixed-size
+chunks with a commit per chunk, so memory stays flat however many PDFs are
+processed and a failure only loses the chunk in flight (or the one PDF it
+belongs to).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from .pdf_tables import extract_tables_from_pdf, normalize_table
+from .parallel_extraction import extract_tables_parallel
+from .db_loader import load_results_to_db
+from .key_resolver import KeyResolver
+from .table_cache import TableCache
+from .parquet_store import existing_parts, write_results
+from .batch import BatchReport
+
+logger = logging.getLogger(__name__)
+
+# Rows loaded (and committed) per transaction
+DEFAULT_CHUNK_SIZE = 5000
+
+# Chunks extracted ahead of the loader; bounds memory when loading is slower
+DEFAULT_QUEUE_SIZE = 4
+
+# Sentinel put on the work queue once every chunk has been produced
+_DONE = object()
+
+# (pending paths, catch_errors) -> (path, tables or exception) in order
+TableSource = Callable[
+    [List[str], bool],
+    Iterator[Tuple[str, Union[List[pd.DataFrame], Exception]]]
+]
+
+
+class Checkpoint:
+    """Resumable progress of a pipeline run, persisted as JSON.
+
+    Records the PDFs that are fully loaded and, for the PDF in progress, how
+    many of its normalized rows are already committed. Saved after every
+    committed chunk; a path of None keeps the progress in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.completed: List[str] = []
+        self.current: Optional[str] = None
+        self.current_rows = 0
+
+        if self.path and self.path.exists():
+            with open(self.path) as f:
+                data = json.load(f)
+            self.completed = data.get('completed', [])
+            self.current = data.get('current')
+            self.current_rows = data.get('current_rows', 0)
+            logger.info(
+                f"Resuming from checkpoint {self.path}: "
+                f"{len(self.completed)} PDFs done, "
+                f"{self.current_rows} rows into {self.current}"
+            )
+
+    def is_completed(self, pdf_path: str) -> bool:
+        return pdf_path in self.completed
+
+    def rows_done(self, pdf_path: str) -> int:
+        """Rows of pdf_path already committed by a previous run"""
+        return self.current_rows if pdf_path == self.current else 0
+
+    def advance(self, pdf_path: str, rows: int, pdf_done: bool) -> None:
+        """Record that the first rows of pdf_path are committed"""
+        if pdf_done:
+            if pdf_path not in self.completed:
+                self.completed.append(pdf_path)
+            self.current = None
+            self.current_rows = 0
+        else:
+            self.current = pdf_path
+            self.current_rows = rows
+        self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint atomically so a crash never leaves it half written"""
+        if not self.path:
+            return
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(
+                {
+                    'completed': self.completed,
+                    'current': self.current,
+                    'current_rows': self.current_rows,
+                },
+                f,
+                indent=2
+            )
+        os.replace(tmp_path, self.path)
+
+
+def _iter_tables(
+    pdf_paths: List[str],
+    workers: int,
+    pages_per_task: Optional[int],
+    cache: Optional[TableCache],
+    catch_errors: bool
+) -> Iterator[Tuple[str, Union[List[pd.DataFrame], Exception]]]:
+    """Yield (pdf_path, raw tables) in order, in worker processes when workers > 1.
+
+    With catch_errors a PDF that fails to extract yields its exception instead.
+    """
+    if workers > 1:
+        yield from extract_tables_parallel(
+            pdf_paths, workers=workers, pages_per_task=pages_per_task, cache=cache,
+            return_exceptions=catch_errors
+        )
+        return
+    for pdf_path in pdf_paths:
+        logger.info(f"📄 Extracting from: {pdf_path}")
+        try:
+            tables = extract_tables_from_pdf(pdf_path, cache=cache)
+        except Exception as e:
+            if not catch_errors:
+                raise
+            tables = e
+        yield pdf_path, tables
+
+
+def iter_chunks(
+    pdf_paths: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint: Optional[Checkpoint] = None,
+    workers: int = 1,
+    pages_per_task: Optional[int] = None,
+    cache: Optional[TableCache] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    source: Optional[TableSource] = None
+) -> Iterator[Tuple[pd.DataFrame, str, int, bool]]:
+    """Yield normalized chunks of at most chunk_size rows.
+
+    Each item is (chunk, pdf_path, rows, pdf_done) where rows is the number of
+    rows of pdf_path up to the end of this chunk. Chunks never span PDFs, so
+    only one PDF's tables (a few more with workers > 1) are held in memory at
+    a time. Rows already recorded in the checkpoint are skipped.
+
+    When on_error is given, a PDF that fails to extract or normalize is
+    reported through on_error(pdf_path, exception) and skipped instead of
+    ending the iteration.
+
+    source replaces the local extraction: it is called with the pending
+    paths and whether to catch errors, and yields (path, tables or exception)
+    in order (see storage_ingest.StorageTableSource).
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    pending = []
+    for pdf_path in map(str, pdf_paths):
+        if checkpoint and checkpoint.is_completed(pdf_path):
+            logger.info(f"Skipping {pdf_path} (already loaded)")
+        else:
+            pending.append(pdf_path)
+
+    catch_errors = on_error is not None
+    if source is not None:
+        extracted = source(pending, catch_errors)
+    else:
+        extracted = _iter_tables(pending, workers, pages_per_task, cache, catch_errors)
+
+    for pdf_path, tables in extracted:
+        if isinstance(tables, Exception):
+            on_error(pdf_path, tables)
+            continue
+        try:
+            yield from _chunk_tables(tables, pdf_path, chunk_size, checkpoint)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(pdf_path, e)
+
+
+def _chunk_tables(
+    tables: List[pd.DataFrame],
+    pdf_path: str,
+    chunk_size: int,
+    checkpoint: Optional[Checkpoint]
+) -> Iterator[Tuple[pd.DataFrame, str, int, bool]]:
+    """Normalize the tables of one PDF and cut them into chunks (see iter_chunks)"""
+    skip = checkpoint.rows_done(pdf_path) if checkpoint else 0
+
+    buffer: List[pd.DataFrame] = []
+    buffered = 0
+    offset = 0  # rows of this PDF handed out so far, including skipped ones
+
+    for table in tables:
+        table = normalize_table(table)
+        if skip:
+            dropped = min(skip, len(table))
+            table = table.iloc[dropped:]
+            skip -= dropped
+            offset += dropped
+        if table.empty:
+            continue
+
+        buffer.append(table)
+        buffered += len(table)
+        while buffered >= chunk_size:
+            merged = pd.concat(buffer, ignore_index=True)
+            chunk, rest = merged.iloc[:chunk_size], merged.iloc[chunk_size:]
+            buffer, buffered = ([rest] if len(rest) else []), len(rest)
+            offset += len(chunk)
+            # pdf_done is only known once the tables are exhausted
+            yield chunk, pdf_path, offset, False
+
+    if buffer:
+        chunk = pd.concat(buffer, ignore_index=True)
+        offset += len(chunk)
+        yield chunk, pdf_path, offset, True
+    else:
+        yield pd.DataFrame(), pdf_path, offset, True
+
+
+def _part_prefix(pdf_path: str) -> str:
+    """Prefix of the Parquet part names of pdf_path.
+
+    PDFs of different events share file names, so the prefix carries a hash
+    of the full path; it stays the same across runs.
+    """
+    path_hash = hashlib.sha1(str(pdf_path).encode()).hexdigest()[:12]
+    return f"{Path(pdf_path).stem}-{path_hash}"
+
+
+def _part_name(pdf_path: str, offset: int) -> str:
+    """Parquet part name of the chunk of pdf_path starting at row offset"""
+    return f"{_part_prefix(pdf_path)}-{offset}"
+
+
+def _produce_chunks(work_queue: queue.Queue, chunks: Iterator) -> None:
+    """Feed chunks into the work queue from a background thread, then _DONE.
+
+    An exception that escapes the iterator is handed to the consumer instead.
+    """
+    try:
+        for item in chunks:
+            work_queue.put(item)
+        work_queue.put(_DONE)
+    except BaseException as e:
+        work_queue.put(e)
+
+
+def run_pipeline(
+    pdf_paths: Iterable[str],
+    session_factory: Callable[[], Session],
+    mode: str = 'orm',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint: Optional[Checkpoint] = None,
+    workers: int = 1,
+    pages_per_task: Optional[int] = None,
+    cache: Optional[TableCache] = None,
+    dataset_dir: Optional[Path] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    report: Optional[BatchReport] = None,
+    source: Optional[TableSource] = None
+) -> Dict[str, int]:
+    """Extract, normalize and load PDFs chunk by chunk.
+
+    Extraction runs in a background thread (and a process pool with
+    workers > 1) that fills a work queue of at most queue_size chunks, while
+    this thread loads them. Every chunk is loaded in its own transaction with
+    a single session and KeyResolver shared across chunks; the checkpoint
+    advances after each commit, so rerunning with the same checkpoint resumes
+    after the last committed chunk. With a dataset_dir every chunk is also
+    written to the Parquet layer before it is loaded (see parquet_store).
+    Before a PDF's first chunk is written, the parts an earlier run left for
+    its rows from there on are deleted: with another chunk size their
+    offsets don't line up with the new parts, which would duplicate rows.
+
+    A PDF that fails to extract, normalize or load is recorded in the report
+    and the run moves on to the next one. pdf_paths may name objects of
+    another source, such as storage paths (see iter_chunks).
+
+    Returns:
+        Totals of the stats reported by load_results_to_db, plus
+        'chunks', 'rows' and, with a cache, 'cache_hits' and 'cache_misses'
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint()
+    if report is None:
+        report = BatchReport()
+
+    work_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    chunks = iter_chunks(
+        pdf_paths, chunk_size, checkpoint, workers, pages_per_task, cache,
+        on_error=report.record_failure, source=source
+    )
+    producer = threading.Thread(
+        target=_produce_chunks, args=(work_queue, chunks), daemon=True
+    )
+    producer.start()
+
+    totals: Dict[str, int] = {'chunks': 0, 'rows': 0}
+    stale_parts = existing_parts(dataset_dir) if dataset_dir is not None else {}
+    resolver = KeyResolver()
+    session = session_factory()
+    try:
+        while True:
+            item = work_queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+
+            chunk, pdf_path, rows, pdf_done = item
+            if pdf_path in report.failed:
+                continue  # a previous chunk of this PDF failed to load
+            if not chunk.empty:
+                try:
+                    if dataset_dir is not None:
+                        offset = rows - len(chunk)
+                        for part_offset, part in stale_parts.pop(
+                            _part_prefix(pdf_path), []
+                        ):
+                            if part_offset >= offset:
+                                part.unlink(missing_ok=True)
+                        write_results(chunk, dataset_dir, _part_name(pdf_path, offset))
+                    stats = load_results_to_db(
+                        chunk, session, mode=mode, resolver=resolver
+                    )
+                except Exception as e:
+                    report.record_failure(pdf_path, e)
+                    continue
+                for key, value in stats.items():
+                    totals[key] = totals.get(key, 0) + value
+                totals['chunks'] += 1
+                totals['rows'] += len(chunk)
+                report.rows += len(chunk)
+                logger.info(
+                    f"Committed chunk {totals['chunks']}: "
+                    f"{pdf_path} rows {rows - len(chunk)}-{rows}"
+                )
+            checkpoint.advance(pdf_path, rows, pdf_done)
+            if pdf_done:
+                report.record_success(pdf_path)
+    finally:
+        session.close()
+
+    producer.join()
+    if cache is not None:
+        totals.update(cache.stats)
+    return totals
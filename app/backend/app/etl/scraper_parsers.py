@@ -0,0 +1,170 @@
+"""
+Page parsers for the motogp.com scrapers.
+Each parser takes the HTML of a whole page, read from the driver once with
+page_source, and returns the records the scraper stores. Extraction then
+costs a single WebDriver round-trip per page instead of one per card field.
+"""
+
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements with name among their classes"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _parse(page_source: str, base_url: str = None):
+    """Parse a page, resolving relative links the way the browser reports them"""
+    document = lxml_html.fromstring(page_source)
+    if base_url:
+        document.make_links_absolute(base_url)
+    return document
+
+
+def _text(element) -> str:
+    """Text of an element with whitespace collapsed, like WebElement.text"""
+    return ' '.join(element.text_content().split())
+
+
+def _find_text(element, class_name: str, tag: str = '*') -> Optional[str]:
+    """Text of the first descendant with the class, or None if there is none"""
+    found = element.xpath(f".//{tag}[{_has_class(class_name)}]")
+    return _text(found[0]) if found else None
+
+
+def _find_container(document, xpath: str, page: str):
+    containers = document.xpath(xpath)
+    if not containers:
+        raise ValueError(f"{page} container not found in page")
+    return containers[0]
+
+
+def parse_calendar(page_source: str, base_url: str = None) -> List[Dict]:
+    """Extract the race cards of the calendar grid view
+
+    Cards missing a required field are logged and skipped.
+
+    Raises:
+        ValueError: if the page has no calendar grid
+    """
+    document = _parse(page_source, base_url)
+    calendar = _find_container(
+        document, '//div[contains(@class, "calendar-listing__grid-view")]', 'Calendar'
+    )
+
+    races_data = []
+    cards = calendar.xpath(f".//a[{_has_class('calendar-grid-card')}]")
+    for index, race in enumerate(cards, 1):
+        try:
+            date_range = race.xpath(
+                f".//*[{_has_class('calendar-grid-card__grid-card-date')}]//span"
+            )
+            flag = race.xpath(
+                f".//*[{_has_class('calendar-grid-card__event-flag')}]"
+            )
+            sequence = _find_text(race, 'calendar-grid-card__grid-card-event-sequence')
+            races_data.append({
+                'sequence': int(sequence),
+                'event_id': race.get('data-event-id'),
+                'title': race.get('title'),
+                'country': _find_text(
+                    race, 'calendar-grid-card__grid-card-event-full-name'
+                ),
+                'event_name': _find_text(
+                    race, 'calendar-grid-card__grid-card-event-name'
+                ),
+                'date_range': _text(date_range[0]) if date_range else None,
+                'status': _find_text(race, 'calendar-grid-card__grid-card-status'),
+                'url': race.get('href'),
+                'flag_url': flag[0].get('src') if flag else None,
+            })
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Skipping calendar card {index}: {e}")
+    return races_data
+
+
+def parse_riders(page_source: str, category: str, base_url: str = None) -> List[Dict]:
+    """Extract the rider cards of a category's riders page
+
+    Raises:
+        ValueError: if the page has no rider list
+    """
+    document = _parse(page_source, base_url)
+    rider_list = _find_container(
+        document, '//div[contains(@class, "rider-list__container")]', 'Rider list'
+    )
+    riders = rider_list.xpath(f".//a[{_has_class('rider-list__rider')}]")
+
+    return [
+        {
+            "sequence_id": index,
+            "category": category,
+            "name": _find_text(rider, 'rider-list__info-name', 'div'),
+            "country": _find_text(rider, 'rider-list__details-country', 'div'),
+            "team": _find_text(rider, 'rider-list__details-team', 'div'),
+            "number": _find_text(rider, 'rider-list__background-hashtag', 'div'),
+            "page_ref": rider.get('href')
+        }
+        for index, rider in enumerate(riders)
+    ]
+
+
+def parse_teams(page_source: str, category: str, base_url: str = None) -> List[Dict]:
+    """Extract one record per team rider from a category's teams page
+
+    Raises:
+        ValueError: if the page has no team list
+    """
+    document = _parse(page_source, base_url)
+    teams_list = _find_container(
+        document, '//div[contains(@class, "-list__container")]', 'Team list'
+    )
+
+    teams_data = []
+    teams = teams_list.xpath(f".//a[{_has_class('teams-list__team')}]")
+    for index, team in enumerate(teams):
+        team_name = _find_text(team, 'teams-list__info-name', 'div')
+        riders_container = team.xpath(
+            f".//div[{_has_class('teams-list__info-container')}]"
+        )
+        if riders_container:
+            rider_elements = riders_container[0].xpath('.//div')
+        else:
+            rider_elements = []
+
+        # One entry per rider
+        for rider_idx, rider_element in enumerate(rider_elements):
+            rider_name = _text(rider_element)
+            if rider_name:  # Skip empty elements
+                teams_data.append({
+                    "sequence_id": f"{index}_{rider_idx}",
+                    "category": category,
+                    "team_name": team_name,
+                    "rider_name": rider_name,
+                    "page_ref": team.get('href')
+                })
+    return teams_data
+
+
+def parse_pdf_links(page_source: str, base_url: str = None) -> List[Dict]:
+    """Extract the PDF links of a page's PDF tables
+
+    Returns:
+        One dict per link, in page order, with the 1-based 'container' and
+        'index' of the link and its absolute 'url'
+    """
+    document = _parse(page_source, base_url)
+    links = []
+    containers = document.xpath('//div[contains(@class, "pdf-table__table ")]')
+    for i, container in enumerate(containers, 1):
+        for j, link in enumerate(container.xpath('.//a[@href]'), 1):
+            href = link.get('href')
+            if urlparse(href).path.lower().endswith('.pdf'):
+                links.append({'container': i, 'index': j, 'url': href})
+    return links
@@ -0,0 +1,73 @@
+"""
+Readiness waits shared by the motogp.com scrapers.
+Each helper returns as soon as its condition holds instead of sleeping for a
+fixed time, and logs how long it actually waited.
+"""
+
+import logging
+import time
+from typing import Tuple
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_TIMEOUT = 15
+DEFAULT_BANNER_TIMEOUT = 5
+
+# Poll interval of every wait, in seconds
+POLL_FREQUENCY = 0.1
+
+COOKIE_REJECT_BUTTON = (By.ID, "onetrust-reject-all-handler")
+# Set by OneTrust once the banner has been answered in this browser
+CONSENT_COOKIE = 'OptanonAlertBoxClosed'
+
+Locator = Tuple[str, str]
+
+
+def _log_wait(step: str, started: float) -> None:
+    logger.info(f"⏱️ {step}: waited {time.perf_counter() - started:.2f}s")
+
+
+def wait_for_element(driver, locator: Locator, timeout: float = DEFAULT_PAGE_TIMEOUT,
+                     step: str = None):
+    """Wait until an element is in the DOM and return it
+
+    Raises:
+        TimeoutException: if it doesn't appear within timeout seconds
+    """
+    started = time.perf_counter()
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            EC.presence_of_element_located(locator)
+        )
+    finally:
+        _log_wait(step or f"element {locator[1]}", started)
+
+
+def dismiss_cookie_banner(driver, timeout: float = DEFAULT_BANNER_TIMEOUT) -> bool:
+    """Reject cookies on the OneTrust banner and wait for it to go away
+
+    Returns at once when the banner was already answered in this browser.
+
+    Returns:
+        True if the banner was dismissed, False if it never showed up
+    """
+    if driver.get_cookie(CONSENT_COOKIE):
+        return False
+
+    started = time.perf_counter()
+    wait = WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY)
+    try:
+        wait.until(EC.element_to_be_clickable(COOKIE_REJECT_BUTTON)).click()
+        wait.until(EC.invisibility_of_element_located(COOKIE_REJECT_BUTTON))
+        logger.info("Cookie banner dismissed")
+        return True
+    except TimeoutException:
+        logger.info("No cookie banner to dismiss")
+        return False
+    finally:
+        _log_wait("cookie banner", started)
@@ -0,0 +1,113 @@
+"""
+Streaming ingestion from Supabase storage.
+Lists the PDFs under a bucket prefix and feeds their bytes straight into the
+extractor, downloading the next objects while the current one is parsed.
+Nothing is written to disk on the way to the DB loader.
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .pdf_tables import extract_tables_from_pdf
+from .table_cache import TableCache
+
+logger = logging.getLogger(__name__)
+
+# Objects downloaded ahead of the extractor
+DEFAULT_DOWNLOAD_CONCURRENCY = 4
+
+
+def split_storage_prefix(location: str) -> Tuple[str, str]:
+    """Split 'bucket/some/prefix/' into ('bucket', 'some/prefix')"""
+    bucket, _, prefix = location.strip('/').partition('/')
+    return bucket, prefix
+
+
+def list_pdf_objects(client, bucket_name: str, prefix: str = '') -> List[str]:
+    """Return the storage paths of every PDF under prefix, sub-folders included.
+
+    A fresh snapshot in the client's listing index is used instead of
+    walking the bucket (see StorageBackend.list_objects), but a walked
+    listing is not recorded: the snapshot marks the objects already loaded,
+    which is for the caller of changed_pdf_objects to advance.
+    """
+    objects = client.list_objects(bucket_name, prefix, record=False)
+    return sorted(path for path in objects if path.lower().endswith('.pdf'))
+
+
+def changed_pdf_objects(client, bucket_name: str,
+                        prefix: str = '') -> Tuple[List[str], Dict[str, Dict]]:
+    """Return the PDFs under prefix that are new or changed since the last
+    recorded listing, and the current listing.
+
+    The listing is not recorded here: pass it to client.index.put() once the
+    returned PDFs are loaded, so a failed run sees them again.
+
+    Raises:
+        ValueError: if the client has no listing index
+    """
+    if client.index is None:
+        raise ValueError("Finding new objects needs a listing index "
+                         "(set STORAGE_INDEX_DIR)")
+    previous = client.index.previous(bucket_name, prefix)
+    current = client.list_objects(bucket_name, prefix, refresh=True, record=False)
+    changed = [path for path in client.index.changed(previous, current)
+               if path.lower().endswith('.pdf')]
+    return changed, current
+
+
+class StorageTableSource:
+    """Table source for run_pipeline that reads PDFs from a storage bucket.
+
+    Called with storage paths, it yields (storage_path, tables) in order.
+    Up to concurrency objects are downloading while the extractor works on
+    the current one, so network and CPU overlap.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket_name: str,
+        concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+        cache: Optional[TableCache] = None
+    ):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.concurrency = concurrency
+        self.cache = cache
+
+    def __call__(
+        self,
+        storage_paths: List[str],
+        catch_errors: bool = False
+    ) -> Iterator[Tuple[str, Union[List[pd.DataFrame], Exception]]]:
+        paths = iter(storage_paths)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            in_flight = deque()
+
+            def submit_next() -> None:
+                path = next(paths, None)
+                if path is not None:
+                    future = executor.submit(
+                        self.client.download_bytes, self.bucket_name, path
+                    )
+                    in_flight.append((path, future))
+
+            for _ in range(self.concurrency):
+                submit_next()
+
+            while in_flight:
+                path, future = in_flight.popleft()
+                submit_next()
+                logger.info(f"📄 Extracting from: {self.bucket_name}/{path}")
+                try:
+                    tables = extract_tables_from_pdf(future.result(), cache=self.cache)
+                except Exception as e:
+                    if not catch_errors:
+                        raise
+                    tables = e
+                yield path, tables
@@ -0,0 +1,146 @@
+"""
+On-disk cache of extracted PDF tables.
+Entries are keyed by the SHA-256 of the PDF bytes plus the extractor version,
+backend and page selection, and hold one Parquet file per table. The cache
+is bounded in size and evicts the least recently used entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path('.etl_cache') / 'tables'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+_META_FILE = 'meta.json'
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in blocks so large PDFs don't load into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _restore_int_columns(columns: pd.Index) -> pd.Index:
+    """Turn stored column names back into ints, camelot's 0..n-1 as a RangeIndex
+    like the uncached table, so normalize_table treats both the same"""
+    columns = columns.astype(int)
+    if columns.equals(pd.RangeIndex(len(columns))):
+        return pd.RangeIndex(len(columns))
+    return columns
+
+
+class TableCache:
+    """Size-bounded LRU cache of extracted tables, stored as Parquet.
+
+    Layout: <cache_dir>/<key>/table_<n>.parquet plus a meta.json. An entry's
+    mtime is its last use, so eviction removes the oldest entries until the
+    total size fits in max_bytes. Hits and misses are counted in stats.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {'cache_hits': 0, 'cache_misses': 0}
+        # (path, size, mtime) -> digest, so get() followed by put() hashes once
+        self._digests: Dict[Tuple[str, int, float], str] = {}
+
+    def key(self, path: str, extractor_version: str, backend: str, pages: str) -> str:
+        stat = os.stat(path)
+        file_id = (str(path), stat.st_size, stat.st_mtime)
+        if file_id not in self._digests:
+            self._digests[file_id] = file_sha256(path)
+        return self._make_key(self._digests[file_id], extractor_version, backend, pages)
+
+    def key_for_bytes(self, data: bytes, extractor_version: str, backend: str,
+                      pages: str) -> str:
+        """Cache key of an in-memory PDF, equal to key() of the same file on disk"""
+        digest = hashlib.sha256(data).hexdigest()
+        return self._make_key(digest, extractor_version, backend, pages)
+
+    @staticmethod
+    def _make_key(digest: str, extractor_version: str, backend: str, pages: str) -> str:
+        return f"{digest}-{backend}-v{extractor_version}-{pages.replace(',', '_')}"
+
+    def get(self, key: str) -> Optional[List[pd.DataFrame]]:
+        """Return the cached tables for key, or None on a miss"""
+        entry = self.cache_dir / key
+        meta_path = entry / _META_FILE
+        if not meta_path.exists():
+            self.stats['cache_misses'] += 1
+            return None
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            tables = []
+            for table_meta in meta['tables']:
+                table = pd.read_parquet(entry / table_meta['file'])
+                if table_meta['int_columns']:
+                    table.columns = _restore_int_columns(table.columns)
+                tables.append(table)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            self.stats['cache_misses'] += 1
+            return None
+
+        os.utime(entry)
+        self.stats['cache_hits'] += 1
+        return tables
+
+    def put(self, key: str, tables: List[pd.DataFrame]) -> None:
+        """Store tables under key, then evict down to max_bytes"""
+        entry = self.cache_dir / key
+        tmp_entry = self.cache_dir / f".{key}.tmp"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        tmp_entry.mkdir(parents=True)
+
+        meta = {'tables': []}
+        for n, table in enumerate(tables):
+            file_name = f"table_{n}.parquet"
+            # Parquet needs string column names; camelot numbers its columns
+            int_columns = all(isinstance(col, int) for col in table.columns)
+            stored = table.copy()
+            stored.columns = [str(col) for col in stored.columns]
+            stored.to_parquet(tmp_entry / file_name, index=False)
+            meta['tables'].append({'file': file_name, 'int_columns': int_columns})
+
+        with open(tmp_entry / _META_FILE, 'w') as f:
+            json.dump(meta, f)
+
+        # Publish the entry in one rename so readers never see it half written
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((entry.stat().st_mtime, size, entry))
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.debug(f"Evicted cache entry {entry.name}")
@@ -0,0 +1,90 @@
+"""
+Column schemas of the MotoGP results tables.
+Each table type declares the dtype of every known column so normalize_table
+converts columns in one vectorized pass per column instead of guessing.
+"""
+
+from typing import Dict, Iterable, Optional
+
+# Column kinds, mapped to dtypes by pdf_tables._convert_column:
+#   'category'  repeated labels (riders, teams, nations), pandas categorical
+#   'int8'      small counts such as positions, nullable Int8
+#   'int16'     laps and years, nullable Int16
+#   'float32'   points, gaps, sector times and speeds
+#   'laptime'   "1'39.283" / "1:39.283" / "39.283" strings, as Int32 milliseconds
+#   'date'      datetime64
+COLUMN_KINDS = ('category', 'int8', 'int16', 'float32', 'laptime', 'date')
+
+# Header spellings found in the PDFs -> schema column names
+COLUMN_ALIASES = {
+    'pos': 'position',
+    'pos.': 'position',
+    'pts': 'points',
+    'nat': 'nationality',
+    'nation': 'nationality',
+    'num': 'rider_number',
+    'no.': 'rider_number',
+    'n.': 'rider_number',
+    'lap_n.': 'lap',
+    'year': 'season_year',
+    'class': 'category',
+    'best_lap': 'best_lap_time',
+    'total_time': 'time',
+}
+
+_RIDER_COLUMNS = {
+    'rider_name': 'category',
+    'rider_surname': 'category',
+    'rider_number': 'int8',
+    'nationality': 'category',
+    'team': 'category',
+    'motorcycle': 'category',
+    'season_year': 'int16',
+    'category': 'category',
+    'circuit': 'category',
+    'date': 'date',
+}
+
+TABLE_SCHEMAS: Dict[str, Dict[str, str]] = {
+    'classification': {
+        **_RIDER_COLUMNS,
+        'position': 'int8',
+        'points': 'float32',
+        'laps': 'int16',
+        'time': 'laptime',
+        'gap': 'float32',
+        'avg_speed': 'float32',
+        'best_lap_time': 'laptime',
+    },
+    'lap_chart': {
+        **_RIDER_COLUMNS,
+        'lap': 'int16',
+        'position': 'int8',
+    },
+    'analysis': {
+        **_RIDER_COLUMNS,
+        'lap': 'int16',
+        'lap_time': 'laptime',
+        'sector_1': 'float32',
+        'sector_2': 'float32',
+        'sector_3': 'float32',
+        'sector_4': 'float32',
+        'top_speed': 'float32',
+    },
+}
+
+# Columns that identify each table type, most specific first
+_SIGNATURES = (
+    ('analysis', {'lap', 'lap_time'}),
+    ('lap_chart', {'lap', 'position'}),
+    ('classification', {'position', 'points'}),
+)
+
+
+def detect_table_type(columns: Iterable[str]) -> Optional[str]:
+    """Return the table type whose signature columns are all present, or None"""
+    present = set(columns)
+    for table_type, signature in _SIGNATURES:
+        if signature <= present:
+            return table_type
+    return None
@@ -1,3 +1,11 @@
+from .base import StorageBackend
 from .storage_client import StorageClient
+from .local_storage import LocalStorageClient
+from .async_storage_client import AsyncStorageClient
+from .download_cache import DownloadCache
+from .object_index import ObjectIndex
+from .factory import STORAGE_BACKENDS, get_storage_client
 
-__all__ = ['StorageClient']
\ No newline at end of file
+__all__ = ['StorageBackend', 'StorageClient', 'LocalStorageClient',
+           'AsyncStorageClient', 'DownloadCache', 'ObjectIndex', 'STORAGE_BACKENDS',
+           'get_storage_client']
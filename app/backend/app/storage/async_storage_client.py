@@ -0,0 +1,189 @@
+import os
+import logging
+from typing import AsyncIterable, AsyncIterator, Dict, Optional, Union
+
+import httpx
+
+from .base import LIST_PAGE_SIZE, STREAM_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncStorageClient:
+    """Asynchronous Supabase Storage client for use inside the API
+
+    Wraps one httpx.AsyncClient, so all requests share a pool of keep-alive
+    connections and never block the event loop. The pool is created by
+    open() and released by close(); the app does both in its startup and
+    shutdown handlers and keeps the client on app.state.storage.
+
+    Large objects can be proxied without buffering them: open_stream()
+    returns a response whose body is still unread, e.g.
+
+        response = await storage.open_stream(bucket, path)
+        return StreamingResponse(response.aiter_bytes(),
+                                 media_type=response.headers.get('content-type'),
+                                 background=BackgroundTask(response.aclose))
+    """
+
+    def __init__(self, supabase_url: str = None, supabase_key: str = None,
+                 max_connections: int = 20, max_keepalive: int = 10,
+                 connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 max_retries: int = 3,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """Configure the client; no connection is made before open()
+
+        Args:
+            supabase_url: Project URL (default: SUPABASE_URL)
+            supabase_key: Service key (default: SUPABASE_KEY)
+            max_connections: Concurrent connections to the storage host
+            max_keepalive: Idle connections kept open for reuse
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries on failed connection attempts
+            transport: Transport to send requests through instead of the
+                pooled HTTP one, e.g. an httpx.MockTransport in tests
+        """
+        self.supabase_url = supabase_url or os.getenv('SUPABASE_URL')
+        self.supabase_key = supabase_key or os.getenv('SUPABASE_KEY')
+        if not self.supabase_url or not self.supabase_key:
+            raise ValueError(
+                "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
+            )
+
+        self.storage_url = f"{self.supabase_url}/storage/v1"
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive)
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def open(self) -> None:
+        """Create the shared connection pool"""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.storage_url,
+            headers={
+                'apikey': self.supabase_key,
+                'Authorization': f'Bearer {self.supabase_key}'
+            },
+            timeout=self.timeout,
+            transport=self.transport or httpx.AsyncHTTPTransport(
+                retries=self.max_retries, limits=self.limits
+            ),
+        )
+        logger.info("Async Supabase storage client opened")
+
+    async def close(self) -> None:
+        """Close the connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Async Supabase storage client closed")
+
+    async def __aenter__(self) -> 'AsyncStorageClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("AsyncStorageClient is not open; call open() first")
+        return self._client
+
+    async def list_buckets(self) -> list:
+        """List all storage buckets"""
+        response = await self.client.get('/bucket')
+        response.raise_for_status()
+        return response.json()
+
+    async def list_page(self, bucket_name: str, folder_path: str = None,
+                        limit: int = LIST_PAGE_SIZE, offset: int = 0) -> list:
+        """List one page of a bucket or folder, in name order"""
+        response = await self.client.post(
+            f"/object/list/{bucket_name}",
+            json={
+                'prefix': folder_path or '',
+                'limit': limit,
+                'offset': offset,
+                'sortBy': {'column': 'name', 'order': 'asc'},
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def iter_files(self, bucket_name: str, folder_path: str = None,
+                         page_size: int = LIST_PAGE_SIZE) -> AsyncIterator[Dict]:
+        """Yield every entry of one folder level, fetching a page at a time"""
+        offset = 0
+        while True:
+            page = await self.list_page(bucket_name, folder_path, limit=page_size,
+                                        offset=offset)
+            for entry in page:
+                yield entry
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
+    async def download_bytes(self, bucket_name: str, storage_path: str) -> bytes:
+        """Download an object and return its content"""
+        response = await self.client.get(f"/object/{bucket_name}/{storage_path}")
+        response.raise_for_status()
+        return response.content
+
+    async def open_stream(self, bucket_name: str, storage_path: str) -> httpx.Response:
+        """Start downloading an object and return the response with its body unread
+
+        The status is checked before returning, so errors surface before any
+        bytes are forwarded. The caller must aclose() the response.
+        """
+        request = self.client.build_request(
+            'GET', f"/object/{bucket_name}/{storage_path}"
+        )
+        response = await self.client.send(request, stream=True)
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
+
+    async def download_stream(
+        self, bucket_name: str, storage_path: str,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yield an object's content in chunks of at most chunk_size bytes"""
+        response = await self.open_stream(bucket_name, storage_path)
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def upload(self, bucket_name: str, storage_path: str,
+                     content: Union[bytes, AsyncIterable[bytes]],
+                     content_type: str = 'application/octet-stream',
+                     upsert: bool = False) -> str:
+        """Upload bytes or an async stream of chunks and return the public URL
+
+        Streams are sent with chunked transfer encoding, without buffering.
+        """
+        response = await self.client.post(
+            f"/object/{bucket_name}/{storage_path}",
+            headers={'Content-Type': content_type,
+                     'x-upsert': 'true' if upsert else 'false'},
+            content=content
+        )
+        response.raise_for_status()
+        logger.info(f"Uploaded to {bucket_name}/{storage_path}")
+        return f"{self.storage_url}/object/public/{bucket_name}/{storage_path}"
+
+    async def delete_file(self, bucket_name: str, storage_path: str) -> None:
+        """Delete an object"""
+        response = await self.client.delete(f"/object/{bucket_name}/{storage_path}")
+        response.raise_for_status()
+        logger.info(f"Deleted {storage_path} from {bucket_name}")
@@ -0,0 +1,338 @@
+import os
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import (
+    BinaryIO, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple,
+    Union
+)
+
+from .object_index import ObjectIndex
+from .upload_manifest import UploadManifest
+
+logger = logging.getLogger(__name__)
+
+# Bytes read or written per chunk by the streaming transfers
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Entries requested per listing call
+LIST_PAGE_SIZE = 1000
+
+
+class StorageBackend(ABC):
+    """Interface shared by the storage backends
+
+    Objects live in buckets under slash-separated paths. Subclasses implement
+    the single-object operations; the concurrent transfers, upload manifests
+    and context manager are built on top of them here.
+    """
+
+    def __init__(self, pool_size: int = 10, index: Optional[ObjectIndex] = None):
+        """Set up the state shared by every backend
+
+        Args:
+            pool_size: Concurrent transfers in upload_many/download_many
+            index: Listing snapshots used by list_objects (default: from the
+                STORAGE_INDEX_* environment, see ObjectIndex.from_env)
+        """
+        self.pool_size = pool_size
+        self.index = index if index is not None else ObjectIndex.from_env()
+        # Upload manifests per bucket, loaded on the first skip_unchanged upload
+        self._manifests: Dict[str, UploadManifest] = {}
+        self._manifests_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Save pending upload manifests and release the backend's resources"""
+        self.save_manifests()
+
+    def manifest(self, bucket_name: str) -> UploadManifest:
+        """Return the upload manifest of a bucket, loading it on first use"""
+        with self._manifests_lock:
+            if bucket_name not in self._manifests:
+                self._manifests[bucket_name] = UploadManifest(self, bucket_name)
+            return self._manifests[bucket_name]
+
+    def save_manifests(self) -> None:
+        """Write every changed upload manifest back to its bucket"""
+        for manifest in list(self._manifests.values()):
+            manifest.save()
+
+    def __enter__(self) -> 'StorageBackend':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @abstractmethod
+    def list_buckets(self) -> list:
+        """List all storage buckets as dicts with at least a 'name'"""
+
+    @abstractmethod
+    def create_bucket(self, bucket_name: str, public: bool = False) -> bool:
+        """Create a bucket unless it exists; False on failure"""
+
+    @abstractmethod
+    def create_folder(self, bucket_name: str, folder_path: str) -> bool:
+        """Create a folder in a bucket; False on failure"""
+
+    @abstractmethod
+    def upload_file(self, bucket_name: str, file_path: str, object_name: str = None,
+                    folder_path: str = None, skip_unchanged: bool = False,
+                    match_folder: bool = False) -> Optional[str]:
+        """Upload a local file and return its URL, or None if skipped as unchanged"""
+
+    @abstractmethod
+    def upload_stream(self, bucket_name: str, source: Union[BinaryIO, Iterable[bytes]],
+                      storage_path: str,
+                      content_type: str = 'application/octet-stream') -> str:
+        """Upload from a file object or a generator of byte chunks and return its URL"""
+
+    @abstractmethod
+    def upload_from_memory(self, bucket_name: str, file_content: bytes,
+                           object_name: str, folder_path: str = None,
+                           content_type: str = 'application/octet-stream',
+                           upsert: bool = False, skip_unchanged: bool = False,
+                           match_folder: bool = False) -> Optional[str]:
+        """Upload bytes and return their URL, or None if skipped as unchanged"""
+
+    @abstractmethod
+    def download_stream(self, bucket_name: str, storage_path: str,
+                        chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield an object's content in chunks of at most chunk_size bytes"""
+
+    @abstractmethod
+    def download_bytes(self, bucket_name: str, storage_path: str) -> bytes:
+        """Return an object's content"""
+
+    @abstractmethod
+    def download_file(self, bucket_name: str, storage_path: str) -> BytesIO:
+        """Return an object's content as a readable in-memory file"""
+
+    @abstractmethod
+    def download_file_temp(self, bucket_name: str,
+                           storage_path: str) -> ContextManager[str]:
+        """Context manager yielding a local path holding the object's content"""
+
+    @abstractmethod
+    def list_page(self, bucket_name: str, folder_path: str = None,
+                  limit: int = LIST_PAGE_SIZE, offset: int = 0) -> list:
+        """List up to limit entries of one folder level in name order, after offset
+
+        Sub-folders are the entries whose id is None.
+        """
+
+    @abstractmethod
+    def delete_file(self, bucket_name: str, storage_path: str) -> bool:
+        """Delete an object; False on failure"""
+
+    def iter_files(self, bucket_name: str, folder_path: str = None,
+                   page_size: int = LIST_PAGE_SIZE) -> Iterator[Dict]:
+        """Yield every entry of one folder level, fetching a page at a time"""
+        offset = 0
+        while True:
+            page = self.list_page(bucket_name, folder_path, limit=page_size,
+                                  offset=offset)
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
+    def list_files(self, bucket_name: str, folder_path: str = None) -> list:
+        """List every entry of one folder level; sub-folders have no id"""
+        return list(self.iter_files(bucket_name, folder_path))
+
+    def walk_files(self, bucket_name: str,
+                   prefix: str = '') -> Iterator[Tuple[str, Dict]]:
+        """Yield (storage_path, entry) for every object under prefix, recursively"""
+        folders = deque([prefix.strip('/')])
+        while folders:
+            folder = folders.popleft()
+            for entry in self.iter_files(bucket_name, folder or None):
+                path = f"{folder}/{entry['name']}" if folder else entry['name']
+                if entry.get('id') is None:
+                    folders.append(path)
+                else:
+                    yield path, entry
+
+    def list_objects(self, bucket_name: str, prefix: str = '', refresh: bool = False,
+                     record: bool = True) -> Dict[str, Dict]:
+        """Map every object path under prefix to its size, update time and ETag
+
+        A fresh snapshot in the listing index is returned without contacting
+        the backend unless refresh is set. Otherwise the prefix is walked and,
+        with record, the result becomes its new snapshot.
+        """
+        if self.index is not None and not refresh:
+            objects = self.index.get(bucket_name, prefix)
+            if objects is not None:
+                logger.debug(f"Listing of {bucket_name}/{prefix} served from the index")
+                return objects
+
+        objects = {}
+        for path, entry in self.walk_files(bucket_name, prefix):
+            metadata = entry.get('metadata') or {}
+            objects[path] = {
+                'size': metadata.get('size'),
+                'updated_at': entry.get('updated_at'),
+                'etag': metadata.get('eTag'),
+            }
+        if self.index is not None and record:
+            self.index.put(bucket_name, prefix, objects)
+        logger.info(f"Listed {len(objects)} objects under {bucket_name}/{prefix}")
+        return objects
+
+    def download_to_file(self, bucket_name: str, storage_path: str, dest_path: str,
+                         chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """Stream an object to dest_path and return the bytes written
+
+        Writes to a sibling temporary file first so dest_path is never left
+        half written.
+        """
+        dest_path = Path(dest_path)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest_path.with_name(f".{dest_path.name}.part")
+        written = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                chunks = self.download_stream(bucket_name, storage_path, chunk_size)
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp_path, dest_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        logger.info(f"Downloaded {storage_path} to {dest_path} ({written} bytes)")
+        return written
+
+    def upload_many(self, bucket_name: str, file_paths: Iterable[str],
+                    folder_path: str = None, max_workers: int = None,
+                    skip_unchanged: bool = False, base_dir: str = None) -> Dict:
+        """Upload local files concurrently, one object per file
+
+        Each object is named by its file's path relative to base_dir, so files
+        of the same name in different directories don't overwrite each other.
+
+        Args:
+            bucket_name: Target bucket
+            file_paths: Local files to upload
+            folder_path: Folder inside the bucket
+            max_workers: Concurrent transfers (default: the connection pool size)
+            skip_unchanged: Skip files whose content is already stored (see upload_file)
+            base_dir: Directory the object names are relative to (default: the
+                deepest directory holding every file); a file outside it fails
+
+        Returns:
+            Transfer report (see _run_transfers) with an extra 'skipped' count;
+            each result has 'url' on upload or 'skipped': True
+        """
+        file_paths = list(file_paths)
+        if base_dir is None and file_paths:
+            base_dir = os.path.commonpath(
+                [os.path.dirname(os.path.abspath(path)) for path in file_paths]
+            )
+        if skip_unchanged:
+            self.manifest(bucket_name)  # load once before the workers start
+
+        def upload(file_path: str) -> Dict:
+            object_name = Path(
+                os.path.relpath(os.path.abspath(file_path), os.path.abspath(base_dir))
+            ).as_posix()
+            if object_name.startswith('../'):
+                raise ValueError(f"{file_path} is outside {base_dir}")
+            url = self.upload_file(bucket_name, file_path, object_name=object_name,
+                                   folder_path=folder_path,
+                                   skip_unchanged=skip_unchanged)
+            if url is None:
+                return {'skipped': True, 'bytes': 0}
+            return {'url': url, 'bytes': os.path.getsize(file_path)}
+
+        report = self._run_transfers(upload, file_paths, max_workers, 'Uploaded')
+        report['skipped'] = sum(1 for result in report['results']
+                                if result.get('skipped'))
+        if skip_unchanged:
+            self.manifest(bucket_name).save()
+        return report
+
+    def download_many(self, bucket_name: str, storage_paths: Iterable[str],
+                      dest_dir: str = None, max_workers: int = None) -> Dict:
+        """Download objects concurrently
+
+        Args:
+            bucket_name: Source bucket
+            storage_paths: Object paths inside the bucket
+            dest_dir: Write each object to dest_dir/<storage_path>; when None
+                the content is returned in memory. A path that would land
+                outside dest_dir (e.g. through "..") fails instead
+            max_workers: Concurrent transfers (default: the connection pool size)
+
+        Returns:
+            Transfer report (see _run_transfers); each result has 'file' or
+            'content' on success
+        """
+        def download(storage_path: str) -> Dict:
+            if dest_dir is None:
+                content = self.download_bytes(bucket_name, storage_path)
+                return {'content': content, 'bytes': len(content)}
+            target = Path(dest_dir) / storage_path
+            if not target.resolve().is_relative_to(Path(dest_dir).resolve()):
+                raise ValueError(f"{storage_path} would be written outside {dest_dir}")
+            written = self.download_to_file(bucket_name, storage_path, target)
+            return {'file': str(target), 'bytes': written}
+
+        return self._run_transfers(download, list(storage_paths), max_workers,
+                                   'Downloaded')
+
+    def _run_transfers(self, transfer: Callable[[str], Dict], items: List[str],
+                       max_workers: Optional[int], verb: str) -> Dict:
+        """Run transfer(item) for every item on a bounded thread pool
+
+        Returns:
+            Dictionary with 'results' (one dict per item, in order, holding
+            'path' and either the transfer's fields or 'error'), 'succeeded',
+            'failed', 'bytes', 'seconds' and 'bytes_per_second'
+        """
+        started = time.perf_counter()
+
+        def run(item: str) -> Dict:
+            try:
+                return {'path': item, **transfer(item)}
+            except Exception as e:
+                return {'path': item, 'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.pool_size) as executor:
+            results = list(executor.map(run, items))
+
+        elapsed = time.perf_counter() - started
+        total_bytes = sum(result.get('bytes', 0) for result in results)
+        failed = sum(1 for result in results if 'error' in result)
+        report = {
+            'results': results,
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'bytes': total_bytes,
+            'seconds': round(elapsed, 2),
+            'bytes_per_second': round(total_bytes / elapsed) if elapsed else 0,
+        }
+        logger.info(
+            f"{verb} {report['succeeded']}/{len(results)} objects, "
+            f"{total_bytes / 1024 ** 2:.1f} MB in {elapsed:.2f}s "
+            f"({report['bytes_per_second'] / 1024 ** 2:.1f} MB/s)"
+        )
+        return report
+
+    def _is_stored(self, bucket_name: str, storage_path: str, digest: str,
+                   size: int, match_folder: bool) -> bool:
+        """Check the upload manifest for identical content, logging a skip"""
+        stored_path = self.manifest(bucket_name).find(storage_path, digest, size,
+                                                      match_folder)
+        if stored_path is None:
+            return False
+        logger.info(f"Skipped {storage_path}: unchanged, "
+                    f"stored as {bucket_name}/{stored_path}")
+        return True
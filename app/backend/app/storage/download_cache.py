@@ -0,0 +1,134 @@
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path('.storage_cache')
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+
+_META_SUFFIX = '.meta.json'
+
+
+class DownloadCache:
+    """Size-bounded LRU disk cache of downloaded storage objects
+
+    Objects live at <cache_dir>/<bucket>/<path> with a sidecar
+    <path>.meta.json holding the ETag, size and SHA-256 they were stored with.
+    A file's mtime is its last use. The cache directory is scanned once, when
+    the cache is opened; after that an in-memory LRU index tracks the total
+    size, and eviction removes the least recently used objects until it fits
+    in max_bytes. The object just stored is never evicted.
+
+    With offline=True the cache is authoritative: StorageClient serves hits
+    without revalidating and treats misses as missing objects.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self._sizes = self._scan()
+        self.total_bytes = sum(self._sizes.values())
+
+    @classmethod
+    def from_env(cls) -> Optional['DownloadCache']:
+        """Build a cache from STORAGE_CACHE_DIR, STORAGE_CACHE_MAX_MB and
+        STORAGE_OFFLINE, or return None when STORAGE_CACHE_DIR is not set"""
+        cache_dir = os.getenv('STORAGE_CACHE_DIR')
+        if not cache_dir:
+            return None
+        max_mb = os.getenv('STORAGE_CACHE_MAX_MB')
+        return cls(
+            cache_dir,
+            max_bytes=int(max_mb) * 1024 ** 2 if max_mb else DEFAULT_MAX_BYTES,
+            offline=os.getenv('STORAGE_OFFLINE', '').lower() in ('1', 'true', 'yes'),
+        )
+
+    def _scan(self) -> 'OrderedDict[Path, int]':
+        """Sizes of the cached objects, least recently used first"""
+        objects = []
+        for local_path in self.cache_dir.rglob('*'):
+            if (not local_path.is_file() or local_path.name.endswith(_META_SUFFIX)
+                    or local_path.name.startswith('.')):
+                continue
+            stat = local_path.stat()
+            objects.append((stat.st_mtime, local_path, stat.st_size))
+        return OrderedDict(
+            (local_path, size) for _, local_path, size in sorted(objects)
+        )
+
+    def fits(self, size: Optional[int]) -> bool:
+        """Whether an object of size bytes (None if unknown) should be cached"""
+        return size is None or size <= self.max_bytes
+
+    def path(self, bucket_name: str, storage_path: str) -> Path:
+        return self.cache_dir / bucket_name / storage_path.strip('/')
+
+    def lookup(self, bucket_name: str, storage_path: str) -> Optional[Dict]:
+        """Return the stored metadata of an object, or None if it isn't cached"""
+        local_path = self.path(bucket_name, storage_path)
+        meta_path = local_path.with_name(local_path.name + _META_SUFFIX)
+        if not local_path.exists() or not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if local_path.stat().st_size != meta['size']:
+            return None  # truncated by a crash, fetch again
+        return meta
+
+    def touch(self, bucket_name: str, storage_path: str) -> Path:
+        """Mark a cached object as just used and return its local path"""
+        local_path = self.path(bucket_name, storage_path)
+        os.utime(local_path)
+        if local_path in self._sizes:
+            self._sizes.move_to_end(local_path)
+        return local_path
+
+    def store(self, bucket_name: str, storage_path: str, chunks: Iterable[bytes],
+              etag: Optional[str] = None) -> Path:
+        """Write an object from a stream of chunks, then evict other objects
+        down to max_bytes"""
+        local_path = self.path(bucket_name, storage_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = local_path.with_name(f".{local_path.name}.part")
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, local_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        meta_path = local_path.with_name(local_path.name + _META_SUFFIX)
+        with open(meta_path, 'w') as f:
+            json.dump({'etag': etag, 'size': size, 'sha256': digest.hexdigest()}, f)
+
+        self.total_bytes += size - self._sizes.pop(local_path, 0)
+        self._sizes[local_path] = size
+        self._evict(keep=local_path)
+        return local_path
+
+    def _evict(self, keep: Path) -> None:
+        while self.total_bytes > self.max_bytes:
+            local_path, size = next(iter(self._sizes.items()))
+            if local_path == keep:
+                break  # only the new object is left, keep it until the next store
+            del self._sizes[local_path]
+            local_path.unlink(missing_ok=True)
+            local_path.with_name(local_path.name + _META_SUFFIX).unlink(missing_ok=True)
+            self.total_bytes -= size
+            logger.debug(f"Evicted cached object {local_path}")
@@ -0,0 +1,31 @@
+import os
+
+from .base import StorageBackend
+from .local_storage import DEFAULT_LOCAL_ROOT, LocalStorageClient
+from .storage_client import StorageClient
+
+STORAGE_BACKENDS = ('supabase', 'local')
+
+
+def get_storage_client(backend: str = None, **kwargs) -> StorageBackend:
+    """Build the configured storage backend
+
+    Args:
+        backend: 'supabase' or 'local' (default: the STORAGE_BACKEND environment
+            variable, falling back to 'supabase')
+        **kwargs: Passed to the backend's constructor; the local backend's root
+            defaults to STORAGE_LOCAL_ROOT
+
+    Raises:
+        ValueError: if the backend is unknown
+    """
+    backend = (backend or os.getenv('STORAGE_BACKEND') or 'supabase').lower()
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend {backend!r}, "
+                         f"expected one of {STORAGE_BACKENDS}")
+
+    if backend == 'local':
+        kwargs.setdefault('root', os.getenv('STORAGE_LOCAL_ROOT') or DEFAULT_LOCAL_ROOT)
+        return LocalStorageClient(**kwargs)
+
+    return StorageClient(**kwargs)
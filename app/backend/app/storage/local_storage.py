@@ -0,0 +1,289 @@
+import os
+import logging
+import mimetypes
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from io import BytesIO
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Union
+
+from .base import LIST_PAGE_SIZE, STREAM_CHUNK_SIZE, StorageBackend
+from .object_index import ObjectIndex
+from .upload_manifest import sha256_bytes, sha256_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_ROOT = Path('data') / 'storage'
+
+_PART_SUFFIX = '.part'
+
+
+class LocalStorageClient(StorageBackend):
+    """Storage backend on the local filesystem, with the StorageClient API
+
+    Each bucket is a directory under root and each object a file under it,
+    so runs need no network or credentials and go at disk speed. Writes go
+    to a hidden temporary file in the target folder and are published with
+    a single rename, so readers never see a partial object. As on Supabase,
+    uploads don't replace an existing object unless asked to.
+    """
+
+    def __init__(self, root: Path = DEFAULT_LOCAL_ROOT, pool_size: int = 4,
+                 index: Optional[ObjectIndex] = None):
+        """Initialize the local storage backend
+
+        Args:
+            root: Directory holding one sub-directory per bucket
+            pool_size: Concurrent transfers in upload_many/download_many
+            index: Listing snapshots used by list_objects (see StorageBackend)
+        """
+        super().__init__(pool_size, index)
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Local storage client initialized at {self.root}")
+
+    def _bucket_dir(self, bucket_name: str) -> Path:
+        bucket_dir = self.root / bucket_name
+        if not bucket_dir.is_dir():
+            raise FileNotFoundError(f"Bucket not found: {bucket_name}")
+        return bucket_dir
+
+    def _object_path(self, bucket_name: str, storage_path: str) -> Path:
+        """Local file of an object, refusing paths that leave the bucket"""
+        parts = Path(storage_path.strip('/')).parts
+        if not parts or '..' in parts:
+            raise ValueError(f"Invalid storage path: {storage_path}")
+        return self._bucket_dir(bucket_name).joinpath(*parts)
+
+    def _write(self, target: Path, chunks: Iterable[bytes], upsert: bool) -> int:
+        """Write chunks to a temporary sibling of target, then publish it atomically
+
+        Without upsert the object is linked into place, which fails if it
+        already exists, instead of being renamed over it.
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.",
+                                        suffix=_PART_SUFFIX)
+        written = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+            if upsert:
+                os.replace(tmp_name, target)
+            else:
+                os.link(tmp_name, target)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return written
+
+    @staticmethod
+    def _url(target: Path) -> str:
+        return target.resolve().as_uri()
+
+    def list_buckets(self) -> list:
+        """List all storage buckets"""
+        return [
+            {'id': entry.name, 'name': entry.name}
+            for entry in sorted(self.root.iterdir())
+            if entry.is_dir() and not entry.name.startswith('.')
+        ]
+
+    def create_bucket(self, bucket_name: str, public: bool = False) -> bool:
+        """Create a new storage bucket (public is ignored locally)"""
+        try:
+            bucket_dir = self.root / bucket_name
+            if bucket_dir.is_dir():
+                logger.info(f"Bucket '{bucket_name}' already exists")
+                return True
+            bucket_dir.mkdir(parents=True)
+            logger.info(f"Created bucket '{bucket_name}'")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error creating bucket '{bucket_name}': {e}")
+            return False
+
+    def create_folder(self, bucket_name: str, folder_path: str) -> bool:
+        """Create a folder in a bucket"""
+        try:
+            folder = self._object_path(bucket_name, folder_path)
+            folder.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Created folder '{folder_path}' in bucket '{bucket_name}'")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error creating folder '{folder_path}': {e}")
+            return False
+
+    def upload_file(self, bucket_name: str, file_path: str, object_name: str = None,
+                    folder_path: str = None, skip_unchanged: bool = False,
+                    match_folder: bool = False) -> Optional[str]:
+        """Copy a file into a bucket (see StorageClient.upload_file)"""
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"File not found: {file_path}")
+
+            if object_name is None:
+                object_name = os.path.basename(file_path)
+            if folder_path:
+                storage_path = f"{folder_path.strip('/')}/{object_name}"
+            else:
+                storage_path = object_name
+
+            size = os.path.getsize(file_path)
+            if skip_unchanged:
+                digest = sha256_file(file_path)
+                if self._is_stored(bucket_name, storage_path, digest, size,
+                                   match_folder):
+                    return None
+
+            target = self._object_path(bucket_name, storage_path)
+            with open(file_path, 'rb') as f:
+                self._write(target, iter(lambda: f.read(STREAM_CHUNK_SIZE), b''),
+                            upsert=skip_unchanged)
+
+            if skip_unchanged:
+                self.manifest(bucket_name).record(storage_path, digest, size)
+            logger.info(f"Uploaded {file_path} to {bucket_name}/{storage_path}")
+            return self._url(target)
+
+        except Exception as e:
+            logger.error(f"Error uploading file {file_path}: {e}")
+            raise
+
+    def upload_stream(self, bucket_name: str, source: Union[BinaryIO, Iterable[bytes]],
+                      storage_path: str,
+                      content_type: str = 'application/octet-stream') -> str:
+        """Write a file object or a generator of byte chunks to a new object"""
+        try:
+            if hasattr(source, 'read'):
+                chunks = iter(lambda: source.read(STREAM_CHUNK_SIZE), b'')
+            else:
+                chunks = source
+            target = self._object_path(bucket_name, storage_path)
+            self._write(target, chunks, upsert=False)
+            logger.info(f"Streamed upload to {bucket_name}/{storage_path}")
+            return self._url(target)
+
+        except Exception as e:
+            logger.error(f"Error streaming upload to {storage_path}: {e}")
+            raise
+
+    def upload_from_memory(self, bucket_name: str, file_content: bytes,
+                           object_name: str, folder_path: str = None,
+                           content_type: str = 'application/octet-stream',
+                           upsert: bool = False, skip_unchanged: bool = False,
+                           match_folder: bool = False) -> Optional[str]:
+        """Write bytes to an object (see StorageClient.upload_from_memory)"""
+        try:
+            if folder_path:
+                storage_path = f"{folder_path.strip('/')}/{object_name}"
+            else:
+                storage_path = object_name
+
+            if skip_unchanged:
+                digest = sha256_bytes(file_content)
+                if self._is_stored(bucket_name, storage_path, digest,
+                                   len(file_content), match_folder):
+                    return None
+
+            target = self._object_path(bucket_name, storage_path)
+            self._write(target, [file_content], upsert=upsert or skip_unchanged)
+
+            if skip_unchanged:
+                self.manifest(bucket_name).record(storage_path, digest,
+                                                  len(file_content))
+            logger.info(f"Uploaded {object_name} to {bucket_name}/{storage_path}")
+            return self._url(target)
+
+        except Exception as e:
+            logger.error(f"Error uploading from memory: {e}")
+            raise
+
+    def download_stream(self, bucket_name: str, storage_path: str,
+                        chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield an object's content in chunks of at most chunk_size bytes"""
+        with open(self._object_path(bucket_name, storage_path), 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+
+    def download_bytes(self, bucket_name: str, storage_path: str) -> bytes:
+        """Return an object's content"""
+        return self._object_path(bucket_name, storage_path).read_bytes()
+
+    def download_file(self, bucket_name: str, storage_path: str) -> BytesIO:
+        """Return an object's content as an in-memory file"""
+        return BytesIO(self.download_bytes(bucket_name, storage_path))
+
+    @contextmanager
+    def download_file_temp(self, bucket_name: str, storage_path: str):
+        """Yield the object's own file; nothing is copied or deleted"""
+        target = self._object_path(bucket_name, storage_path)
+        if not target.is_file():
+            raise FileNotFoundError(f"Object not found: {bucket_name}/{storage_path}")
+        yield str(target)
+
+    def list_page(self, bucket_name: str, folder_path: str = None,
+                  limit: int = LIST_PAGE_SIZE, offset: int = 0) -> list:
+        """List one page of a folder level in name order, like Supabase's object/list
+
+        Args:
+            bucket_name: Bucket to list
+            folder_path: Folder inside the bucket (default: its root)
+            limit: Entries per page
+            offset: Entries to skip before the page
+
+        Returns:
+            Entries with 'name', 'id', 'updated_at' and 'metadata'; folders
+            have id and metadata set to None. A missing folder lists empty.
+        """
+        if folder_path:
+            folder = self._object_path(bucket_name, folder_path)
+        else:
+            folder = self._bucket_dir(bucket_name)
+        if not folder.is_dir():
+            return []
+
+        with os.scandir(folder) as scan:
+            entries = sorted(
+                (entry for entry in scan
+                 if not (entry.name.startswith('.')
+                         and entry.name.endswith(_PART_SUFFIX))),
+                key=lambda entry: entry.name
+            )
+        page = islice(entries, offset, offset + limit)
+        prefix = f"{folder_path.strip('/')}/" if folder_path else ''
+        return [self._entry(entry, prefix) for entry in page]
+
+    @staticmethod
+    def _entry(entry: os.DirEntry, prefix: str) -> Dict:
+        if entry.is_dir():
+            return {'name': entry.name, 'id': None, 'updated_at': None,
+                    'metadata': None}
+        stat = entry.stat()
+        updated_at = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+        return {
+            'name': entry.name,
+            'id': f"{prefix}{entry.name}",
+            'updated_at': updated_at.isoformat(),
+            'metadata': {
+                'size': stat.st_size,
+                'mimetype': (mimetypes.guess_type(entry.name)[0]
+                             or 'application/octet-stream'),
+            },
+        }
+
+    def delete_file(self, bucket_name: str, storage_path: str) -> bool:
+        """Delete an object"""
+        try:
+            self._object_path(bucket_name, storage_path).unlink()
+            logger.info(f"Deleted {storage_path} from {bucket_name}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error deleting file {storage_path}: {e}")
+            return False
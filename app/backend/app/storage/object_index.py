@@ -0,0 +1,82 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path('.storage_index')
+DEFAULT_TTL = 15 * 60
+
+
+class ObjectIndex:
+    """Local snapshots of recursive bucket listings, one per bucket prefix
+
+    A snapshot maps each object path under the prefix to its size, update
+    time and ETag. Snapshots younger than ttl seconds stand in for listing
+    the bucket again; older ones remain available as the previous state, so
+    a run can tell which objects appeared or changed since it was taken.
+
+    Layout: <index_dir>/<bucket>/<hash of prefix>.json
+    """
+
+    def __init__(self, index_dir: Path = DEFAULT_INDEX_DIR, ttl: float = DEFAULT_TTL):
+        self.index_dir = Path(index_dir)
+        self.ttl = ttl
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['ObjectIndex']:
+        """Build an index from STORAGE_INDEX_DIR and STORAGE_INDEX_TTL (seconds),
+        or return None when STORAGE_INDEX_DIR is not set"""
+        index_dir = os.getenv('STORAGE_INDEX_DIR')
+        if not index_dir:
+            return None
+        ttl = os.getenv('STORAGE_INDEX_TTL')
+        return cls(index_dir, ttl=float(ttl) if ttl else DEFAULT_TTL)
+
+    def path(self, bucket_name: str, prefix: str) -> Path:
+        digest = hashlib.sha256(prefix.strip('/').encode()).hexdigest()[:16]
+        return self.index_dir / bucket_name / f"{digest}.json"
+
+    def _read(self, bucket_name: str, prefix: str) -> Optional[Dict]:
+        snapshot_path = self.path(bucket_name, prefix)
+        if not snapshot_path.exists():
+            return None
+        try:
+            with open(snapshot_path) as f:
+                return json.load(f)
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable listing snapshot {snapshot_path}: {e}")
+            return None
+
+    def get(self, bucket_name: str, prefix: str) -> Optional[Dict[str, Dict]]:
+        """Return the snapshot of a prefix if it is younger than ttl, else None"""
+        snapshot = self._read(bucket_name, prefix)
+        if snapshot is None or time.time() - snapshot['listed_at'] > self.ttl:
+            return None
+        return snapshot['objects']
+
+    def previous(self, bucket_name: str, prefix: str) -> Dict[str, Dict]:
+        """Return the last snapshot of a prefix whatever its age; empty if none"""
+        snapshot = self._read(bucket_name, prefix)
+        return snapshot['objects'] if snapshot else {}
+
+    def put(self, bucket_name: str, prefix: str, objects: Dict[str, Dict]) -> None:
+        """Replace the snapshot of a prefix"""
+        snapshot_path = self.path(bucket_name, prefix)
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = snapshot_path.with_name(f".{snapshot_path.name}.part")
+        with open(tmp_path, 'w') as f:
+            json.dump({'prefix': prefix.strip('/'), 'listed_at': time.time(),
+                       'objects': objects}, f)
+        os.replace(tmp_path, snapshot_path)
+
+    @staticmethod
+    def changed(previous: Dict[str, Dict], current: Dict[str, Dict]) -> List[str]:
+        """Paths in current that are missing from previous or differ from it"""
+        return sorted(path for path, meta in current.items()
+                      if previous.get(path) != meta)
@@ -1,22 +1,75 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from io import BytesIO
 from pathlib import Path
 from contextlib import contextmanager
 import tempfile
+import base64
+import mmap
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+from .base import LIST_PAGE_SIZE, STREAM_CHUNK_SIZE, StorageBackend
+from .upload_manifest import sha256_bytes, sha256_file
+from .download_cache import DownloadCache
+from .object_index import ObjectIndex
 
 logger = logging.getLogger(__name__)
 
-class StorageClient:
-    """Client for interacting with Supabase Storage using REST API"""
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Files at least this large go through the resumable (TUS) upload endpoint
+RESUMABLE_THRESHOLD = 50 * 1024 * 1024
+
+# Supabase only accepts resumable uploads in 6 MB chunks
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+
+
+def _rereadable(body) -> bool:
+    """Whether a request body can be sent again as it is"""
+    if body is None or isinstance(body, (bytes, str, dict)):
+        return True
+    return hasattr(body, 'seekable') and body.seekable()
+
+
+class StorageClient(StorageBackend):
+    """Client for interacting with Supabase Storage using REST API
+
+    Requests go through one pooled keep-alive session, so consecutive calls
+    reuse TCP/TLS connections. Close the client (or use it as a context
+    manager) to release them.
+    """
     
-    def __init__(self):
-        """Initialize Supabase storage client with REST API"""
+    def __init__(self, pool_size: int = 10, connect_timeout: float = 5.0,
+                 read_timeout: float = 60.0, max_retries: int = 3,
+                 backoff_factor: float = 0.5, cache: Optional[DownloadCache] = None,
+                 index: Optional[ObjectIndex] = None):
+        """Initialize Supabase storage client with REST API
+
+        Args:
+            pool_size: Connections kept alive to the storage host
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for response data
+            max_retries: Retries on connection errors and RETRY_STATUSES
+            backoff_factor: Exponential backoff base between retries, in seconds
+                (Retry-After headers take precedence)
+            cache: Read-through disk cache for downloads (default: from the
+                STORAGE_CACHE_* environment, see DownloadCache.from_env); an
+                offline cache serves every read and needs no Supabase credentials
+            index: Listing snapshots used by list_objects (default: from the
+                STORAGE_INDEX_* environment, see ObjectIndex.from_env)
+        """
+        super().__init__(pool_size, index)
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_KEY')
+        self.cache = cache if cache is not None else DownloadCache.from_env()
+        cache = self.cache
         
-        if not self.supabase_url or not self.supabase_key:
+        offline = cache is not None and cache.offline
+        if (not self.supabase_url or not self.supabase_key) and not offline:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
         
         # Setup headers for all requests
@@ -26,14 +79,64 @@ class StorageClient:
         }
         
         self.storage_url = f"{self.supabase_url}/storage/v1"
+        self.timeout = (connect_timeout, read_timeout)
+
+        # Once sent, only idempotent methods are retried. A POST is safe to
+        # send again only when replayable (see _request), so those go through
+        # a second session whose retries include POST
+        def make_session(allowed_methods: frozenset) -> requests.Session:
+            retry = Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=allowed_methods,
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                  max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(self.headers)
+            return session
+
+        self.session = make_session(Retry.DEFAULT_ALLOWED_METHODS)
+        self._replay_session = make_session(Retry.DEFAULT_ALLOWED_METHODS | {'POST'})
+
         logger.info("Supabase storage client initialized (REST API)")
     
+    def close(self) -> None:
+        """Save pending upload manifests and close the pooled connections"""
+        try:
+            super().close()
+        finally:
+            self.session.close()
+            self._replay_session.close()
+
+    def _request(self, method: str, url: str, replayable: bool = False,
+                 **kwargs) -> requests.Response:
+        """Send a request through the pooled session with the client timeouts
+
+        replayable marks a POST that has the same effect when sent twice, such
+        as an upsert or a listing; it is retried like the idempotent methods
+        if its body can be sent again (bytes, or a seekable file).
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if replayable and _rereadable(kwargs.get('data')):
+            return self._replay_session.request(method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def _public_url(self, bucket_name: str, storage_path: str) -> str:
+        return (f"{self.supabase_url}/storage/v1/object/public/"
+                f"{bucket_name}/{storage_path}")
+
     def list_buckets(self) -> list:
         """List all storage buckets"""
         try:
-            response = requests.get(
-                f"{self.storage_url}/bucket",
-                headers=self.headers
+            response = self._request(
+                'GET',
+                f"{self.storage_url}/bucket"
             )
             response.raise_for_status()
             return response.json()
@@ -51,9 +154,9 @@ class StorageClient:
                 return True
             
             # Create bucket
-            response = requests.post(
+            response = self._request(
+                'POST',
                 f"{self.storage_url}/bucket",
-                headers=self.headers,
                 json={'name': bucket_name, 'public': public}
             )
             response.raise_for_status()
@@ -68,9 +171,10 @@ class StorageClient:
         """Create a folder in a bucket by uploading a placeholder file"""
         try:
             placeholder_path = f"{folder_path.strip('/')}/.placeholder"
-            response = requests.post(
+            response = self._request(
+                'POST',
                 f"{self.storage_url}/object/{bucket_name}/{placeholder_path}",
-                headers={**self.headers, 'Content-Type': 'application/octet-stream'},
+                headers={'Content-Type': 'application/octet-stream'},
                 data=b''  # Empty content
             )
             response.raise_for_status()
@@ -81,9 +185,16 @@ class StorageClient:
             logger.error(f"Error creating folder '{folder_path}': {e}")
             return False
     
-    def upload_file(self, bucket_name: str, file_path: str, object_name: str = None, 
-                   folder_path: str = None) -> str:
-        """Upload a file to Supabase storage"""
+    def upload_file(self, bucket_name: str, file_path: str, object_name: str = None,
+                    folder_path: str = None, skip_unchanged: bool = False,
+                    match_folder: bool = False) -> Optional[str]:
+        """Upload a file to Supabase storage
+
+        With skip_unchanged the bucket's upload manifest is checked first (see
+        UploadManifest.find) and None is returned instead of the public URL
+        when identical content is already stored; changed content replaces
+        the existing object.
+        """
         try:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
@@ -98,35 +209,253 @@ class StorageClient:
             else:
                 storage_path = object_name
             
-            # Read file content
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
+            size = os.path.getsize(file_path)
+            if skip_unchanged:
+                digest = sha256_file(file_path)
+                if self._is_stored(bucket_name, storage_path, digest, size,
+                                   match_folder):
+                    return None
+
+            # Stream the file instead of reading it into memory; large files
+            # go through the resumable endpoint so a dropped connection only
+            # costs the current chunk
+            if size >= RESUMABLE_THRESHOLD:
+                with open(file_path, 'rb') as f:
+                    self.upload_resumable(bucket_name, f, storage_path,
+                                          'application/pdf', upsert=skip_unchanged)
+            else:
+                with open(file_path, 'rb') as f:
+                    response = self._request(
+                        'POST',
+                        f"{self.storage_url}/object/{bucket_name}/{storage_path}",
+                        headers={'Content-Type': 'application/pdf',
+                                 'x-upsert': 'true' if skip_unchanged else 'false'},
+                        data=f,
+                        replayable=skip_unchanged
+                    )
+                response.raise_for_status()
+
+            if skip_unchanged:
+                self.manifest(bucket_name).record(storage_path, digest, size)
+            logger.info(f"Uploaded {file_path} to {bucket_name}/{storage_path}")
             
-            # Upload to Supabase
-            response = requests.post(
+            # Get public URL
+            return self._public_url(bucket_name, storage_path)
+
+        except Exception as e:
+            logger.error(f"Error uploading file {file_path}: {e}")
+            raise
+
+    def upload_stream(self, bucket_name: str, source: Union[BinaryIO, Iterable[bytes]],
+                      storage_path: str,
+                      content_type: str = 'application/octet-stream') -> str:
+        """Upload from a file object or a generator of byte chunks without buffering it
+
+        File objects are sent as they are read; generators are sent with chunked
+        transfer encoding. Neither is retried once sent, as a retry could
+        send a partial body or hit an object created by the first attempt.
+        """
+        try:
+            response = self._request(
+                'POST',
                 f"{self.storage_url}/object/{bucket_name}/{storage_path}",
-                headers={**self.headers, 'Content-Type': 'application/pdf'},
-                data=file_content
+                headers={'Content-Type': content_type},
+                data=source
             )
             response.raise_for_status()
+            logger.info(f"Streamed upload to {bucket_name}/{storage_path}")
+            return self._public_url(bucket_name, storage_path)
             
-            logger.info(f"Uploaded {file_path} to {bucket_name}/{storage_path}")
+        except Exception as e:
+            logger.error(f"Error streaming upload to {storage_path}: {e}")
+            raise
+
+    def upload_resumable(self, bucket_name: str, file_obj: BinaryIO, storage_path: str,
+                         content_type: str = 'application/octet-stream',
+                         upsert: bool = False, max_resumes: int = 3) -> str:
+        """Upload a seekable file through Supabase's resumable (TUS) endpoint
+
+        The file is sent in RESUMABLE_CHUNK_SIZE chunks. When a chunk fails, the
+        server's offset is fetched and the upload resumes from there, up to
+        max_resumes times.
+        """
+        def b64(value: str) -> str:
+            return base64.b64encode(value.encode()).decode()
+
+        try:
+            file_obj.seek(0, os.SEEK_END)
+            size = file_obj.tell()
+            tus_headers = {'Tus-Resumable': '1.0.0'}
             
-            # Get public URL
-            public_url = f"{self.supabase_url}/storage/v1/object/public/{bucket_name}/{storage_path}"
-            return public_url
+            response = self._request(
+                'POST',
+                f"{self.storage_url}/upload/resumable",
+                headers={
+                    **tus_headers,
+                    'Upload-Length': str(size),
+                    'Upload-Metadata': ','.join([
+                        f"bucketName {b64(bucket_name)}",
+                        f"objectName {b64(storage_path)}",
+                        f"contentType {b64(content_type)}",
+                    ]),
+                    'x-upsert': 'true' if upsert else 'false',
+                }
+            )
+            response.raise_for_status()
+            upload_url = response.headers['Location']
+
+            offset = 0
+            resumes = 0
+            while offset < size:
+                file_obj.seek(offset)
+                chunk = file_obj.read(RESUMABLE_CHUNK_SIZE)
+                try:
+                    response = self._request(
+                        'PATCH',
+                        upload_url,
+                        headers={
+                            **tus_headers,
+                            'Upload-Offset': str(offset),
+                            'Content-Type': 'application/offset+octet-stream',
+                        },
+                        data=chunk
+                    )
+                    response.raise_for_status()
+                    offset = int(response.headers['Upload-Offset'])
+                except requests.RequestException:
+                    resumes += 1
+                    if resumes > max_resumes:
+                        raise
+                    # Ask the server how much it has and continue from there
+                    head = self._request('HEAD', upload_url, headers=tus_headers)
+                    head.raise_for_status()
+                    offset = int(head.headers['Upload-Offset'])
+                    logger.warning(
+                        f"Resuming upload of {storage_path} at byte {offset}"
+                    )
+
+            logger.info(
+                f"Uploaded {size} bytes to {bucket_name}/{storage_path} (resumable)"
+            )
+            return self._public_url(bucket_name, storage_path)
             
         except Exception as e:
-            logger.error(f"Error uploading file {file_path}: {e}")
+            logger.error(f"Error in resumable upload of {storage_path}: {e}")
             raise
     
+    @contextmanager
+    def _cached_object(
+        self, bucket_name: str, storage_path: str
+    ) -> Iterator[Union[Path, requests.Response]]:
+        """Yield the local path of an object, fetching it into the cache if needed
+
+        A cached copy is revalidated with its ETag (If-None-Match) unless the
+        cache is offline, or the bucket's loaded upload manifest already
+        vouches for its hash. An object larger than the whole cache is not
+        cached: the open streamed response is yielded instead.
+        """
+        cache = self.cache
+        meta = cache.lookup(bucket_name, storage_path)
+
+        if cache.offline:
+            if meta is None:
+                raise FileNotFoundError(
+                    f"{bucket_name}/{storage_path} is not in the offline cache"
+                )
+            cache.stats['hits'] += 1
+            yield cache.touch(bucket_name, storage_path)
+            return
+
+        if meta is not None:
+            manifest = self._manifests.get(bucket_name)
+            entry = manifest.entries.get(storage_path) if manifest else None
+            if entry and entry['sha256'] == meta['sha256']:
+                cache.stats['hits'] += 1
+                yield cache.touch(bucket_name, storage_path)
+                return
+
+        headers = {'If-None-Match': meta['etag']} if meta and meta.get('etag') else {}
+        with self._request(
+            'GET',
+            f"{self.storage_url}/object/{bucket_name}/{storage_path}",
+            headers=headers,
+            stream=True
+        ) as response:
+            if response.status_code == 304:
+                cache.stats['revalidated'] += 1
+                yield cache.touch(bucket_name, storage_path)
+                return
+            response.raise_for_status()
+            cache.stats['misses'] += 1
+            size = response.headers.get('Content-Length')
+            if not cache.fits(int(size) if size else None):
+                logger.debug(f"{bucket_name}/{storage_path} is larger than the "
+                             f"cache, serving it uncached")
+                yield response
+                return
+            yield cache.store(
+                bucket_name, storage_path,
+                response.iter_content(chunk_size=STREAM_CHUNK_SIZE),
+                etag=response.headers.get('ETag')
+            )
+
+    def download_stream(self, bucket_name: str, storage_path: str,
+                        chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield an object's content in chunks of at most chunk_size bytes"""
+        try:
+            if self.cache is not None:
+                with self._cached_object(bucket_name, storage_path) as source:
+                    if isinstance(source, requests.Response):
+                        yield from source.iter_content(chunk_size=chunk_size)
+                        return
+                    with open(source, 'rb') as f:
+                        yield from iter(lambda: f.read(chunk_size), b'')
+                return
+
+            with self._request(
+                'GET',
+                f"{self.storage_url}/object/{bucket_name}/{storage_path}",
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                yield from response.iter_content(chunk_size=chunk_size)
+
+        except Exception as e:
+            logger.error(f"Error streaming download of {storage_path}: {e}")
+            raise
+
+    def download_bytes(self, bucket_name: str, storage_path: str) -> bytes:
+        """Download a file from Supabase storage and return its content"""
+        try:
+            if self.cache is not None:
+                with self._cached_object(bucket_name, storage_path) as source:
+                    if isinstance(source, requests.Response):
+                        return source.content
+                    return source.read_bytes()
+
+            response = self._request(
+                'GET',
+                f"{self.storage_url}/object/{bucket_name}/{storage_path}"
+            )
+            response.raise_for_status()
+            logger.debug(f"Downloaded {len(response.content)} bytes "
+                         f"from {bucket_name}/{storage_path}")
+            return response.content
+
+        except Exception as e:
+            logger.error(f"Error downloading file {storage_path}: {e}")
+            raise
+
     def download_file(self, bucket_name: str, storage_path: str) -> BytesIO:
         """Download a file from Supabase storage and return as in-memory file"""
         try:
+            if self.cache is not None:
+                return BytesIO(self.download_bytes(bucket_name, storage_path))
+
             # Download file content
-            response = requests.get(
-                f"{self.storage_url}/object/{bucket_name}/{storage_path}",
-                headers=self.headers
+            response = self._request(
+                'GET',
+                f"{self.storage_url}/object/{bucket_name}/{storage_path}"
             )
             response.raise_for_status()
             
@@ -141,18 +470,42 @@ class StorageClient:
             logger.error(f"Error downloading file {storage_path}: {e}")
             raise
     
+    def download_mmap(self, bucket_name: str, storage_path: str) -> mmap.mmap:
+        """Return a read-only memory map of an object
+
+        With a cache this maps the cached file, so a large object is paged in
+        from disk as it is read instead of being copied into memory.
+        """
+        with self.download_file_temp(bucket_name, storage_path) as local_path:
+            with open(local_path, 'rb') as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
     @contextmanager
     def download_file_temp(self, bucket_name: str, storage_path: str):
-        """Download a file to temporary location, auto-delete after use"""
+        """Download a file to temporary location, auto-delete after use
+
+        With a cache the cached file itself is yielded and kept, unless the
+        object is too large to be cached.
+        """
+        if self.cache is not None:
+            with self._cached_object(bucket_name, storage_path) as source:
+                if not isinstance(source, requests.Response):
+                    yield str(source)
+                    return
+                chunks = source.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+                with self._temp_copy(storage_path, chunks) as temp_path:
+                    yield temp_path
+            return
+
+        chunks = self.download_stream(bucket_name, storage_path)
+        with self._temp_copy(storage_path, chunks) as temp_path:
+            yield temp_path
+
+    @contextmanager
+    def _temp_copy(self, storage_path: str, chunks: Iterable[bytes]):
+        """Write chunks of an object to a temporary file, auto-delete after use"""
         temp_file = None
         try:
-            # Download file content
-            response = requests.get(
-                f"{self.storage_url}/object/{bucket_name}/{storage_path}",
-                headers=self.headers
-            )
-            response.raise_for_status()
-            
             # Create temporary file with same extension
             suffix = Path(storage_path).suffix
             temp_file = tempfile.NamedTemporaryFile(
@@ -161,8 +514,9 @@ class StorageClient:
                 delete=False
             )
             
-            # Write content
-            temp_file.write(response.content)
+            # Stream content to disk chunk by chunk
+            for chunk in chunks:
+                temp_file.write(chunk)
             temp_file.flush()
             temp_path = temp_file.name
             temp_file.close()
@@ -185,30 +539,42 @@ class StorageClient:
                 except Exception as e:
                     logger.warning(f"Could not delete temp file {temp_file.name}: {e}")
     
-    def list_files(self, bucket_name: str, folder_path: str = None) -> list:
-        """List files in a bucket or folder"""
+    def list_page(self, bucket_name: str, folder_path: str = None,
+                  limit: int = LIST_PAGE_SIZE, offset: int = 0) -> list:
+        """List one page of a bucket or folder, in name order
+
+        Use iter_files or list_files to get every entry; errors are raised
+        rather than returned as an empty page.
+        """
         try:
             path = folder_path if folder_path else ''
-            response = requests.post(
+            response = self._request(
+                'POST',
                 f"{self.storage_url}/object/list/{bucket_name}",
-                headers=self.headers,
-                json={'prefix': path}
+                json={
+                    'prefix': path,
+                    'limit': limit,
+                    'offset': offset,
+                    'sortBy': {'column': 'name', 'order': 'asc'},
+                },
+                replayable=True
             )
             response.raise_for_status()
             files = response.json()
-            logger.info(f"Listed {len(files)} files in {bucket_name}/{path}")
+            logger.debug(f"Listed {len(files)} files in {bucket_name}/{path} "
+                         f"from offset {offset}")
             return files
             
         except Exception as e:
             logger.error(f"Error listing files in {bucket_name}: {e}")
-            return []
+            raise
     
     def delete_file(self, bucket_name: str, storage_path: str) -> bool:
         """Delete a file from storage"""
         try:
-            response = requests.delete(
-                f"{self.storage_url}/object/{bucket_name}/{storage_path}",
-                headers=self.headers
+            response = self._request(
+                'DELETE',
+                f"{self.storage_url}/object/{bucket_name}/{storage_path}"
             )
             response.raise_for_status()
             logger.info(f"Deleted {storage_path} from {bucket_name}")
@@ -217,12 +583,17 @@ class StorageClient:
         except Exception as e:
             logger.error(f"Error deleting file {storage_path}: {e}")
             return False
-        
 
-    def upload_from_memory(self, bucket_name: str, file_content: bytes, 
-                        object_name: str, folder_path: str = None, 
-                        content_type: str = 'application/octet-stream') -> str:
-        """Upload file content directly from memory to Supabase storage"""
+    def upload_from_memory(self, bucket_name: str, file_content: bytes,
+                           object_name: str, folder_path: str = None,
+                           content_type: str = 'application/octet-stream',
+                           upsert: bool = False, skip_unchanged: bool = False,
+                           match_folder: bool = False) -> Optional[str]:
+        """Upload file content directly from memory to Supabase storage
+
+        upsert replaces an existing object. skip_unchanged implies it and
+        returns None when identical content is already stored (see upload_file).
+        """
         try:
             # Construct full path with folder if provided
             if folder_path:
@@ -230,21 +601,31 @@ class StorageClient:
             else:
                 storage_path = object_name
             
+            if skip_unchanged:
+                digest = sha256_bytes(file_content)
+                if self._is_stored(bucket_name, storage_path, digest,
+                                   len(file_content), match_folder):
+                    return None
+
             # Upload to Supabase
-            response = requests.post(
+            response = self._request(
+                'POST',
                 f"{self.storage_url}/object/{bucket_name}/{storage_path}",
-                headers={**self.headers, 'Content-Type': content_type},
-                data=file_content
+                headers={'Content-Type': content_type,
+                         'x-upsert': 'true' if upsert or skip_unchanged else 'false'},
+                data=file_content,
+                replayable=upsert or skip_unchanged
             )
             response.raise_for_status()
             
+            if skip_unchanged:
+                self.manifest(bucket_name).record(storage_path, digest,
+                                                  len(file_content))
             logger.info(f"Uploaded {object_name} to {bucket_name}/{storage_path}")
             
             # Get public URL
-            public_url = f"{self.supabase_url}/storage/v1/object/public/{bucket_name}/{storage_path}"
-            return public_url
+            return self._public_url(bucket_name, storage_path)
             
         except Exception as e:
             logger.error(f"Error uploading from memory: {e}")
             raise
-    
\ No newline at end of file
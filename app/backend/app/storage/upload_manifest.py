@@ -0,0 +1,94 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Manifest object kept at the root of each bucket
+MANIFEST_OBJECT = '.upload_manifest.json'
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def sha256_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def sha256_file(file_path: str) -> str:
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadManifest:
+    """Object path -> content hash and size of everything uploaded to a bucket
+
+    Stored as a JSON object in the bucket itself, so every machine running
+    the scrapers shares it. Lets uploads skip content that is already stored.
+    """
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Read the manifest from the bucket; a missing manifest starts empty"""
+        try:
+            content = self.client.download_bytes(self.bucket_name, MANIFEST_OBJECT)
+            self.entries = json.loads(content)
+        except requests.HTTPError as e:
+            # Supabase answers 400 or 404 for missing objects
+            if e.response is None or e.response.status_code not in (400, 404):
+                raise
+            self.entries = {}
+        except FileNotFoundError:
+            self.entries = {}
+        logger.info(f"Upload manifest for '{self.bucket_name}': "
+                    f"{len(self.entries)} objects")
+
+    def find(self, storage_path: str, sha256: str, size: int,
+             match_folder: bool = False) -> Optional[str]:
+        """Return the stored path holding this content, or None
+
+        With match_folder, any object in the same folder with identical
+        content counts, which suits names carrying a timestamp.
+        """
+        with self._lock:
+            entry = self.entries.get(storage_path)
+            if entry and entry['sha256'] == sha256 and entry['size'] == size:
+                return storage_path
+            if match_folder:
+                folder = storage_path.rpartition('/')[0]
+                for path, entry in self.entries.items():
+                    if (path.rpartition('/')[0] == folder
+                            and entry['sha256'] == sha256 and entry['size'] == size):
+                        return path
+        return None
+
+    def record(self, storage_path: str, sha256: str, size: int) -> None:
+        with self._lock:
+            self.entries[storage_path] = {'sha256': sha256, 'size': size}
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the manifest back to the bucket if anything changed"""
+        with self._lock:
+            if not self.dirty:
+                return
+            content = json.dumps(self.entries, indent=2, sort_keys=True).encode('utf-8')
+            self.dirty = False
+        self.client.upload_from_memory(
+            self.bucket_name, content, MANIFEST_OBJECT,
+            content_type='application/json', upsert=True
+        )
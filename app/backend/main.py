@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.backend.config import settings
 from app.backend.routers import riders, races
+from app.backend.app.storage.async_storage_client import AsyncStorageClient
 
 # Create FastAPI app
 app = FastAPI(
@@ -29,11 +30,15 @@ async def startup_event():
     print(f"🏍️  {settings.app_name} v{settings.app_version} starting...")
     print(f"📡 Environment: {settings.environment}")
     print(f"🔧 Debug mode: {settings.debug}")
+    # One pooled storage client shared by every request
+    app.state.storage = AsyncStorageClient(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    await app.state.storage.open()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print("👋 Shutting down...")
+    await app.state.storage.close()
 
 
 @app.get("/")
@@ -0,0 +1,58 @@
+-- Natural key constraints used by the ETL loader's bulk and COPY modes
+-- (INSERT ... ON CONFLICT ON CONSTRAINT), for databases created before
+-- app/backend/models.py declared them. Tables created from the models
+-- already have them; running this again is a no-op.
+--
+-- Requires PostgreSQL 15 or later (UNIQUE NULLS NOT DISTINCT, so races
+-- without a date still conflict with each other).
+--
+-- Adding a constraint fails if the table already holds duplicate keys;
+-- find them with e.g.
+--   SELECT name, surname, count(*) FROM riders
+--   GROUP BY name, surname HAVING count(*) > 1;
+--
+-- Usage: psql "$DATABASE_URL" -f app/backend/migrations/001_etl_natural_keys.sql
+
+BEGIN;
+
+-- A season is one year of one category, so the year alone is no longer
+-- unique; the models used to create ix_seasons_year as a unique index
+DROP INDEX IF EXISTS ix_seasons_year;
+CREATE INDEX ix_seasons_year ON seasons (year);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_riders_name_surname'
+    ) THEN
+        ALTER TABLE riders
+            ADD CONSTRAINT uq_riders_name_surname UNIQUE (name, surname);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_seasons_year_category'
+    ) THEN
+        ALTER TABLE seasons
+            ADD CONSTRAINT uq_seasons_year_category UNIQUE (year, category);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'uq_race_circuits_season_circuit_date'
+    ) THEN
+        ALTER TABLE race_circuits
+            ADD CONSTRAINT uq_race_circuits_season_circuit_date
+            UNIQUE NULLS NOT DISTINCT (season_id, circuit, date);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_results_race_rider_race'
+    ) THEN
+        ALTER TABLE results_race
+            ADD CONSTRAINT uq_results_race_rider_race
+            UNIQUE (rider_id, race_circuit_id);
+    END IF;
+END
+$$;
+
+COMMIT;
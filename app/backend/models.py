@@ -4,12 +4,17 @@ atm we do not have the data yêt, so this is just a placeholder file.
 """
 
 
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date
+from sqlalchemy import (
+    Column, Integer, String, Float, ForeignKey, Date, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 from app.backend.db import Base
 
 class Rider(Base):
     __tablename__ = "riders"
+    __table_args__ = (
+        UniqueConstraint("name", "surname", name="uq_riders_name_surname"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False )
@@ -23,9 +28,12 @@ class Rider(Base):
 
 class Season(Base):
     __tablename__ = "seasons"
+    __table_args__ = (
+        UniqueConstraint("year", "category", name="uq_seasons_year_category"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    year = Column(Integer, index=True, nullable=False, unique=True)
+    year = Column(Integer, index=True, nullable=False)
     category = Column(String, index=True, nullable=False)
     
     # Relationship to race circuits
@@ -34,6 +42,15 @@ class Season(Base):
 
 class RaceCircuit(Base):
     __tablename__ = "race_circuits"
+    # NULLS NOT DISTINCT needs PostgreSQL 15+; existing databases get these
+    # constraints from migrations/001_etl_natural_keys.sql
+    __table_args__ = (
+        UniqueConstraint(
+            "season_id", "circuit", "date",
+            name="uq_race_circuits_season_circuit_date",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     season_id = Column(Integer, ForeignKey("seasons.id"), nullable=False, index=True)
@@ -47,6 +64,11 @@ class RaceCircuit(Base):
 
 class ResultsRace(Base):
     __tablename__ = "results_race"
+    __table_args__ = (
+        UniqueConstraint(
+            "rider_id", "race_circuit_id", name="uq_results_race_rider_race"
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     rider_id = Column(Integer, ForeignKey("riders.id"), nullable=False, index=True)
@@ -0,0 +1,99 @@
+import json
+
+import httpx
+import pytest
+
+from app.backend.app.storage.async_storage_client import AsyncStorageClient
+
+STORAGE_URL = 'https://project.supabase.co/storage/v1'
+
+
+class FakeStorage:
+    """httpx handler keeping uploaded objects in a dict"""
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        path = request.url.path.removeprefix('/storage/v1')
+        if path.startswith('/object/list/'):
+            query = json.loads(request.content)
+            names = sorted(key.split('/', 1)[1] for key in self.objects
+                           if key.split('/', 1)[1].startswith(query['prefix']))
+            page = names[query['offset']:query['offset'] + query['limit']]
+            return httpx.Response(200, json=[{'name': name} for name in page])
+        key = path.removeprefix('/object/')
+        if request.method == 'POST':
+            self.objects[key] = request.read()
+            return httpx.Response(200, json={'Key': key})
+        if key not in self.objects:
+            return httpx.Response(404, json={'error': 'not found'})
+        return httpx.Response(200, content=self.objects[key])
+
+
+@pytest.fixture
+def storage():
+    return FakeStorage()
+
+
+def _client(storage):
+    return AsyncStorageClient(STORAGE_URL.removesuffix('/storage/v1'), 'service-key',
+                              transport=httpx.MockTransport(storage))
+
+
+async def _chunks():
+    yield b'%PDF-1.4 '
+    yield b'results'
+
+
+@pytest.mark.asyncio
+async def test_upload_and_download(storage):
+    async with _client(storage) as client:
+        url = await client.upload('pdfs', '2024/a.pdf', _chunks(),
+                                  content_type='application/pdf', upsert=True)
+        content = await client.download_bytes('pdfs', '2024/a.pdf')
+        streamed = [chunk async for chunk in
+                    client.download_stream('pdfs', '2024/a.pdf', chunk_size=4)]
+
+    assert url == f"{STORAGE_URL}/object/public/pdfs/2024/a.pdf"
+    assert content == b'%PDF-1.4 results'
+    assert b''.join(streamed) == content and len(streamed[0]) == 4
+    upload = storage.requests[0]
+    assert upload.headers['x-upsert'] == 'true'
+    assert upload.headers['Authorization'] == 'Bearer service-key'
+
+
+@pytest.mark.asyncio
+async def test_missing_object_raises_before_streaming(storage):
+    async with _client(storage) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.open_stream('pdfs', 'missing.pdf')
+
+
+@pytest.mark.asyncio
+async def test_iter_files_pages_through_a_folder(storage):
+    storage.objects = {f'pdfs/2024/{i}.pdf': b'' for i in range(5)}
+    async with _client(storage) as client:
+        names = [entry['name'] async for entry in
+                 client.iter_files('pdfs', '2024/', page_size=2)]
+
+    assert names == [f'2024/{i}.pdf' for i in range(5)]
+    offsets = [json.loads(request.content)['offset'] for request in storage.requests]
+    assert offsets == [0, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_close_releases_the_client(storage):
+    client = _client(storage)
+    with pytest.raises(RuntimeError):
+        client.client
+
+    await client.open()
+    pool = client.client
+    await client.close()
+
+    assert pool.is_closed
+    with pytest.raises(RuntimeError):
+        await client.download_bytes('pdfs', 'a.pdf')
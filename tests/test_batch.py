@@ -0,0 +1,85 @@
+import sys
+
+import pytest
+
+from app.backend.app.etl import __main__ as cli
+from app.backend.app.etl.batch import BatchReport, expand_inputs
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    """2024/QAT/{a,b}.pdf and 2024/POR/c.pdf, plus a non-PDF file"""
+    for name in ('2024/QAT/a.pdf', '2024/QAT/b.pdf', '2024/POR/c.pdf',
+                 '2024/QAT/notes.txt'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'%PDF-1.4')
+    return tmp_path
+
+
+def test_directories_globs_and_manifest_are_combined(pdfs):
+    manifest = pdfs / 'inputs.txt'
+    manifest.write_text(f"# Portimao\n\n{pdfs / '2024/POR'}\n")
+
+    paths = expand_inputs([str(pdfs / '2024/QAT/b.pdf'), str(pdfs / '2024/QAT/*.pdf')],
+                          manifest)
+
+    assert [path.relative_to(pdfs).as_posix() for path in paths] == [
+        '2024/QAT/b.pdf', '2024/QAT/a.pdf', '2024/POR/c.pdf'
+    ]
+
+
+def test_inputs_are_deduplicated(pdfs):
+    paths = expand_inputs([str(pdfs), str(pdfs / '**/*.pdf'),
+                           str(pdfs / '2024/POR/c.pdf')])
+
+    assert len(paths) == len(set(paths)) == 3
+
+
+def test_glob_matching_nothing_is_skipped(pdfs):
+    assert expand_inputs([str(pdfs / '2023/*.pdf')]) == []
+
+
+def test_missing_path_is_an_error(pdfs):
+    with pytest.raises(FileNotFoundError):
+        expand_inputs([str(pdfs / 'missing.pdf')])
+
+
+def test_failures_are_recorded_once_per_file():
+    report = BatchReport()
+    report.record_success('a.pdf')
+    report.record_failure('b.pdf', ValueError('no tables'))
+    # A later chunk of a failed file doesn't make it a success
+    report.record_success('b.pdf')
+    report.rows = 40
+
+    summary = report.summary()
+
+    assert report.succeeded == ['a.pdf']
+    assert report.failed == {'b.pdf': 'ValueError: no tables'}
+    assert (summary['files_ok'], summary['files_failed'], summary['rows']) == (1, 1, 40)
+
+
+def test_failed_file_exits_with_status_1(pdfs, monkeypatch):
+    def run_pipeline(pdf_paths, session_factory, report, **options):
+        for pdf_path in pdf_paths:
+            if pdf_path.name == 'b.pdf':
+                report.record_failure(str(pdf_path), ValueError('no tables'))
+            else:
+                report.record_success(str(pdf_path))
+        return {}
+
+    monkeypatch.setattr(cli, 'run_pipeline', run_pipeline)
+    monkeypatch.setattr(sys, 'argv', ['app.backend.app.etl', str(pdfs), '--no-cache'])
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    assert exit_info.value.code == 1
+
+
+def test_clean_run_exits_normally(pdfs, monkeypatch):
+    monkeypatch.setattr(cli, 'run_pipeline', lambda pdf_paths, *args, **options: {})
+    monkeypatch.setattr(sys, 'argv', ['app.backend.app.etl', str(pdfs), '--no-cache'])
+
+    cli.main()
@@ -0,0 +1,103 @@
+import sys
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.backend.app.etl import __main__ as cli
+from app.backend.app.etl import pipeline
+from app.backend.db import Base
+from app.backend.models import Rider, ResultsRace
+
+
+def _classification():
+    return pd.DataFrame(
+        [
+            [1, 'Francesco', 'Bagnaia', 'ITA', 25.0, 2024, 'MotoGP', 'Losail',
+             '2024-03-10'],
+            [2, 'Brad', 'Binder', 'RSA', 20.0, 2024, 'MotoGP', 'Losail',
+             '2024-03-10'],
+        ],
+        columns=['position', 'rider_name', 'rider_surname', 'nationality',
+                 'points', 'season_year', 'category', 'circuit', 'date']
+    )
+
+
+@pytest.fixture
+def extracted(monkeypatch):
+    """Make every PDF hold one already normalized classification"""
+    monkeypatch.setattr(pipeline, 'extract_tables_from_pdf',
+                        lambda path, cache=None: [_classification()])
+    monkeypatch.setattr(pipeline, 'normalize_table', lambda table: table)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """SQLite stand-in for the Postgres session factory of the CLI"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'motogp.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(cli, 'SessionLocal', factory)
+    yield factory
+    engine.dispose()
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['app.backend.app.etl', *argv])
+    cli.main()
+
+
+def test_help_lists_the_commands(monkeypatch, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        _run(monkeypatch, '--help')
+
+    usage = capsys.readouterr().out
+    assert exit_info.value.code == 0
+    assert all(command in usage for command in ('load', 'rebuild'))
+
+
+def test_load_one_pdf(session_factory, extracted, monkeypatch, tmp_path):
+    pdf = tmp_path / 'Classification.pdf'
+    pdf.write_bytes(b'%PDF-1.4')
+
+    _run(monkeypatch, str(pdf), '--no-cache', '--no-parquet')
+
+    with session_factory() as session:
+        assert sorted(rider.surname for rider in session.query(Rider)) == [
+            'Bagnaia', 'Binder'
+        ]
+        assert sorted(result.points for result in session.query(ResultsRace)) == [
+            20.0, 25.0
+        ]
+
+
+def test_failed_pdf_exits_with_status_1(session_factory, monkeypatch, tmp_path):
+    pdf = tmp_path / 'Classification.pdf'
+    pdf.write_bytes(b'not a pdf')
+
+    def extract(path, cache=None):
+        raise ValueError('no tables')
+
+    monkeypatch.setattr(pipeline, 'extract_tables_from_pdf', extract)
+
+    with pytest.raises(SystemExit) as exit_info:
+        _run(monkeypatch, str(pdf), '--no-cache', '--no-parquet')
+    assert exit_info.value.code == 1
+
+
+@pytest.mark.parametrize('flags, mode', [
+    ([], 'auto'),
+    (['--bulk'], 'bulk'),
+    (['--copy'], 'copy'),
+])
+def test_load_mode_flags(monkeypatch, tmp_path, flags, mode):
+    pdf = tmp_path / 'Classification.pdf'
+    pdf.write_bytes(b'%PDF-1.4')
+    modes = []
+    monkeypatch.setattr(cli, 'run_pipeline',
+                        lambda *args, **options: modes.append(options['mode']) or {})
+
+    _run(monkeypatch, str(pdf), '--no-cache', *flags)
+
+    assert modes == [mode]
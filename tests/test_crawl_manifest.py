@@ -0,0 +1,214 @@
+import pytest
+
+from app.backend.app.etl import motogp_pdf_downloader
+from app.backend.app.etl.crawl_manifest import (
+    STATUS_FAILED, STATUS_OK, CrawlManifest, records_hash
+)
+from app.backend.app.etl.motogp_calendar_scraper import MotoGPCalendarScraper
+from app.backend.app.etl.motogp_pdf_downloader import MotoGPPdfsDownloader
+from app.backend.app.etl.motogp_riders_teams_scraper import MotoGPRidersTeamsScraper
+
+CALENDAR_URL = MotoGPCalendarScraper.CALENDAR_URL
+QATAR_URL = 'https://www.motogp.com/en/calendar/2024/event/qatar'
+CLASSIFICATION_URL = (
+    'https://www.motogp.com/pdfs/2024/QAT/MotoGP/RAC/Classification.pdf'
+)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return CrawlManifest(tmp_path / 'crawl_manifest.json')
+
+
+def test_final_url_is_done_once_extracted(manifest):
+    manifest.mark_final('page')
+    assert not manifest.is_done('page')
+    assert manifest.pending(['page', 'other']) == ['page', 'other']
+
+    manifest.record('page', content_hash='abc')
+
+    assert manifest.is_done('page')
+    assert manifest.pending(['page', 'other']) == ['other']
+
+
+def test_failed_final_url_is_retried(manifest):
+    manifest.record('pdf', STATUS_FAILED, final=True)
+    assert not manifest.is_done('pdf')
+
+
+def test_unchanged_needs_a_successful_crawl_with_the_same_hash(manifest):
+    manifest.record('page', STATUS_FAILED, content_hash='abc')
+    assert not manifest.unchanged('page', 'abc')
+
+    manifest.record('page', content_hash='abc')
+    assert manifest.unchanged('page', 'abc')
+    assert not manifest.unchanged('page', 'def')
+
+
+def test_record_keeps_fields_left_as_none(manifest):
+    manifest.record('pdf', content_hash='abc', etag='"v1"', final=True)
+    manifest.record('pdf', STATUS_FAILED)
+
+    entry = manifest.get('pdf')
+    assert entry['hash'] == 'abc'
+    assert entry['etag'] == '"v1"'
+    assert entry['final'] is True
+
+
+def test_save_and_reload(manifest, tmp_path):
+    manifest.record('page', content_hash='abc', final=True)
+    manifest.save()
+
+    reloaded = CrawlManifest(tmp_path / 'crawl_manifest.json')
+
+    assert reloaded.is_done('page')
+    assert not list(tmp_path.glob('.*.part'))
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    path = tmp_path / 'crawl_manifest.json'
+    path.write_text('{not json')
+    assert CrawlManifest(path).entries == {}
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv('CRAWL_MANIFEST', raising=False)
+    assert CrawlManifest.from_env() is None
+
+    monkeypatch.setenv('CRAWL_MANIFEST', str(tmp_path / 'm.json'))
+    assert CrawlManifest.from_env().path == tmp_path / 'm.json'
+
+
+def test_records_hash_ignores_key_order():
+    assert records_hash([{'a': 1, 'b': 2}]) == records_hash([{'b': 2, 'a': 1}])
+    assert records_hash([{'a': 1}]) != records_hash([{'a': 2}])
+
+
+def test_calendar_hash_is_only_recorded_by_a_pushing_run(site_pool, manifest,
+                                                         monkeypatch):
+    pushes = []
+    monkeypatch.setattr(MotoGPCalendarScraper, '_push_calendar_to_supabase',
+                        lambda self, races_data, races_df: pushes.append(races_data))
+    scraper = MotoGPCalendarScraper(pool=site_pool, manifest=manifest)
+
+    scraper.calendar_extract(push_to_supabase=False)
+    assert manifest.get(CALENDAR_URL) is None
+    assert manifest.get(QATAR_URL)['final'] is True
+
+    scraper.calendar_extract(push_to_supabase=True)
+    assert len(pushes) == 1
+    assert manifest.get(CALENDAR_URL)['status'] == STATUS_OK
+
+    scraper.calendar_extract(push_to_supabase=True)
+    assert len(pushes) == 1  # unchanged since the stored push
+
+
+def test_rosters_are_only_recorded_by_a_pushing_run(site_pool, manifest, monkeypatch):
+    pushes = []
+    monkeypatch.setattr(MotoGPRidersTeamsScraper, '_push_riders_to_supabase',
+                        lambda self, df: pushes.append(df))
+    scraper = MotoGPRidersTeamsScraper(pool=site_pool, manifest=manifest)
+    riders_url = f"{MotoGPRidersTeamsScraper.RIDERS_URL}/motogp"
+
+    scraper.extract_riders(push_to_supabase=False)
+    assert manifest.get(riders_url) is None
+
+    scraper.extract_riders(push_to_supabase=True)
+    scraper.extract_riders(push_to_supabase=True)
+    assert len(pushes) == 1
+    assert manifest.get(riders_url)['status'] == STATUS_OK
+
+
+@pytest.mark.parametrize('kind, base_url', [
+    ('riders', MotoGPRidersTeamsScraper.RIDERS_URL),
+    ('teams', MotoGPRidersTeamsScraper.TEAMS_URL),
+])
+def test_roster_hashes_are_recorded_once_stored(site_pool, manifest, monkeypatch,
+                                                tmp_path, kind, base_url):
+    monkeypatch.setenv('STORAGE_BACKEND', 'local')
+    monkeypatch.setenv('STORAGE_LOCAL_ROOT', str(tmp_path / 'storage'))
+    scraper = MotoGPRidersTeamsScraper(pool=site_pool, manifest=manifest)
+    extract = getattr(scraper, f'extract_{kind}')
+
+    extract(push_to_supabase=True)
+    extract(push_to_supabase=True)
+
+    assert len(list((tmp_path / 'storage').rglob(f'{kind}_*.json'))) == 1
+    for category in MotoGPRidersTeamsScraper.COMPETITION_CATEGORIES:
+        assert manifest.get(f"{base_url}/{category}")['status'] == STATUS_OK
+    assert CrawlManifest(manifest.path).get(f"{base_url}/motogp") is not None
+
+
+def test_roster_that_failed_to_push_is_pushed_again(site_pool, manifest, monkeypatch):
+    def fail(self, df):
+        raise ConnectionError('storage unreachable')
+
+    monkeypatch.setattr(MotoGPRidersTeamsScraper, '_push_teams_to_supabase', fail)
+    scraper = MotoGPRidersTeamsScraper(pool=site_pool, manifest=manifest)
+
+    with pytest.raises(ConnectionError):
+        scraper.extract_teams(push_to_supabase=True)
+
+    assert manifest.get(f"{MotoGPRidersTeamsScraper.TEAMS_URL}/motogp") is None
+
+
+class FakeFetcher:
+    """PdfFetcher stand-in that writes each PDF's URL as its content"""
+
+    fetched = []
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        return cls()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def fetch_many(self, downloads):
+        results = []
+        for url, dest_path in downloads:
+            self.fetched.append(url)
+            with open(dest_path, 'w') as f:
+                f.write(url)
+            results.append({'url': url, 'file': dest_path, 'bytes': len(url),
+                            'sha256': records_hash(url), 'etag': None})
+        return {'results': results}
+
+
+@pytest.fixture
+def fake_fetcher(monkeypatch):
+    FakeFetcher.fetched = []
+    monkeypatch.setattr(motogp_pdf_downloader, 'PdfFetcher', FakeFetcher)
+    return FakeFetcher
+
+
+def test_pdfs_become_final_only_once_pushed(site_pool, manifest, fake_fetcher,
+                                            monkeypatch, tmp_path):
+    monkeypatch.setattr(MotoGPPdfsDownloader, '_push_to_supabase',
+                        lambda self, file_paths: set(file_paths))
+    downloader = MotoGPPdfsDownloader(pool=site_pool, manifest=manifest)
+
+    downloader.pdf_extract(download_dir=str(tmp_path / 'a'), push_to_supabase=False)
+    assert manifest.get(CLASSIFICATION_URL) is None
+
+    files = downloader.pdf_extract(download_dir=str(tmp_path / 'b'))
+    assert len(files) == 2
+    assert manifest.is_done(CLASSIFICATION_URL)
+
+    assert downloader.pdf_extract(download_dir=str(tmp_path / 'c')) == []
+    assert len(fake_fetcher.fetched) == 4  # the third run fetched nothing
+
+
+def test_pdf_that_failed_to_upload_is_fetched_again(site_pool, manifest, fake_fetcher,
+                                                    monkeypatch, tmp_path):
+    monkeypatch.setattr(MotoGPPdfsDownloader, '_push_to_supabase',
+                        lambda self, file_paths: set())
+    downloader = MotoGPPdfsDownloader(pool=site_pool, manifest=manifest)
+
+    downloader.pdf_extract(download_dir=str(tmp_path / 'a'))
+
+    assert manifest.get(CLASSIFICATION_URL)['status'] == STATUS_FAILED
+    assert manifest.get(MotoGPPdfsDownloader.MAIN_PAGE)['status'] == STATUS_FAILED
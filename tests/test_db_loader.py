@@ -0,0 +1,278 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.backend.app.etl import db_loader
+from app.backend.app.etl.key_resolver import KeyResolver
+
+RACE_DATE = date(2024, 3, 10)
+
+
+class RecordingSession:
+    """Session that records commits and rollbacks and executes nothing"""
+
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class Result(list):
+    def one(self):
+        return self[0]
+
+
+class CopyCursor:
+    def __init__(self, copied):
+        self.copied = copied
+        self.closed = False
+
+    def copy_expert(self, sql, buffer):
+        self.copied.append((sql, buffer.read()))
+
+    def close(self):
+        self.closed = True
+
+
+class StatementSession:
+    """Session that compiles every statement for Postgres and answers it
+    with the next canned rows"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.statements = []
+        self.copied = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement.compile(dialect=postgresql.dialect()))
+        return Result(self.responses.pop(0) if self.responses else [])
+
+    def sql(self, index):
+        return ' '.join(str(self.statements[index]).split())
+
+    def connection(self):
+        """SQLAlchemy connection whose DBAPI connection has a COPY cursor"""
+        return SimpleNamespace(connection=SimpleNamespace(cursor=self._cursor))
+
+    def _cursor(self):
+        return CopyCursor(self.copied)
+
+
+def _staged(*rows):
+    """Staged results from (name, surname, nationality, position, points) rows"""
+    return db_loader._stage_results(pd.DataFrame(
+        [
+            [name, surname, nationality, 2024, 'MotoGP', 'Losail', RACE_DATE,
+             position, points]
+            for name, surname, nationality, position, points in rows
+        ],
+        columns=['rider_name', 'rider_surname', 'nationality', 'season_year',
+                 'category', 'circuit', 'date', 'position', 'points']
+    ))
+
+
+def _stats():
+    return dict.fromkeys(
+        ['riders_created', 'riders_updated', 'seasons_created', 'races_created',
+         'results_created', 'results_updated'], 0
+    )
+
+
+def _loaded_resolver():
+    resolver = KeyResolver()
+    resolver.loaded = True
+    return resolver
+
+
+@pytest.fixture
+def bulk_loads(monkeypatch):
+    """copy flag of every set-based load"""
+    loads = []
+    monkeypatch.setattr(db_loader, '_bulk_load',
+                        lambda df, session, resolver, stats, copy: loads.append(copy))
+    return loads
+
+
+@pytest.mark.parametrize('rows, copy', [
+    (db_loader.COPY_ROW_THRESHOLD, [True]),
+    (db_loader.COPY_ROW_THRESHOLD - 1, []),
+])
+def test_auto_mode_uses_copy_for_large_frames(bulk_loads, monkeypatch, rows, copy):
+    monkeypatch.setattr(db_loader, '_upsert_riders', lambda *args: None)
+    monkeypatch.setattr(db_loader, '_upsert_seasons', lambda *args: None)
+    monkeypatch.setattr(db_loader, '_upsert_race_circuits', lambda *args: None)
+    monkeypatch.setattr(db_loader, '_upsert_race_results', lambda *args: None)
+    session = RecordingSession()
+
+    db_loader.load_results_to_db(pd.DataFrame(index=range(rows)), session,
+                                 mode='auto', resolver=_loaded_resolver())
+
+    assert bulk_loads == copy
+    assert session.commits == 1
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        db_loader.load_results_to_db(pd.DataFrame(), RecordingSession(), mode='fast')
+
+
+def test_bulk_riders_keep_a_known_nationality():
+    session = StatementSession([(1, 'Francesco', 'Bagnaia', 'ITA', True)])
+    resolver = KeyResolver()
+    stats = _stats()
+    staged = _staged(('Francesco', 'Bagnaia', 'ITA', 1, 25),
+                     ('Francesco', 'Bagnaia', None, 1, 12))
+
+    db_loader._bulk_upsert_riders(staged, session, resolver, stats)
+
+    assert len(session.statements) == 1
+    assert session.statements[0].params['nationality_m0'] == 'ITA'
+    assert 'nationality_m1' not in session.statements[0].params
+    assert session.sql(0).endswith(
+        'ON CONFLICT ON CONSTRAINT uq_riders_name_surname '
+        'DO UPDATE SET nationality = excluded.nationality '
+        'WHERE excluded.nationality IS NOT NULL '
+        'AND riders.nationality IS DISTINCT FROM excluded.nationality '
+        'RETURNING riders.id, riders.name, riders.surname, riders.nationality, '
+        'xmax = 0 AS inserted'
+    )
+    assert resolver.rider_id('Francesco', 'Bagnaia') == 1
+    assert stats['riders_created'] == 1
+
+
+def test_bulk_riders_count_created_and_updated_rows():
+    session = StatementSession([(1, 'Francesco', 'Bagnaia', 'ITA', True),
+                                (2, 'Brad', 'Binder', 'RSA', False)])
+    resolver = KeyResolver()
+    resolver.add_rider('Brad', 'Binder', 2)
+    resolver.add_rider('Jorge', 'Martin', 3, 'SPA')
+    stats = _stats()
+    staged = _staged(('Francesco', 'Bagnaia', 'ITA', 1, 25),
+                     ('Brad', 'Binder', 'RSA', 2, 20),
+                     ('Jorge', 'Martin', 'SPA', 3, 16))
+
+    db_loader._bulk_upsert_riders(staged, session, resolver, stats)
+
+    # Martin is known with the same nationality and is not sent at all
+    assert 'Martin' not in session.statements[0].params.values()
+    assert stats['riders_created'] == 1 and stats['riders_updated'] == 1
+    assert resolver.rider_nationality(2) == 'RSA'
+
+
+def test_bulk_seasons_resolve_keys_inserted_by_another_writer():
+    # The insert returns nothing (conflict), the fallback select finds the id
+    session = StatementSession([], [(7, 2024, 'MotoGP')])
+    resolver = KeyResolver()
+    stats = _stats()
+
+    db_loader._bulk_upsert_seasons(_staged(('A', 'B', None, 1, 25)), session,
+                                   resolver, stats)
+
+    assert 'ON CONFLICT ON CONSTRAINT uq_seasons_year_category DO NOTHING' in (
+        session.sql(0)
+    )
+    assert resolver.season_id(2024, 'MotoGP') == 7
+    assert stats['seasons_created'] == 0
+
+
+def test_bulk_races_without_a_date_resolve_through_the_fallback():
+    session = StatementSession([], [(9, 7, 'Losail', None)])
+    resolver = KeyResolver()
+    resolver.add_season(2024, 'MotoGP', 7)
+    staged = _staged(('A', 'B', None, 1, 25))
+    staged['date'] = None
+
+    db_loader._bulk_upsert_race_circuits(staged, session, resolver, _stats())
+
+    assert 'uq_race_circuits_season_circuit_date DO NOTHING' in session.sql(0)
+    assert resolver.race_id(7, 'Losail', None) == 9
+
+
+def test_bulk_results_update_only_changed_rows():
+    session = StatementSession([(True,), (False,)])
+    resolver = KeyResolver()
+    resolver.add_rider('Francesco', 'Bagnaia', 1)
+    resolver.add_rider('Brad', 'Binder', 2)
+    resolver.add_season(2024, 'MotoGP', 7)
+    resolver.add_race(7, 'Losail', RACE_DATE, 9)
+    stats = _stats()
+    staged = _staged(('Francesco', 'Bagnaia', None, 2, 20),
+                     ('Brad', 'Binder', None, 2, 20),
+                     ('Francesco', 'Bagnaia', None, 1, 25))
+
+    db_loader._bulk_upsert_race_results(staged, session, resolver, stats)
+
+    params = session.statements[0].params
+    # One row per rider and race, the later row winning
+    assert (params['rider_id_m0'], params['position_m0'], params['points_m0']) == (
+        1, 1, 25.0
+    )
+    assert 'rider_id_m2' not in params
+    assert session.sql(0).endswith(
+        'ON CONFLICT ON CONSTRAINT uq_results_race_rider_race '
+        'DO UPDATE SET position = excluded.position, points = excluded.points '
+        'WHERE results_race.position IS DISTINCT FROM excluded.position '
+        'OR results_race.points IS DISTINCT FROM excluded.points '
+        'RETURNING xmax = 0 AS inserted'
+    )
+    assert stats['results_created'] == 1 and stats['results_updated'] == 1
+
+
+def test_copy_merge_stages_results_and_counts_from_xmax():
+    session = StatementSession([], [(1, 1)])
+    resolver = KeyResolver()
+    resolver.add_rider('Francesco', 'Bagnaia', 1)
+    resolver.add_rider('Brad', 'Binder', 2)
+    resolver.add_season(2024, 'MotoGP', 7)
+    resolver.add_race(7, 'Losail', RACE_DATE, 9)
+    stats = _stats()
+    staged = _staged(('Francesco', 'Bagnaia', None, 1, 25),
+                     ('Brad', 'Binder', None, None, 0))
+
+    db_loader._copy_merge_race_results(staged, session, resolver, stats)
+
+    assert session.copied == [(
+        'COPY etl_results_stage (rider_id, race_circuit_id, position, points) '
+        'FROM STDIN WITH (FORMAT csv)',
+        # A missing position stays empty instead of turning positions to floats
+        '1,9,1,25.0\n2,9,,0.0\n'
+    )]
+    assert session.sql(0).startswith('CREATE TEMPORARY TABLE IF NOT EXISTS')
+    assert session.sql(0).endswith('ON COMMIT DROP')
+    merge = session.sql(1)
+    assert 'ON CONFLICT ON CONSTRAINT uq_results_race_rider_race DO UPDATE' in merge
+    assert 'RETURNING xmax = 0 AS inserted' in merge
+    assert session.sql(2) == 'TRUNCATE etl_results_stage'
+    assert stats['results_created'] == 1 and stats['results_updated'] == 1
+
+
+def test_copy_merge_of_nothing_runs_no_statement():
+    session = StatementSession()
+
+    db_loader._copy_merge_race_results(_staged()[:0], session, KeyResolver(), _stats())
+
+    assert session.statements == [] and session.copied == []
+
+
+def test_copy_mode_merges_results_in_one_transaction(monkeypatch):
+    session = RecordingSession()
+    for step in ('_bulk_upsert_riders', '_bulk_upsert_seasons',
+                 '_bulk_upsert_race_circuits'):
+        monkeypatch.setattr(db_loader, step, lambda *args: None)
+    merged = []
+    monkeypatch.setattr(db_loader, '_copy_merge_race_results',
+                        lambda staged, *args: merged.append(len(staged)))
+    df = pd.DataFrame(_staged(('A', 'B', None, 1, 25)))
+
+    db_loader.load_results_to_db(df, session, mode='copy', resolver=_loaded_resolver())
+
+    assert merged == [1]
+    assert session.commits == 1
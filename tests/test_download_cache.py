@@ -0,0 +1,169 @@
+import os
+import threading
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.backend.app.storage.download_cache import DownloadCache
+from app.backend.app.storage.storage_client import StorageClient
+
+CONTENT = b'%PDF-1.4 results'
+
+
+class ObjectHandler(BaseHTTPRequestHandler):
+    """Serves CONTENT for every object, with ETag revalidation"""
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def object_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ObjectHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DownloadCache(tmp_path / 'cache')
+
+
+def test_store_and_lookup(cache):
+    local_path = cache.store('pdfs', '/2024/a.pdf', [b'abc', b'def'], etag='"v1"')
+
+    assert local_path.read_bytes() == b'abcdef'
+    meta = cache.lookup('pdfs', '2024/a.pdf')
+    assert meta['etag'] == '"v1"' and meta['size'] == 6
+
+
+def test_truncated_object_is_a_miss(cache):
+    local_path = cache.store('pdfs', 'a.pdf', [b'abcdef'])
+    local_path.write_bytes(b'abc')
+
+    assert cache.lookup('pdfs', 'a.pdf') is None
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path):
+    cache = DownloadCache(tmp_path / 'cache', max_bytes=10)
+    old = cache.store('pdfs', 'old.pdf', [b'x' * 4])
+    cache.store('pdfs', 'used.pdf', [b'x' * 4])
+    cache.touch('pdfs', 'used.pdf')
+    cache.touch('pdfs', 'old.pdf')
+    cache.touch('pdfs', 'used.pdf')
+
+    cache.store('pdfs', 'new.pdf', [b'x' * 4])
+
+    assert cache.lookup('pdfs', 'old.pdf') is None
+    assert cache.lookup('pdfs', 'used.pdf') is not None
+    assert not old.with_name('old.pdf.meta.json').exists()
+    assert cache.total_bytes == 8
+
+
+def test_reopened_cache_orders_objects_by_mtime(tmp_path):
+    cache = DownloadCache(tmp_path / 'cache', max_bytes=10)
+    used = cache.store('pdfs', 'used.pdf', [b'x' * 4])
+    old = cache.store('pdfs', 'old.pdf', [b'x' * 4])
+    os.utime(old, (1, 1))
+    os.utime(used, (2, 2))
+
+    reopened = DownloadCache(tmp_path / 'cache', max_bytes=10)
+    assert reopened.total_bytes == 8
+    reopened.store('pdfs', 'new.pdf', [b'x' * 4])
+
+    assert reopened.lookup('pdfs', 'old.pdf') is None
+    assert reopened.lookup('pdfs', 'used.pdf') is not None
+
+
+def test_object_just_stored_is_never_evicted(tmp_path):
+    cache = DownloadCache(tmp_path / 'cache', max_bytes=4)
+    cache.store('pdfs', 'small.pdf', [b'x' * 2])
+
+    large = cache.store('pdfs', 'large.pdf', [b'x' * 6])
+
+    assert large.read_bytes() == b'x' * 6
+    assert cache.lookup('pdfs', 'small.pdf') is None
+    cache.store('pdfs', 'next.pdf', [b'x' * 2])
+    assert not large.exists()
+    assert cache.total_bytes == 2
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv('STORAGE_CACHE_DIR', raising=False)
+    assert DownloadCache.from_env() is None
+
+    monkeypatch.setenv('STORAGE_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('STORAGE_CACHE_MAX_MB', '2')
+    monkeypatch.setenv('STORAGE_OFFLINE', 'true')
+    cache = DownloadCache.from_env()
+    assert cache.max_bytes == 2 * 1024 ** 2 and cache.offline
+
+
+def test_client_revalidates_cached_objects(cache, object_server, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', f"http://127.0.0.1:{object_server.server_port}")
+    with StorageClient(cache=cache) as client:
+        assert client.download_bytes('pdfs', 'a.pdf') == CONTENT
+        assert client.download_bytes('pdfs', 'a.pdf') == CONTENT
+
+    assert object_server.requests == [None, '"v1"']
+    assert cache.stats == {'hits': 0, 'revalidated': 1, 'misses': 1}
+
+
+def test_objects_larger_than_the_cache_are_served_uncached(
+    tmp_path, object_server, monkeypatch
+):
+    cache = DownloadCache(tmp_path / 'cache', max_bytes=len(CONTENT) - 1)
+    monkeypatch.setenv('SUPABASE_URL', f"http://127.0.0.1:{object_server.server_port}")
+    with StorageClient(cache=cache) as client:
+        assert client.download_bytes('pdfs', 'a.pdf') == CONTENT
+        assert b''.join(client.download_stream('pdfs', 'a.pdf')) == CONTENT
+        file = client.download_file('pdfs', 'a.pdf')
+        with client.download_file_temp('pdfs', 'a.pdf') as temp_path:
+            with open(temp_path, 'rb') as f:
+                assert f.read() == CONTENT
+
+    assert isinstance(file, BytesIO) and file.read() == CONTENT
+    assert not os.path.exists(temp_path)
+    assert cache.lookup('pdfs', 'a.pdf') is None
+    assert cache.total_bytes == 0
+    assert object_server.requests == [None] * 4
+
+
+def test_download_mmap_maps_the_cached_object(cache, object_server, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', f"http://127.0.0.1:{object_server.server_port}")
+    with StorageClient(cache=cache) as client:
+        assert isinstance(client.download_file('pdfs', 'a.pdf'), BytesIO)
+        mapped = client.download_mmap('pdfs', 'a.pdf')
+
+    assert mapped[:] == CONTENT
+    mapped.close()
+    assert cache.stats['misses'] == 1
+
+
+def test_offline_client_reads_only_the_cache(tmp_path, monkeypatch):
+    cache = DownloadCache(tmp_path / 'cache', offline=True)
+    cache.store('pdfs', 'a.pdf', [CONTENT])
+    monkeypatch.delenv('SUPABASE_URL')
+    monkeypatch.delenv('SUPABASE_KEY')
+
+    with StorageClient(cache=cache) as client:
+        assert client.download_bytes('pdfs', 'a.pdf') == CONTENT
+        with pytest.raises(FileNotFoundError):
+            client.download_bytes('pdfs', 'b.pdf')
@@ -0,0 +1,222 @@
+import threading
+import time
+
+import pytest
+
+from app.backend.app.etl import driver_pool
+from app.backend.app.etl.driver_pool import (
+    BLOCKED_URL_PATTERNS, DriverPool, create_driver
+)
+from app.backend.app.etl.scraper_waits import CONSENT_COOKIE
+
+
+class FakeDriver:
+    """Driver stand-in that counts its pages and can be made to crash"""
+
+    def __init__(self, number):
+        self.number = number
+        self.crashed = False
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if self.crashed:
+            raise ConnectionError("chrome not reachable")
+        return 'about:blank'
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers():
+    return []
+
+
+@pytest.fixture
+def make_pool(drivers):
+    pools = []
+
+    def make_pool(**kwargs):
+        def driver_factory(headless, lean):
+            driver = FakeDriver(len(drivers))
+            drivers.append(driver)
+            return driver
+
+        pool = DriverPool(driver_factory=driver_factory, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make_pool
+    for pool in pools:
+        pool.close()
+
+
+def test_drivers_are_reused(make_pool, drivers):
+    pool = make_pool(size=2)
+
+    for _ in range(3):
+        with pool.driver():
+            pass
+
+    assert len(drivers) == 1
+    assert pool.stats['pages'] == 3
+
+
+def test_driver_is_recycled_after_max_pages(make_pool, drivers):
+    pool = make_pool(size=1, max_pages=2)
+
+    used = []
+    for _ in range(5):
+        with pool.driver() as driver:
+            used.append(driver.number)
+
+    assert used == [0, 0, 1, 1, 2]
+    assert drivers[0].quit_called and drivers[1].quit_called
+    assert pool.stats['drivers_recycled'] == 2
+
+
+def test_crashed_driver_is_replaced(make_pool, drivers):
+    pool = make_pool(size=1)
+
+    with pytest.raises(ConnectionError):
+        with pool.driver() as driver:
+            driver.crashed = True
+            driver.current_url
+    with pool.driver() as driver:
+        assert driver.number == 1
+
+    assert drivers[0].quit_called
+    assert pool.stats['failed'] == 1
+
+
+def test_live_driver_is_kept_after_a_failed_task(make_pool, drivers):
+    pool = make_pool(size=1)
+
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("parse error")
+    with pool.driver() as driver:
+        assert driver.number == 0
+
+
+def test_map_yields_in_input_order(make_pool):
+    pool = make_pool(size=3)
+
+    def task(driver, delay):
+        time.sleep(delay)
+        return delay * 10
+
+    results = list(pool.map(task, [0.05, 0.0, 0.02]))
+
+    assert results == [(0.05, 0.5), (0.0, 0.0), (0.02, 0.2)]
+
+
+def test_map_runs_at_most_size_tasks_at_once(make_pool, drivers):
+    pool = make_pool(size=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def task(driver, item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(item)
+
+    list(pool.map(task, range(6)))
+
+    assert max(peak) <= 2
+    assert len(drivers) <= 2
+
+
+def test_map_raises_the_first_failure(make_pool):
+    pool = make_pool(size=2)
+
+    def task(driver, item):
+        if item == 'bad':
+            raise ValueError(item)
+        return item
+
+    with pytest.raises(ValueError):
+        list(pool.map(task, ['ok', 'bad']))
+
+
+def test_map_returns_exceptions(make_pool):
+    pool = make_pool(size=2)
+
+    def task(driver, item):
+        if item == 'bad':
+            raise ValueError(item)
+        return item.upper()
+
+    results = dict(pool.map(task, ['ok', 'bad', 'fine'], return_exceptions=True))
+
+    assert results['ok'] == 'OK' and results['fine'] == 'FINE'
+    assert isinstance(results['bad'], ValueError)
+    assert pool.stats['failed'] == 1
+
+
+def test_closed_pool(make_pool, drivers):
+    pool = make_pool(size=1)
+    with pool.driver():
+        pass
+
+    pool.close()
+
+    assert drivers[0].quit_called
+    with pytest.raises(RuntimeError):
+        with pool.driver():
+            pass
+
+
+class FakeChrome:
+    """webdriver.Chrome stand-in recording its options and CDP commands"""
+
+    def __init__(self, options):
+        self.capabilities = options.to_capabilities()
+        self.cdp_commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append((cmd, params))
+        return {}
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def fake_chrome(monkeypatch):
+    monkeypatch.setattr(driver_pool.webdriver, 'Chrome', FakeChrome)
+
+
+def test_lean_driver_blocks_requests_and_loads_eagerly(fake_chrome):
+    driver = create_driver(lean=True)
+
+    assert driver.capabilities['pageLoadStrategy'] == 'eager'
+    prefs = driver.capabilities['goog:chromeOptions']['prefs']
+    assert prefs['profile.managed_default_content_settings.images'] == 2
+    commands = dict(driver.cdp_commands)
+    assert [cmd for cmd, _ in driver.cdp_commands] == [
+        'Network.enable', 'Network.setBlockedURLs', 'Network.setCookie'
+    ]
+    assert commands['Network.setBlockedURLs'] == {'urls': BLOCKED_URL_PATTERNS}
+    assert commands['Network.setCookie']['name'] == CONSENT_COOKIE
+    assert commands['Network.setCookie']['domain'] == '.motogp.com'
+
+
+def test_default_driver_loads_everything(fake_chrome):
+    driver = create_driver()
+
+    assert driver.capabilities['pageLoadStrategy'] == 'normal'
+    assert 'prefs' not in driver.capabilities['goog:chromeOptions']
+    assert driver.cdp_commands == []
+    assert '--headless' in driver.capabilities['goog:chromeOptions']['args']
+
+
+def test_pool_starts_lean_drivers_by_default(fake_chrome):
+    with DriverPool(size=1) as pool:
+        with pool.driver() as driver:
+            assert driver.capabilities['pageLoadStrategy'] == 'eager'
@@ -0,0 +1,105 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.backend.app.etl.db_loader import load_results_to_db
+from app.backend.app.etl.key_resolver import KeyResolver
+from app.backend.db import Base
+from app.backend.models import RaceCircuit, Rider, Season
+
+RACE_DATE = date(2024, 3, 10)
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'motogp.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _results(points=25.0, nationality='ITA'):
+    return pd.DataFrame({
+        'rider_name': ['Francesco'],
+        'rider_surname': ['Bagnaia'],
+        'nationality': [nationality],
+        'season_year': [2024],
+        'category': ['MotoGP'],
+        'circuit': ['Losail'],
+        'date': [RACE_DATE],
+        'position': [1],
+        'points': [points],
+    })
+
+
+def test_load_reads_every_existing_key(session):
+    season = Season(year=2024, category='MotoGP')
+    session.add_all([Rider(name='Brad', surname='Binder', nationality='RSA'), season])
+    session.flush()
+    session.add_all([RaceCircuit(season_id=season.id, circuit='Losail', date=RACE_DATE),
+                     RaceCircuit(season_id=season.id, circuit='Portimao')])
+    session.commit()
+
+    resolver = KeyResolver().load(session)
+
+    rider_id = resolver.rider_id('Brad', 'Binder')
+    assert resolver.loaded
+    assert resolver.rider_nationality(rider_id) == 'RSA'
+    assert resolver.season_id(np.int16(2024), 'MotoGP') == season.id
+    assert resolver.race_id(season.id, 'Losail', RACE_DATE) is not None
+    assert resolver.race_id(season.id, 'Portimao', None) is not None
+
+
+def test_registered_keys_match_the_lookup_conventions():
+    resolver = KeyResolver()
+    resolver.add_rider('Brad', 'Binder', 1)
+    resolver.add_season(np.int64(2024), 'MotoGP', 7)
+    resolver.add_race(7, 'Losail', RACE_DATE, 9)
+
+    assert resolver.rider_id('Brad', 'Binder') == 1
+    assert resolver.rider_nationality(1) is None
+    assert resolver.season_id(2024, 'MotoGP') == 7
+    assert resolver.race_id(7, 'Losail', '2024-03-10') == 9
+    assert resolver.race_id(7, 'Losail', None) is None
+
+
+def test_load_replaces_stale_keys(session):
+    resolver = KeyResolver()
+    resolver.add_rider('Ghost', 'Rider', 99)
+    resolver.invalidate()
+
+    resolver.load(session)
+
+    assert resolver.rider_id('Ghost', 'Rider') is None
+
+
+def test_shared_resolver_skips_lookups_of_known_keys(session):
+    resolver = KeyResolver()
+    first = load_results_to_db(_results(), session, resolver=resolver)
+    second = load_results_to_db(_results(points=20.0), session, resolver=resolver)
+
+    assert first['riders_created'] == first['results_created'] == 1
+    assert second['riders_created'] == 0
+    assert second['results_updated'] == 1
+    assert session.query(Rider).count() == 1
+
+
+def test_failed_load_invalidates_the_resolver(session, monkeypatch):
+    resolver = KeyResolver()
+    load_results_to_db(_results(), session, resolver=resolver)
+    monkeypatch.setattr(session, 'commit', lambda: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        load_results_to_db(_results(nationality='SMR'), session, resolver=resolver)
+
+    assert not resolver.loaded
+    monkeypatch.undo()
+    # The next load reads the committed nationality back from the database
+    resolver.load(session)
+    rider_id = resolver.rider_id('Francesco', 'Bagnaia')
+    assert resolver.rider_nationality(rider_id) == 'ITA'
@@ -0,0 +1,120 @@
+import pytest
+
+from app.backend.app.storage.factory import get_storage_client
+from app.backend.app.storage.local_storage import LocalStorageClient
+from app.backend.app.storage.storage_client import StorageClient
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.delenv('STORAGE_INDEX_DIR', raising=False)
+    client = LocalStorageClient(tmp_path / 'storage')
+    client.create_bucket('pdfs')
+    yield client
+    client.close()
+
+
+def test_upload_and_download(client, tmp_path):
+    pdf = tmp_path / 'a.pdf'
+    pdf.write_bytes(b'%PDF-1.4')
+
+    url = client.upload_file('pdfs', str(pdf), folder_path='/2024/QAT/')
+
+    assert url.startswith('file://') and url.endswith('/pdfs/2024/QAT/a.pdf')
+    assert client.download_bytes('pdfs', '2024/QAT/a.pdf') == b'%PDF-1.4'
+    with client.download_file_temp('pdfs', '2024/QAT/a.pdf') as path:
+        assert open(path, 'rb').read() == b'%PDF-1.4'
+
+
+def test_existing_object_needs_upsert(client):
+    client.upload_from_memory('pdfs', b'v1', 'a.json')
+
+    with pytest.raises(FileExistsError):
+        client.upload_from_memory('pdfs', b'v2', 'a.json')
+    client.upload_from_memory('pdfs', b'v2', 'a.json', upsert=True)
+
+    assert client.download_bytes('pdfs', 'a.json') == b'v2'
+
+
+def test_paths_must_stay_in_the_bucket(client):
+    with pytest.raises(ValueError):
+        client.upload_from_memory('pdfs', b'x', '../escaped.pdf')
+    with pytest.raises(FileNotFoundError):
+        client.download_bytes('missing', 'a.pdf')
+
+
+def test_listing_pages_and_walk(client):
+    for name in ('c.pdf', 'a.pdf', 'b.pdf', '2024/d.pdf'):
+        client.upload_from_memory('pdfs', b'x', name)
+
+    first = client.list_page('pdfs', limit=2)
+    rest = client.list_page('pdfs', limit=2, offset=2)
+
+    names = [entry['name'] for entry in first + rest]
+    assert names == ['2024', 'a.pdf', 'b.pdf', 'c.pdf']
+    assert first[0]['id'] is None
+    assert rest[0]['metadata']['size'] == 1
+    assert sorted(path for path, _ in client.walk_files('pdfs')) == [
+        '2024/d.pdf', 'a.pdf', 'b.pdf', 'c.pdf'
+    ]
+    assert client.list_page('pdfs', 'missing') == []
+
+
+def test_upload_and_download_many(client, tmp_path):
+    files = []
+    for name in ('a.pdf', 'b.pdf'):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        files.append(str(path))
+
+    uploaded = client.upload_many('pdfs', files, '2024', skip_unchanged=True)
+    again = client.upload_many('pdfs', files, '2024', skip_unchanged=True)
+    downloaded = client.download_many('pdfs', ['2024/a.pdf', '2024/missing.pdf'])
+
+    assert uploaded['succeeded'] == 2 and uploaded['skipped'] == 0
+    assert again['skipped'] == 2
+    assert downloaded['results'][0]['content'] == b'a.pdf'
+    assert downloaded['failed'] == 1
+
+
+def test_upload_many_keeps_relative_paths(client, tmp_path):
+    files = []
+    for event in ('QAT', 'POR'):
+        path = tmp_path / 'pdfs' / event / 'Classification.pdf'
+        path.parent.mkdir(parents=True)
+        path.write_bytes(event.encode())
+        files.append(str(path))
+
+    report = client.upload_many('pdfs', files, '2024')
+    outside = client.upload_many('pdfs', files, base_dir=str(tmp_path / 'pdfs' / 'QAT'))
+
+    assert report['succeeded'] == 2
+    assert client.download_bytes('pdfs', '2024/QAT/Classification.pdf') == b'QAT'
+    assert client.download_bytes('pdfs', '2024/POR/Classification.pdf') == b'POR'
+    assert [('error' in result) for result in outside['results']] == [False, True]
+    assert client.download_bytes('pdfs', 'Classification.pdf') == b'QAT'
+
+
+def test_download_many_stays_in_dest_dir(client, tmp_path):
+    client.upload_from_memory('pdfs', b'x', '2024/a.pdf')
+    client.upload_from_memory('pdfs', b'y', 'b.pdf')
+    dest_dir = tmp_path / 'downloads'
+
+    report = client.download_many('pdfs', ['2024/a.pdf', '2024/../../escaped.pdf',
+                                           '/tmp/absolute.pdf'],
+                                  dest_dir=str(dest_dir))
+
+    assert (dest_dir / '2024' / 'a.pdf').read_bytes() == b'x'
+    assert [('outside' in result.get('error', '')) for result in report['results']] == [
+        False, True, True
+    ]
+    assert not (tmp_path / 'escaped.pdf').exists()
+
+
+def test_factory(tmp_path, monkeypatch):
+    monkeypatch.setenv('STORAGE_LOCAL_ROOT', str(tmp_path))
+
+    assert isinstance(get_storage_client('local'), LocalStorageClient)
+    assert isinstance(get_storage_client('supabase'), StorageClient)
+    with pytest.raises(ValueError):
+        get_storage_client('s3')
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from sqlalchemy import UniqueConstraint
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.backend.db import Base
+from app.backend.models import RaceCircuit
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / 'app' / 'backend' / 'migrations'
+
+
+def test_natural_key_migration_adds_every_model_constraint():
+    sql = (MIGRATIONS_DIR / '001_etl_natural_keys.sql').read_text()
+    constraints = [
+        constraint.name
+        for table in Base.metadata.tables.values()
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    ]
+
+    assert len(constraints) == 4
+    for name in constraints:
+        assert f"conname = '{name}'" in sql
+        assert f"ADD CONSTRAINT {name}" in sql
+
+
+def test_race_keys_treat_missing_dates_as_equal():
+    ddl = str(CreateTable(RaceCircuit.__table__).compile(dialect=postgresql.dialect()))
+
+    assert 'UNIQUE NULLS NOT DISTINCT (season_id, circuit, date)' in ddl
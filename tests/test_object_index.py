@@ -0,0 +1,66 @@
+import pytest
+
+from app.backend.app.storage.local_storage import LocalStorageClient
+from app.backend.app.storage.object_index import ObjectIndex
+
+OBJECTS = {'a.pdf': {'size': 1, 'updated_at': 't1', 'etag': None}}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ObjectIndex(tmp_path / 'index')
+
+
+def test_snapshot_round_trip(index):
+    index.put('pdfs', '/2024/', OBJECTS)
+
+    assert index.get('pdfs', '2024') == OBJECTS
+    assert index.previous('pdfs', '2024') == OBJECTS
+    assert index.get('pdfs', '2025') is None
+    assert index.previous('pdfs', '2025') == {}
+
+
+def test_stale_snapshot_is_only_the_previous_state(tmp_path):
+    index = ObjectIndex(tmp_path / 'index', ttl=0)
+    index.put('pdfs', '', OBJECTS)
+
+    assert index.get('pdfs', '') is None
+    assert index.previous('pdfs', '') == OBJECTS
+
+
+def test_unreadable_snapshot_is_ignored(index):
+    path = index.path('pdfs', '')
+    path.parent.mkdir(parents=True)
+    path.write_text('{not json')
+
+    assert index.get('pdfs', '') is None
+
+
+def test_changed():
+    current = {
+        'a.pdf': {'size': 2, 'updated_at': 't2', 'etag': None},
+        'b.pdf': {'size': 1, 'updated_at': 't1', 'etag': None},
+    }
+    assert ObjectIndex.changed(OBJECTS, current) == ['a.pdf', 'b.pdf']
+    assert ObjectIndex.changed(current, current) == []
+
+
+def test_listing_is_served_from_a_fresh_snapshot(index, tmp_path):
+    client = LocalStorageClient(tmp_path / 'storage', index=index)
+    client.create_bucket('pdfs')
+    client.upload_from_memory('pdfs', b'x', 'a.pdf')
+    assert list(client.list_objects('pdfs')) == ['a.pdf']
+
+    client.upload_from_memory('pdfs', b'x', 'b.pdf')
+
+    assert list(client.list_objects('pdfs')) == ['a.pdf']
+    assert sorted(client.list_objects('pdfs', refresh=True)) == ['a.pdf', 'b.pdf']
+
+
+def test_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv('STORAGE_INDEX_DIR', raising=False)
+    assert ObjectIndex.from_env() is None
+
+    monkeypatch.setenv('STORAGE_INDEX_DIR', str(tmp_path))
+    monkeypatch.setenv('STORAGE_INDEX_TTL', '60')
+    assert ObjectIndex.from_env().ttl == 60
@@ -0,0 +1,118 @@
+import pytest
+
+from app.backend.app.etl.motogp_calendar_scraper import MotoGPCalendarScraper
+from app.backend.app.etl.motogp_pdf_downloader import MotoGPPdfsDownloader
+from app.backend.app.etl.motogp_riders_teams_scraper import MotoGPRidersTeamsScraper
+from app.backend.app.etl.page_snapshots import (
+    RecordingPool, ReplayDriver, ReplayPool, SnapshotArchive, SnapshotMissing
+)
+from app.backend.app.etl.scraper_waits import wait_for_element
+
+from conftest import SITE_PAGES
+
+MAIN_PAGE = MotoGPPdfsDownloader.MAIN_PAGE
+EMPTY_TABLES_PAGE = 'https://www.motogp.com/en/calendar/2024/event/portugal'
+EMPTY_TABLES_HTML = (
+    '<html><body><div class="pdf-table__table empty"></div></body></html>'
+)
+
+
+@pytest.fixture
+def replay_pool(site_archive):
+    with ReplayPool(site_archive, size=2) as pool:
+        yield pool
+
+
+def test_archive_keeps_the_first_snapshot_of_a_url(tmp_path):
+    path = tmp_path / 'snapshots.zip'
+    with SnapshotArchive(path, 'w') as archive:
+        archive.record('https://a.test', 'https://a.test/', '<html>first</html>')
+        archive.record('https://a.test', 'https://a.test/', '<html>second</html>')
+
+    with SnapshotArchive(path) as archive:
+        snapshot = archive.load('https://a.test')
+        assert snapshot['page_source'] == '<html>first</html>'
+        assert snapshot['current_url'] == 'https://a.test/'
+        assert archive.urls() == ['https://a.test']
+        with pytest.raises(SnapshotMissing):
+            archive.load('https://b.test')
+
+
+def test_unknown_archive_mode(tmp_path):
+    with pytest.raises(ValueError):
+        SnapshotArchive(tmp_path / 'snapshots.zip', 'a')
+
+
+def test_recording_pool_records_the_pages_it_reads(site_archive, tmp_path):
+    path = tmp_path / 'recorded.zip'
+    with SnapshotArchive(path, 'w') as archive:
+        pool = RecordingPool(
+            archive, size=1, driver_factory=lambda **options: ReplayDriver(site_archive)
+        )
+        with pool, pool.driver() as driver:
+            driver.get(MAIN_PAGE)
+            page_source = driver.page_source
+
+    with SnapshotArchive(path) as archive:
+        assert archive.urls() == [MAIN_PAGE]
+        assert archive.load(MAIN_PAGE)['page_source'] == page_source
+
+
+def test_wait_finds_an_empty_element(tmp_path):
+    path = tmp_path / 'snapshots.zip'
+    with SnapshotArchive(path, 'w') as archive:
+        archive.record(EMPTY_TABLES_PAGE, EMPTY_TABLES_PAGE, EMPTY_TABLES_HTML)
+
+    with SnapshotArchive(path) as archive:
+        driver = ReplayDriver(archive)
+        driver.get(EMPTY_TABLES_PAGE)
+
+        element = wait_for_element(driver, MotoGPPdfsDownloader.PDF_TABLES, timeout=1)
+
+    assert element.get_attribute('class') == 'pdf-table__table empty'
+    assert element.text == ''
+
+
+def test_calendar_replay(replay_pool):
+    scraper = MotoGPCalendarScraper(pool=replay_pool)
+    assert scraper.manifest is None
+
+    races = scraper.calendar_extract(push_to_supabase=False)
+
+    assert races['event_id'].tolist() == ['qat', 'por']
+    assert races['status'].tolist() == ['Finished', 'Upcoming']
+    assert races['url'].iloc[0] == 'https://www.motogp.com/en/calendar/2024/event/qatar'
+    assert races['flag_url'].iloc[0] == 'https://www.motogp.com/flags/qat.svg'
+
+
+def test_riders_and_teams_replay(replay_pool):
+    scraper = MotoGPRidersTeamsScraper(pool=replay_pool)
+
+    riders = scraper.extract_riders(push_to_supabase=False)
+    teams = scraper.extract_teams(push_to_supabase=False)
+
+    categories = list(MotoGPRidersTeamsScraper.COMPETITION_CATEGORIES)
+    assert riders['category'].unique().tolist() == categories
+    assert riders['name'].tolist()[:2] == ['Francesco Bagnaia', 'Jorge Martin']
+    assert riders['number'].tolist()[:2] == ['#1', '#89']
+    # The blank rider slot of the team card is left out
+    assert teams['rider_name'].tolist()[:2] == ['Francesco Bagnaia', 'Enea Bastianini']
+    assert len(teams) == 2 * len(categories)
+
+
+def test_pdf_links_replay(replay_pool, tmp_path):
+    downloader = MotoGPPdfsDownloader(pool=replay_pool)
+
+    links = downloader.extract_links()
+
+    assert [link['url'] for link in links[MAIN_PAGE]] == [
+        'https://www.motogp.com/pdfs/2024/QAT/MotoGP/RAC/Classification.pdf',
+        'https://resources.motogp.test/2024/QAT/Analysis.pdf',
+    ]
+    assert downloader.pdf_extract(download_dir=str(tmp_path)) == []
+
+
+def test_replay_of_an_unrecorded_page_fails(replay_pool):
+    assert EMPTY_TABLES_PAGE not in SITE_PAGES
+    with replay_pool.driver() as driver, pytest.raises(SnapshotMissing):
+        driver.get(EMPTY_TABLES_PAGE)
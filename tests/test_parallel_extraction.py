@@ -0,0 +1,97 @@
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from app.backend.app.etl import parallel_extraction
+
+
+class FakeReader:
+    def __init__(self, path):
+        self.pages = [object()] * 7
+
+    def getNumPages(self):
+        return len(self.pages)
+
+
+@pytest.fixture
+def no_pypdf(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pypdf', None)
+
+
+def test_page_count_with_pypdf2(monkeypatch, no_pypdf):
+    monkeypatch.setitem(sys.modules, 'PyPDF2',
+                        types.SimpleNamespace(PdfReader=FakeReader))
+    assert parallel_extraction._page_count('a.pdf') == 7
+
+
+def test_page_count_with_pypdf2_1x(monkeypatch, no_pypdf):
+    monkeypatch.setitem(sys.modules, 'PyPDF2',
+                        types.SimpleNamespace(PdfFileReader=FakeReader))
+    assert parallel_extraction._page_count('a.pdf') == 7
+
+
+@pytest.mark.parametrize('pages_per_task, expected', [
+    (None, ['all']),
+    (3, ['1-3', '4-6', '7-7']),
+    (10, ['1-7']),
+])
+def test_page_ranges(monkeypatch, pages_per_task, expected):
+    monkeypatch.setattr(parallel_extraction, '_page_count', lambda path: 7)
+    assert parallel_extraction._page_ranges('a.pdf', pages_per_task) == expected
+
+
+def _fake_extract(path, pages='all', backend='camelot'):
+    """One table naming the PDF and pages; the first PDF is the slowest"""
+    if path.endswith('bad.pdf'):
+        raise ValueError('no tables')
+    time.sleep(0.05 if path.endswith('a.pdf') else 0)
+    return [pd.DataFrame({'pdf': [path], 'pages': [pages]})]
+
+
+@pytest.fixture
+def threaded(monkeypatch):
+    """Run the workers as threads of this process, extracting with _fake_extract"""
+    monkeypatch.setattr(parallel_extraction, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(parallel_extraction, '_init_worker', lambda backend: None)
+    monkeypatch.setattr(parallel_extraction, 'extract_tables_from_pdf', _fake_extract)
+    monkeypatch.setattr(parallel_extraction, '_page_count', lambda path: 7)
+
+
+def test_results_come_back_in_input_order(threaded):
+    results = list(parallel_extraction.extract_tables_parallel(
+        ['a.pdf', 'b.pdf', 'c.pdf'], workers=3
+    ))
+
+    assert [path for path, _ in results] == ['a.pdf', 'b.pdf', 'c.pdf']
+    assert [tables[0]['pdf'][0] for _, tables in results] == ['a.pdf', 'b.pdf', 'c.pdf']
+
+
+def test_page_ranges_are_regrouped_into_one_pdf(threaded):
+    results = list(parallel_extraction.extract_tables_parallel(
+        ['a.pdf', 'b.pdf'], workers=2, pages_per_task=3
+    ))
+
+    assert [path for path, _ in results] == ['a.pdf', 'b.pdf']
+    for path, tables in results:
+        assert [table['pages'][0] for table in tables] == ['1-3', '4-6', '7-7']
+        assert {table['pdf'][0] for table in tables} == {path}
+
+
+def test_return_exceptions_yields_the_error_of_the_failing_pdf(threaded):
+    results = dict(parallel_extraction.extract_tables_parallel(
+        ['a.pdf', 'bad.pdf', 'c.pdf'], workers=2, pages_per_task=3,
+        return_exceptions=True
+    ))
+
+    assert isinstance(results['bad.pdf'], ValueError)
+    assert len(results['a.pdf']) == len(results['c.pdf']) == 3
+
+
+def test_failing_pdf_raises_without_return_exceptions(threaded):
+    with pytest.raises(ValueError):
+        list(parallel_extraction.extract_tables_parallel(['a.pdf', 'bad.pdf'],
+                                                         workers=2))
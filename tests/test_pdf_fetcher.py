@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.backend.app.etl.pdf_fetcher import IncompleteDownload, PdfFetcher
+
+PDF = b'%PDF-1.4 classification' * 100
+
+
+class PdfHandler(BaseHTTPRequestHandler):
+    """Serves PDF under /<name>.pdf; /truncated.pdf cuts its first response short"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if not self.path.endswith('.pdf'):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        first = self.server.requests.count(self.path) == 1
+        body = PDF[:10] if self.path == '/truncated.pdf' and first else PDF
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(PDF)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pdf_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PdfHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(pdf_server):
+    return f"http://127.0.0.1:{pdf_server.server_port}"
+
+
+@pytest.fixture
+def fetcher():
+    with PdfFetcher(pool_size=2, max_retries=2, backoff_factor=0) as fetcher:
+        yield fetcher
+
+
+def test_fetch(fetcher, base_url, tmp_path):
+    dest = tmp_path / 'pdfs' / 'classification.pdf'
+
+    result = fetcher.fetch(f"{base_url}/classification.pdf", str(dest))
+
+    assert dest.read_bytes() == PDF
+    assert result['bytes'] == len(PDF)
+    assert result['sha256'] == hashlib.sha256(PDF).hexdigest()
+    assert result['etag'] == '"v1"'
+    assert list(dest.parent.iterdir()) == [dest]
+
+
+def test_truncated_body_is_fetched_again(fetcher, base_url, pdf_server, tmp_path):
+    dest = tmp_path / 'truncated.pdf'
+
+    fetcher.fetch(f"{base_url}/truncated.pdf", str(dest))
+
+    assert dest.read_bytes() == PDF
+    assert pdf_server.requests.count('/truncated.pdf') == 2
+
+
+def test_hash_mismatch_fails_after_retries(fetcher, base_url, pdf_server, tmp_path):
+    dest = tmp_path / 'classification.pdf'
+
+    with pytest.raises(IncompleteDownload):
+        fetcher.fetch(f"{base_url}/classification.pdf", str(dest),
+                      expected_sha256='0' * 64)
+
+    assert not dest.exists()
+    assert not list(tmp_path.iterdir())
+    assert len(pdf_server.requests) == 3
+
+
+def test_fetch_many_reports_each_download(fetcher, base_url, tmp_path):
+    report = fetcher.fetch_many([
+        (f"{base_url}/a.pdf", str(tmp_path / 'a.pdf')),
+        (f"{base_url}/missing", str(tmp_path / 'missing.pdf')),
+        (f"{base_url}/b.pdf", str(tmp_path / 'b.pdf')),
+    ])
+
+    assert [result['url'].rsplit('/', 1)[1] for result in report['results']] == [
+        'a.pdf', 'missing', 'b.pdf'
+    ]
+    assert 'error' in report['results'][1]
+    assert report['succeeded'] == 2 and report['failed'] == 1
+    assert report['bytes'] == 2 * len(PDF)
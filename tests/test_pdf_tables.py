@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from app.backend.app.etl.pdf_tables import normalize_table
+from app.backend.app.etl.table_cache import TableCache
+from app.backend.app.etl.table_schemas import detect_table_type
+
+
+def _raw_classification() -> pd.DataFrame:
+    """A table as camelot returns it: numbered columns, header as first row"""
+    return pd.DataFrame([
+        ['Pos', 'Rider', 'Pts'],
+        ['1', 'F. Bagnaia', '25'],
+        ['2', 'J. Martin', '20'],
+        ['-', 'M. Marquez', ''],
+    ])
+
+
+def test_normalize_promotes_header_and_applies_schema():
+    df = normalize_table(_raw_classification())
+
+    assert list(df.columns) == ['position', 'rider', 'points']
+    assert str(df['position'].dtype) == 'Int8'
+    assert df['points'].dtype == 'float32'
+    assert df['rider'].tolist() == ['F. Bagnaia', 'J. Martin', 'M. Marquez']
+    assert df['position'].isna().tolist() == [False, False, True]
+
+
+def test_cached_table_normalizes_like_uncached(tmp_path):
+    cache = TableCache(tmp_path)
+    raw = _raw_classification()
+    cache.put('key', [raw])
+
+    (cached,) = cache.get('key')
+
+    assert isinstance(cached.columns, pd.RangeIndex)
+    pd.testing.assert_frame_equal(normalize_table(cached), normalize_table(raw))
+
+
+def test_cache_miss_then_hit_counts(tmp_path):
+    cache = TableCache(tmp_path)
+
+    assert cache.get('missing') is None
+    cache.put('key', [pd.DataFrame({'a': ['1']})])
+    (table,) = cache.get('key')
+
+    assert table['a'].tolist() == ['1']
+    assert cache.stats == {'cache_hits': 1, 'cache_misses': 1}
+
+
+def test_cache_keeps_named_columns(tmp_path):
+    cache = TableCache(tmp_path)
+    cache.put('key', [pd.DataFrame({'position': ['1'], 'points': ['25']})])
+
+    (table,) = cache.get('key')
+
+    assert list(table.columns) == ['position', 'points']
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TableCache(tmp_path, max_bytes=1)
+    cache.put('old', [pd.DataFrame({'a': ['1']})])
+    cache.put('new', [pd.DataFrame({'a': ['2']})])
+
+    assert not (tmp_path / 'old').exists()
+
+
+def test_normalize_handles_blank_and_repeated_header_cells():
+    raw = pd.DataFrame([
+        ['Pos', 'Rider', '', 'Rider', 'Pts'],
+        ['1', 'F. Bagnaia', 'x', 'ITA', '25'],
+    ])
+
+    df = normalize_table(raw)
+
+    assert list(df.columns) == ['position', 'rider', 'column_2', 'rider_2', 'points']
+    assert df['rider_2'].tolist() == ['ITA']
+    assert df['points'].tolist() == [25.0]
+
+
+def test_normalize_rejects_unknown_table_type():
+    with pytest.raises(ValueError):
+        normalize_table(_raw_classification(), table_type='podium')
+
+
+@pytest.mark.parametrize('columns, expected', [
+    (['lap', 'lap_time', 'position'], 'analysis'),
+    (['lap', 'position'], 'lap_chart'),
+    (['position', 'points', 'rider'], 'classification'),
+    (['rider', 'team'], None),
+])
+def test_detect_table_type(columns, expected):
+    assert detect_table_type(columns) == expected
@@ -0,0 +1,210 @@
+import pandas as pd
+import pytest
+
+from app.backend.app.etl import pipeline
+from app.backend.app.etl.batch import BatchReport
+from app.backend.app.etl.parquet_store import read_results
+
+
+def _raw_results(*riders) -> pd.DataFrame:
+    """Classification with partition columns, as camelot returns it"""
+    return pd.DataFrame(
+        [['Pos', 'Rider', 'Pts', 'Year', 'Class', 'Circuit']]
+        + [[str(i + 1), rider, '25', '2024', 'MotoGP', 'Losail']
+           for i, rider in enumerate(riders)]
+    )
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pdfs(monkeypatch):
+    """Tables of each PDF path, served instead of extracting them"""
+    tables_by_path = {}
+
+    def extract_tables_from_pdf(path, cache=None):
+        tables = tables_by_path[path]
+        if isinstance(tables, Exception):
+            raise tables
+        return tables
+
+    monkeypatch.setattr(pipeline, 'extract_tables_from_pdf', extract_tables_from_pdf)
+    return tables_by_path
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    """Chunks passed to the database loader, which loads nothing"""
+    chunks = []
+
+    def load_results_to_db(chunk, session, mode, resolver):
+        chunks.append(chunk)
+        return {'inserted': len(chunk)}
+
+    monkeypatch.setattr(pipeline, 'load_results_to_db', load_results_to_db)
+    return chunks
+
+
+def test_pdfs_with_the_same_name_keep_their_own_parquet_parts(pdfs, loaded, tmp_path):
+    pdfs.update({
+        'RAC/Classification.pdf': [_raw_results('F. Bagnaia', 'J. Martin')],
+        'SPR/Classification.pdf': [_raw_results('J. Martin', 'E. Bastianini')],
+    })
+
+    pipeline.run_pipeline(list(pdfs), FakeSession, dataset_dir=tmp_path)
+
+    stored = pd.concat(read_results(tmp_path))
+    assert sorted(stored['rider']) == [
+        'E. Bastianini', 'F. Bagnaia', 'J. Martin', 'J. Martin'
+    ]
+
+
+def test_part_name_is_stable_per_path():
+    name = pipeline._part_name('RAC/Classification.pdf', 5000)
+
+    assert name == pipeline._part_name('RAC/Classification.pdf', 5000)
+    assert name.startswith('Classification-') and name.endswith('-5000')
+    assert name != pipeline._part_name('SPR/Classification.pdf', 5000)
+
+
+def test_rerun_with_another_chunk_size_replaces_the_parquet_parts(
+    pdfs, loaded, tmp_path
+):
+    pdfs.update({
+        'RAC/Classification.pdf': [_raw_results('A', 'B', 'C', 'D', 'E')],
+        'SPR/Classification.pdf': [_raw_results('F')],
+    })
+    pipeline.run_pipeline(['SPR/Classification.pdf'], FakeSession,
+                          dataset_dir=tmp_path)
+
+    for chunk_size in (2, 3):
+        pipeline.run_pipeline(['RAC/Classification.pdf'], FakeSession,
+                              chunk_size=chunk_size, dataset_dir=tmp_path)
+
+    stored = pd.concat(read_results(tmp_path))
+    assert sorted(stored['rider']) == ['A', 'B', 'C', 'D', 'E', 'F']
+
+
+def test_resumed_pdf_keeps_the_parts_of_committed_rows(pdfs, loaded, tmp_path):
+    pdfs['a.pdf'] = [_raw_results('A', 'B', 'C', 'D', 'E')]
+    checkpoint = pipeline.Checkpoint(tmp_path / 'checkpoint.json')
+    pipeline.run_pipeline(list(pdfs), FakeSession, chunk_size=2,
+                          dataset_dir=tmp_path / 'parquet')
+    # As if the run had stopped after committing the first chunk
+    checkpoint.advance('a.pdf', 2, pdf_done=False)
+
+    pipeline.run_pipeline(list(pdfs), FakeSession, chunk_size=3,
+                          checkpoint=checkpoint, dataset_dir=tmp_path / 'parquet')
+
+    stored = pd.concat(read_results(tmp_path / 'parquet'))
+    assert sorted(stored['rider']) == ['A', 'B', 'C', 'D', 'E']
+
+
+def _chunks(tables_by_path, chunk_size, checkpoint=None, on_error=None):
+    return [
+        (len(chunk), path, rows, done)
+        for chunk, path, rows, done in pipeline.iter_chunks(
+            list(tables_by_path), chunk_size, checkpoint, on_error=on_error
+        )
+    ]
+
+
+def test_chunks_never_span_pdfs(pdfs):
+    pdfs.update({
+        'a.pdf': [_raw_results('A', 'B', 'C'), _raw_results('D', 'E')],
+        'b.pdf': [_raw_results('F')],
+    })
+
+    assert _chunks(pdfs, chunk_size=2) == [
+        (2, 'a.pdf', 2, False),
+        (2, 'a.pdf', 4, False),
+        (1, 'a.pdf', 5, True),
+        (1, 'b.pdf', 1, True),
+    ]
+
+
+def test_pdf_without_rows_yields_an_empty_final_chunk(pdfs):
+    pdfs['a.pdf'] = []
+
+    assert _chunks(pdfs, chunk_size=2) == [(0, 'a.pdf', 0, True)]
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        list(pipeline.iter_chunks(['a.pdf'], chunk_size=0))
+
+
+def test_checkpoint_skips_committed_rows_and_pdfs(pdfs, tmp_path):
+    checkpoint = pipeline.Checkpoint(tmp_path / 'checkpoint.json')
+    checkpoint.advance('a.pdf', 5, pdf_done=True)
+    checkpoint.advance('b.pdf', 2, pdf_done=False)
+    pdfs.update({
+        'a.pdf': [_raw_results('A')],
+        'b.pdf': [_raw_results('B', 'C', 'D')],
+    })
+
+    resumed = pipeline.Checkpoint(tmp_path / 'checkpoint.json')
+
+    assert resumed.is_completed('a.pdf')
+    assert resumed.rows_done('b.pdf') == 2
+    assert _chunks(pdfs, chunk_size=2, checkpoint=resumed) == [(1, 'b.pdf', 3, True)]
+
+
+def test_checkpoint_clears_the_pdf_in_progress_once_done(tmp_path):
+    checkpoint = pipeline.Checkpoint(tmp_path / 'checkpoint.json')
+    checkpoint.advance('a.pdf', 2, pdf_done=False)
+    checkpoint.advance('a.pdf', 3, pdf_done=True)
+
+    assert checkpoint.completed == ['a.pdf']
+    assert checkpoint.rows_done('a.pdf') == 0
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_failed_pdf_is_reported_and_skipped(pdfs):
+    failures = []
+    error = OSError('unreadable')
+    pdfs.update({'a.pdf': error, 'b.pdf': [_raw_results('A')]})
+
+    chunks = _chunks(pdfs, chunk_size=2,
+                     on_error=lambda path, e: failures.append((path, e)))
+
+    assert chunks == [(1, 'b.pdf', 1, True)]
+    assert failures == [('a.pdf', error)]
+
+
+def test_run_pipeline_advances_the_checkpoint_per_chunk(pdfs, loaded, tmp_path):
+    checkpoint = pipeline.Checkpoint(tmp_path / 'checkpoint.json')
+    pdfs['a.pdf'] = [_raw_results('A', 'B', 'C')]
+
+    totals = pipeline.run_pipeline(list(pdfs), FakeSession, chunk_size=2,
+                                   checkpoint=checkpoint)
+
+    assert [len(chunk) for chunk in loaded] == [2, 1]
+    assert totals == {'chunks': 2, 'rows': 3, 'inserted': 3}
+    assert checkpoint.is_completed('a.pdf')
+
+
+def test_failed_load_keeps_the_last_committed_chunk(pdfs, monkeypatch, tmp_path):
+    checkpoint = pipeline.Checkpoint(tmp_path / 'checkpoint.json')
+    pdfs['a.pdf'] = [_raw_results('A', 'B', 'C')]
+    loads = []
+
+    def load_results_to_db(chunk, session, mode, resolver):
+        loads.append(len(chunk))
+        if len(loads) == 2:
+            raise RuntimeError('connection lost')
+        return {}
+
+    monkeypatch.setattr(pipeline, 'load_results_to_db', load_results_to_db)
+
+    report = BatchReport()
+
+    pipeline.run_pipeline(list(pdfs), FakeSession, chunk_size=2,
+                          checkpoint=checkpoint, report=report)
+
+    assert list(report.failed) == ['a.pdf']
+    assert report.succeeded == []
+    assert pipeline.Checkpoint(tmp_path / 'checkpoint.json').rows_done('a.pdf') == 2
@@ -0,0 +1,87 @@
+import pytest
+
+from app.backend.app.etl.scraper_parsers import (
+    parse_calendar, parse_pdf_links, parse_riders, parse_teams
+)
+
+from conftest import PAGES_DIR
+
+BASE_URL = 'https://www.motogp.com/en'
+
+
+def _page(name):
+    return (PAGES_DIR / name).read_text()
+
+
+def test_parse_calendar():
+    races = parse_calendar(_page('calendar.html'), BASE_URL)
+
+    assert races[0] == {
+        'sequence': 1,
+        'event_id': 'qat',
+        'title': 'Qatar',
+        'country': 'Qatar',
+        'event_name': 'Qatar Airways Grand Prix of Qatar',
+        'date_range': '08 Mar - 10 Mar',
+        'status': 'Finished',
+        'url': 'https://www.motogp.com/en/calendar/2024/event/qatar',
+        'flag_url': 'https://www.motogp.com/flags/qat.svg',
+    }
+    assert races[1]['flag_url'] is None
+
+
+def test_calendar_card_without_sequence_is_skipped():
+    page = _page('calendar.html').replace(
+        '<div class="calendar-grid-card__grid-card-event-sequence">1</div>', ''
+    )
+
+    assert [race['event_id'] for race in parse_calendar(page)] == ['por']
+
+
+def test_parse_riders():
+    riders = parse_riders(_page('riders.html'), 'moto2', BASE_URL)
+
+    assert riders[1] == {
+        'sequence_id': 1,
+        'category': 'moto2',
+        'name': 'Jorge Martin',
+        'country': 'Spain',
+        'team': 'Prima Pramac Racing',
+        'number': '#89',
+        'page_ref': 'https://www.motogp.com/en/riders/motogp/jorge-martin',
+    }
+
+
+def test_parse_teams_skips_empty_rider_slots():
+    teams = parse_teams(_page('teams.html'), 'motogp')
+
+    assert [team['rider_name'] for team in teams] == [
+        'Francesco Bagnaia', 'Enea Bastianini'
+    ]
+    assert teams[1]['sequence_id'] == '0_1'
+    assert teams[1]['page_ref'] == '/en/teams/motogp/ducati-lenovo-team'
+
+
+def test_parse_pdf_links_keeps_only_pdfs():
+    links = parse_pdf_links(_page('pdfs.html'), BASE_URL)
+
+    assert links == [
+        {'container': 1, 'index': 1,
+         'url': 'https://www.motogp.com/pdfs/2024/QAT/MotoGP/RAC/Classification.pdf'},
+        {'container': 2, 'index': 1,
+         'url': 'https://resources.motogp.test/2024/QAT/Analysis.pdf'},
+    ]
+
+
+@pytest.mark.parametrize('parse', [
+    parse_calendar,
+    lambda page: parse_riders(page, 'motogp'),
+    lambda page: parse_teams(page, 'motogp'),
+])
+def test_page_without_its_container(parse):
+    with pytest.raises(ValueError):
+        parse('<html><body><p>Maintenance</p></body></html>')
+
+
+def test_page_without_pdf_tables():
+    assert parse_pdf_links('<html><body></body></html>') == []
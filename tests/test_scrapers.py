@@ -0,0 +1,138 @@
+"""
+The scrapers run end to end over HTTP against a local server of the fixture
+pages. Chrome isn't needed: HttpDriver loads each page with requests and
+finds elements in its HTML, after pointing motogp.com URLs at the server.
+"""
+
+import json
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from app.backend.app.etl.driver_pool import DriverPool
+from app.backend.app.etl.motogp_calendar_scraper import MotoGPCalendarScraper
+from app.backend.app.etl.motogp_pdf_downloader import MotoGPPdfsDownloader
+from app.backend.app.etl.motogp_riders_teams_scraper import MotoGPRidersTeamsScraper
+from app.backend.app.etl.page_snapshots import ReplayElement
+
+
+class HttpDriver:
+    """Minimal driver that loads pages from base_url with requests"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.current_url = 'about:blank'
+        self.page_source = '<html></html>'
+
+    def get(self, url):
+        parts = urlsplit(url)
+        response = self.session.get(f"{self.base_url}{parts.path}?{parts.query}")
+        response.raise_for_status()
+        self.current_url = response.url
+        self.page_source = response.text
+
+    def find_element(self, by=By.ID, value=None):
+        document = lxml_html.fromstring(self.page_source)
+        if by == By.XPATH:
+            found = document.xpath(value)
+        else:
+            found = document.xpath('//*[@id=$id]', id=value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return ReplayElement(found[0])
+
+    def get_cookie(self, name):
+        return {'name': name, 'value': ''}
+
+    def quit(self):
+        self.session.close()
+
+
+@pytest.fixture
+def http_pool(site_server, monkeypatch):
+    monkeypatch.delenv('CRAWL_MANIFEST', raising=False)
+    base_url = f"http://127.0.0.1:{site_server.server_port}"
+    pool = DriverPool(size=2, driver_factory=lambda **options: HttpDriver(base_url))
+    with pool:
+        yield pool
+
+
+def test_calendar_scraper(http_pool):
+    scraper = MotoGPCalendarScraper(pool=http_pool)
+
+    races = scraper.calendar_extract(push_to_supabase=False)
+
+    assert races['country'].tolist() == ['Qatar', 'Portugal']
+    assert races['date_range'].tolist() == ['08 Mar - 10 Mar', '22 Mar - 24 Mar']
+    assert urlsplit(races['url'].iloc[1]).path == '/en/calendar/2024/event/portugal'
+
+
+def test_riders_scraper(http_pool):
+    scraper = MotoGPRidersTeamsScraper(pool=http_pool)
+
+    riders = scraper.extract_riders(push_to_supabase=False)
+
+    assert len(riders) == 2 * len(MotoGPRidersTeamsScraper.COMPETITION_CATEGORIES)
+    assert riders['team'].tolist()[:2] == ['Ducati Lenovo Team', 'Prima Pramac Racing']
+    assert http_pool.stats['pages'] == 3
+
+
+def test_teams_scraper(http_pool):
+    scraper = MotoGPRidersTeamsScraper(pool=http_pool)
+
+    teams = scraper.extract_teams(push_to_supabase=False)
+
+    assert set(teams['team_name']) == {'Ducati Lenovo Team'}
+    assert teams['sequence_id'].tolist()[:2] == ['0_0', '0_1']
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setenv('STORAGE_BACKEND', 'local')
+    monkeypatch.setenv('STORAGE_LOCAL_ROOT', str(tmp_path / 'storage'))
+    return tmp_path / 'storage' / 'motogp_data'
+
+
+@pytest.mark.parametrize('kind', ['riders', 'teams'])
+def test_rosters_are_pushed_as_json(http_pool, local_storage, kind):
+    scraper = MotoGPRidersTeamsScraper(pool=http_pool)
+
+    roster = getattr(scraper, f'extract_{kind}')(push_to_supabase=True)
+
+    pushed = list(local_storage.glob(f'*/*/{kind}_*.json'))
+    assert len(pushed) == 1 and pushed[0].parent.name == kind
+    assert json.loads(pushed[0].read_text()) == roster.to_dict('records')
+
+
+def test_calendar_is_pushed_as_json(http_pool, local_storage):
+    scraper = MotoGPCalendarScraper(pool=http_pool)
+
+    races = scraper.calendar_extract(push_to_supabase=True)
+
+    pushed = list(local_storage.glob('*/calendar/calendar_*.json'))
+    assert len(pushed) == 1
+    assert [race['country'] for race in json.loads(pushed[0].read_text())] == (
+        races['country'].tolist()
+    )
+
+
+def test_pdf_link_scraper(http_pool):
+    downloader = MotoGPPdfsDownloader(pool=http_pool)
+
+    links = downloader.extract_links()
+
+    urls = [link['url'] for link in links[MotoGPPdfsDownloader.MAIN_PAGE]]
+    assert urlsplit(urls[0]).path == '/pdfs/2024/QAT/MotoGP/RAC/Classification.pdf'
+    assert urls[1] == 'https://resources.motogp.test/2024/QAT/Analysis.pdf'
+
+
+def test_missing_page_fails_the_scrape(http_pool):
+    downloader = MotoGPPdfsDownloader(pool=http_pool)
+
+    with pytest.raises(requests.HTTPError):
+        downloader.extract_links(['https://www.motogp.com/en/unknown'])
@@ -0,0 +1,170 @@
+import threading
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.backend.app.storage import storage_client
+from app.backend.app.storage.storage_client import StorageClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first request of each path, 200 afterwards"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.server.requests.append((self.path, body))
+        attempts = sum(1 for path, _ in self.server.requests if path == self.path)
+        status = 503 if attempts == 1 else 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'[]')
+
+    def do_GET(self):
+        # No stored objects, e.g. no upload manifest yet
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(flaky_server, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', f"http://127.0.0.1:{flaky_server.server_port}")
+    monkeypatch.setenv('SUPABASE_KEY', 'test-key')
+    with StorageClient(max_retries=2, backoff_factor=0) as client:
+        yield client
+
+
+def test_upsert_from_memory_is_retried_with_its_body(client, flaky_server):
+    client.upload_from_memory('bucket', b'content', 'a.json', upsert=True)
+
+    assert [body for _, body in flaky_server.requests] == [b'content', b'content']
+
+
+def test_plain_upload_is_not_retried(client, flaky_server):
+    with pytest.raises(requests.HTTPError):
+        client.upload_from_memory('bucket', b'content', 'a.json')
+
+    assert len(flaky_server.requests) == 1
+
+
+def test_upload_file_is_retried_only_as_upsert(client, flaky_server, tmp_path):
+    pdf = tmp_path / 'results.pdf'
+    pdf.write_bytes(b'%PDF-1.4 results')
+
+    client.upload_file('bucket', str(pdf), skip_unchanged=True)
+
+    uploads = [
+        body for path, body in flaky_server.requests if path.endswith('results.pdf')
+    ]
+    assert uploads == [b'%PDF-1.4 results'] * 2
+
+
+def test_streamed_upload_is_not_retried(client, flaky_server):
+    chunks = iter([b'part-1', b'part-2'])
+
+    with pytest.raises(requests.HTTPError):
+        client.upload_stream('bucket', chunks, 'streamed.pdf')
+
+    assert len(flaky_server.requests) == 1
+
+
+def test_listing_is_retried(client, flaky_server):
+    assert client.list_page('bucket') == []
+    assert len(flaky_server.requests) == 2
+
+
+class TusSession:
+    """requests.Session stand-in for the TUS endpoints of one upload
+
+    PATCH requests listed in drops fail with a connection error after the
+    server has stored that many bytes of their chunk.
+    """
+
+    def __init__(self, drops=None):
+        self.drops = dict(drops or {})
+        self.received = b''
+        self.requests = []
+
+    def request(self, method, url, headers=None, data=None, **kwargs):
+        self.requests.append((method, headers.get('Upload-Offset'), data))
+        if method == 'POST':
+            return self._response(201, Location=f"{url}/upload-1")
+        if method == 'PATCH':
+            assert int(headers['Upload-Offset']) == len(self.received)
+            attempt = len([r for r in self.requests if r[0] == 'PATCH'])
+            if attempt in self.drops:
+                self.received += data[:self.drops[attempt]]
+                raise requests.ConnectionError('connection reset')
+            self.received += data
+        return self._response(204, **{'Upload-Offset': str(len(self.received))})
+
+    @staticmethod
+    def _response(status, **headers):
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        return response
+
+    def close(self):
+        pass
+
+    def patches(self):
+        return [(int(offset), data) for method, offset, data in self.requests
+                if method == 'PATCH']
+
+
+@pytest.fixture
+def tus_client(monkeypatch):
+    monkeypatch.setattr(storage_client, 'RESUMABLE_CHUNK_SIZE', 4)
+    with StorageClient() as client:
+        yield client
+
+
+def test_resumable_upload_resumes_from_the_server_offset(tus_client):
+    # The second chunk is cut off after 2 of its 4 bytes reached the server
+    tus_client.session = session = TusSession(drops={2: 2})
+
+    url = tus_client.upload_resumable('bucket', BytesIO(b'0123456789'), 'big.pdf')
+
+    assert session.received == b'0123456789'
+    assert session.patches() == [(0, b'0123'), (4, b'4567'), (6, b'6789')]
+    assert [method for method, _, _ in session.requests].count('HEAD') == 1
+    assert url.endswith('/object/public/bucket/big.pdf')
+
+
+def test_resumable_upload_retries_a_chunk_that_never_arrived(tus_client):
+    tus_client.session = session = TusSession(drops={1: 0})
+
+    tus_client.upload_resumable('bucket', BytesIO(b'0123456789'), 'big.pdf')
+
+    assert session.patches() == [(0, b'0123'), (0, b'0123'), (4, b'4567'),
+                                 (8, b'89')]
+
+
+def test_resumable_upload_gives_up_after_max_resumes(tus_client):
+    tus_client.session = session = TusSession(drops={1: 0, 2: 0})
+
+    with pytest.raises(requests.ConnectionError):
+        tus_client.upload_resumable('bucket', BytesIO(b'0123456789'), 'big.pdf',
+                                    max_resumes=1)
+
+    assert len(session.patches()) == 2
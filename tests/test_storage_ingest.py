@@ -0,0 +1,62 @@
+import pytest
+
+from app.backend.app.etl.storage_ingest import (
+    changed_pdf_objects, list_pdf_objects, split_storage_prefix
+)
+from app.backend.app.storage.local_storage import LocalStorageClient
+from app.backend.app.storage.object_index import ObjectIndex
+
+
+@pytest.fixture
+def client(tmp_path):
+    # ttl=0: every listing walks the bucket instead of reading a snapshot
+    index = ObjectIndex(tmp_path / 'index', ttl=0)
+    client = LocalStorageClient(tmp_path / 'storage', index=index)
+    client.create_bucket('pdfs')
+    yield client
+    client.close()
+
+
+def _upload(client, *paths):
+    for path in paths:
+        client.upload_from_memory('pdfs', path.encode(), path)
+
+
+def test_split_storage_prefix():
+    assert split_storage_prefix('/pdfs/2024/QAT/') == ('pdfs', '2024/QAT')
+    assert split_storage_prefix('pdfs') == ('pdfs', '')
+
+
+def test_list_pdf_objects_walks_sub_folders(client):
+    _upload(client, '2024/QAT/b.pdf', '2024/a.PDF', '2024/notes.txt')
+
+    assert list_pdf_objects(client, 'pdfs', '2024') == ['2024/QAT/b.pdf', '2024/a.PDF']
+
+
+def test_plain_listing_leaves_the_new_objects_snapshot_alone(client):
+    _upload(client, 'a.pdf')
+    changed, listing = changed_pdf_objects(client, 'pdfs')
+    assert changed == ['a.pdf']
+    client.index.put('pdfs', '', listing)  # a.pdf loaded
+
+    _upload(client, 'b.pdf')
+    assert list_pdf_objects(client, 'pdfs') == ['a.pdf', 'b.pdf']
+
+    changed, _ = changed_pdf_objects(client, 'pdfs')
+    assert changed == ['b.pdf']
+
+
+def test_new_objects_are_found_again_until_recorded(client):
+    _upload(client, 'a.pdf')
+
+    changed_pdf_objects(client, 'pdfs')  # a run that failed to load
+    changed, _ = changed_pdf_objects(client, 'pdfs')
+
+    assert changed == ['a.pdf']
+
+
+def test_new_objects_need_an_index(tmp_path):
+    client = LocalStorageClient(tmp_path / 'storage')
+
+    with pytest.raises(ValueError):
+        changed_pdf_objects(client, 'pdfs')
@@ -0,0 +1,69 @@
+import pytest
+
+from app.backend.app.storage.local_storage import LocalStorageClient
+from app.backend.app.storage.upload_manifest import (
+    MANIFEST_OBJECT, UploadManifest, sha256_bytes, sha256_file
+)
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = LocalStorageClient(tmp_path / 'storage')
+    client.create_bucket('pdfs')
+    yield client
+    client.close()
+
+
+def test_missing_manifest_starts_empty(client):
+    assert UploadManifest(client, 'pdfs').entries == {}
+
+
+def test_find_needs_the_same_content(client):
+    manifest = UploadManifest(client, 'pdfs')
+    manifest.record('2024/a.pdf', 'abc', 3)
+
+    assert manifest.find('2024/a.pdf', 'abc', 3) == '2024/a.pdf'
+    assert manifest.find('2024/a.pdf', 'abd', 3) is None
+    assert manifest.find('2024/a.pdf', 'abc', 4) is None
+    assert manifest.find('2024/b.pdf', 'abc', 3) is None
+
+
+def test_find_in_folder(client):
+    manifest = UploadManifest(client, 'pdfs')
+    manifest.record('2024/a_20240310.json', 'abc', 3)
+
+    assert manifest.find('2024/a_20240317.json', 'abc', 3,
+                         match_folder=True) == '2024/a_20240310.json'
+    assert manifest.find('2025/a_20250310.json', 'abc', 3, match_folder=True) is None
+
+
+def test_save_writes_only_changes(client):
+    manifest = UploadManifest(client, 'pdfs')
+    manifest.save()
+    assert not client.list_objects('pdfs', refresh=True)
+
+    manifest.record('a.pdf', 'abc', 3)
+    manifest.save()
+
+    assert list(client.list_objects('pdfs', refresh=True)) == [MANIFEST_OBJECT]
+    assert UploadManifest(client, 'pdfs').entries == {
+        'a.pdf': {'sha256': 'abc', 'size': 3}
+    }
+
+
+def test_unchanged_upload_is_skipped(client, tmp_path):
+    pdf = tmp_path / 'a.pdf'
+    pdf.write_bytes(b'%PDF-1.4')
+
+    assert client.upload_file('pdfs', str(pdf), skip_unchanged=True) is not None
+    assert client.upload_file('pdfs', str(pdf), skip_unchanged=True) is None
+
+    pdf.write_bytes(b'%PDF-1.5')
+    assert client.upload_file('pdfs', str(pdf), skip_unchanged=True) is not None
+
+
+def test_hashes_agree(tmp_path):
+    path = tmp_path / 'a.bin'
+    path.write_bytes(b'x' * 3_000_000)
+
+    assert sha256_file(str(path)) == sha256_bytes(b'x' * 3_000_000)